@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""ACK cumulatif avec plages (SACK) et NACK en bitmap: un datagramme pour plusieurs frames (ou fragments)"""
+
+from typing import List, Optional, Tuple
+
+from rquic_wire import (
+    ACK_RANGES_HEADER, ACK_RANGE, PACKET_ACK_RANGES, NACK_BITMAP_HEADER, PACKET_NACK_BITMAP,
+    PACKET_ACK_COMPACT, FRAGMENT_NACK_BITMAP_HEADER, PACKET_FRAGMENT_NACK_BITMAP,
+)
+from rquic_compact import COMPACT_PREFIX_SIZE, encode_varint, decode_varint
+
+MAX_ACK_RANGES = 32
+
+
+class AckRangeSet:
+    """Frames reçues sous forme d'intervalles [lo, hi] disjoints, du plus récent au plus ancien
+
+    Au-delà de max_ranges, les plages les plus anciennes sont oubliées: elles
+    ont déjà été acquittées plusieurs fois ou sont expirées côté client.
+    """
+
+    def __init__(self, max_ranges: int = MAX_ACK_RANGES):
+        self.max_ranges = max_ranges
+        self.ranges: List[List[int]] = []
+
+    def __bool__(self) -> bool:
+        return bool(self.ranges)
+
+    @property
+    def largest(self) -> int:
+        return self.ranges[0][1] if self.ranges else -1
+
+    def add(self, frame_id: int):
+        ranges = self.ranges
+        # cas courant: la frame prolonge la plage la plus récente
+        if ranges and frame_id == ranges[0][1] + 1:
+            ranges[0][1] = frame_id
+            return
+
+        for i, (lo, hi) in enumerate(ranges):
+            if lo <= frame_id <= hi:
+                return
+            if frame_id == hi + 1:
+                ranges[i][1] = frame_id
+                return
+            if frame_id == lo - 1:
+                ranges[i][0] = frame_id
+                # comble le trou avec la plage plus ancienne
+                if i + 1 < len(ranges) and ranges[i + 1][1] == frame_id - 1:
+                    ranges[i][0] = ranges[i + 1][0]
+                    del ranges[i + 1]
+                return
+            if frame_id > hi:
+                ranges.insert(i, [frame_id, frame_id])
+                break
+        else:
+            ranges.append([frame_id, frame_id])
+
+        del ranges[self.max_ranges:]
+
+
+def encode_ack_ranges(conn_id: int, ranges: List[List[int]], ack_delay_us: int) -> bytes:
+    entries = []
+    previous_lo = None
+    for lo, hi in ranges:
+        if previous_lo is None:
+            gap = 0
+        else:
+            gap = previous_lo - hi - 1
+        length = hi - lo
+        if gap > 0xFFFF:
+            break
+        if length > 0xFFFF:
+            # plage trop longue: on tronque sa partie la plus ancienne et on s'arrête
+            entries.append(ACK_RANGE.pack(gap, 0xFFFF))
+            break
+        entries.append(ACK_RANGE.pack(gap, length))
+        previous_lo = lo
+
+    largest = ranges[0][1]
+    header = ACK_RANGES_HEADER.pack(PACKET_ACK_RANGES, conn_id, largest,
+                                    min(ack_delay_us, 0xFFFFFFFF), len(entries))
+    return header + b''.join(entries)
+
+
+def decode_ack_ranges(data: bytes) -> Tuple[int, int, int, List[Tuple[int, int]]]:
+    """Retourne (conn_id, largest_acked, ack_delay_us, [(lo, hi), ...] décroissant)"""
+    _, conn_id, largest, ack_delay_us, count = ACK_RANGES_HEADER.unpack_from(data)
+    count = min(count, (len(data) - ACK_RANGES_HEADER.size) // ACK_RANGE.size)
+
+    ranges = []
+    hi = largest
+    offset = ACK_RANGES_HEADER.size
+    for i in range(count):
+        gap, length = ACK_RANGE.unpack_from(data, offset)
+        offset += ACK_RANGE.size
+        if i > 0:
+            hi = ranges[-1][0] - gap - 1
+        lo = hi - length
+        if lo < 0:
+            break
+        ranges.append((lo, hi))
+    return conn_id, largest, ack_delay_us, ranges
+
+
+def encode_compact_ack_ranges(conn_id: int, ranges: List[List[int]], ack_delay_us: int) -> bytes:
+    """Mêmes plages en varints: [type][conn_id][largest][ack_delay_us][count] + count x [gap][length]"""
+    entries = []
+    previous_lo = None
+    for lo, hi in ranges[:MAX_ACK_RANGES]:
+        gap = 0 if previous_lo is None else previous_lo - hi - 1
+        entries.append(encode_varint(gap) + encode_varint(hi - lo))
+        previous_lo = lo
+    return (bytes((PACKET_ACK_COMPACT,)) + conn_id.to_bytes(4, 'big') + encode_varint(ranges[0][1])
+            + encode_varint(ack_delay_us) + encode_varint(len(entries)) + b''.join(entries))
+
+
+def decode_compact_ack_ranges(data: bytes) -> Optional[Tuple[int, int, int, List[Tuple[int, int]]]]:
+    """Comme decode_ack_ranges; None si le paquet est tronqué"""
+    conn_id = int.from_bytes(data[1:COMPACT_PREFIX_SIZE], 'big')
+    try:
+        largest, offset = decode_varint(data, COMPACT_PREFIX_SIZE)
+        ack_delay_us, offset = decode_varint(data, offset)
+        count, offset = decode_varint(data, offset)
+    except IndexError:
+        return None
+
+    ranges = []
+    hi = largest
+    for i in range(min(count, MAX_ACK_RANGES)):
+        try:
+            gap, offset = decode_varint(data, offset)
+            length, offset = decode_varint(data, offset)
+        except IndexError:
+            break
+        if i > 0:
+            hi = ranges[-1][0] - gap - 1
+        lo = hi - length
+        if lo < 0:
+            break
+        ranges.append((lo, hi))
+    return conn_id, largest, ack_delay_us, ranges
+
+
+def encode_bitmap(missing: List[int]) -> Tuple[int, int, bytes]:
+    """missing trié croissant; le bitmap couvre [missing[0], missing[-1]]"""
+    base = missing[0]
+    count = missing[-1] - base + 1
+    bits = 0
+    for value in missing:
+        bits |= 1 << (value - base)
+    return base, count, bits.to_bytes((count + 7) // 8, 'little')
+
+
+def decode_bitmap(data: bytes, offset: int, base: int, count: int) -> List[int]:
+    bits = int.from_bytes(data[offset:offset + (count + 7) // 8], 'little')
+
+    missing = []
+    while bits:
+        low = bits & -bits
+        position = low.bit_length() - 1
+        if position >= count:
+            break
+        missing.append(base + position)
+        bits ^= low
+    return missing
+
+
+def encode_nack_bitmap(conn_id: int, missing: List[int]) -> bytes:
+    base, count, bitmap = encode_bitmap(missing)
+    return NACK_BITMAP_HEADER.pack(PACKET_NACK_BITMAP, conn_id, base, count) + bitmap
+
+
+def decode_nack_bitmap(data: bytes) -> List[int]:
+    _, _, base, count = NACK_BITMAP_HEADER.unpack_from(data)
+    return decode_bitmap(data, NACK_BITMAP_HEADER.size, base, count)
+
+
+def encode_fragment_nack_bitmap(conn_id: int, frame_id: int, missing: List[int]) -> bytes:
+    """Fragments manquants d'une frame, triés croissants"""
+    base, count, bitmap = encode_bitmap(missing)
+    header = FRAGMENT_NACK_BITMAP_HEADER.pack(PACKET_FRAGMENT_NACK_BITMAP, conn_id, frame_id, base, count)
+    return header + bitmap
+
+
+def decode_fragment_nack_bitmap(data: bytes) -> Tuple[int, List[int]]:
+    _, _, frame_id, base, count = FRAGMENT_NACK_BITMAP_HEADER.unpack_from(data)
+    return frame_id, decode_bitmap(data, FRAGMENT_NACK_BITMAP_HEADER.size, base, count)
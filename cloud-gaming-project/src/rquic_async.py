@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""Version asyncio (DatagramProtocol) du serveur et du client rQUIC
+
+Même logique protocolaire que rQUICServer/rQUICClient, mais pilotée par
+événements: les ACK/NACK sont traités dès leur arrivée, les retransmissions
+et TTL par des timers de la boucle. Une seule boucle peut héberger
+plusieurs sessions.
+"""
+
+import asyncio
+import time
+from typing import Optional
+
+from rquic_protocol import rQUICServer, rQUICClient
+from rquic_wire import DEFAULT_DATAGRAM_SIZE
+from rquic_payload import PayloadProvider
+from rquic_source import FrameSource
+from rquic_handshake import TokenCache
+
+
+class rQUICAsyncServer(rQUICServer, asyncio.DatagramProtocol):
+
+    def __init__(self, host: str = '0.0.0.0', port: int = 5000, ack_frequency: int = 2,
+                 require_handshake: bool = False):
+        super().__init__(host, port, ack_frequency=ack_frequency,
+                         require_handshake=require_handshake)
+        self.transport = None
+        self.stopped = asyncio.Event()
+        self._ack_timer: Optional[asyncio.TimerHandle] = None
+        self._playout_timer: Optional[asyncio.TimerHandle] = None
+        self._playout_deadline = 0.0
+
+    def connection_made(self, transport):
+        # le transport expose sendto(): send_ack/send_nack l'utilisent comme un socket
+        self.transport = transport
+        self.sock = transport
+
+    def datagram_received(self, data: bytes, addr):
+        self.client_addr = addr
+        self.handle_packet(data, addr)
+        self.arm_control_timer()
+        if self.playout_sessions:
+            self.arm_playout_timer()
+
+    def arm_control_timer(self):
+        """Timer commun aux ACK retardés et aux NACK en attente de réordonnancement"""
+        if self._ack_timer is None and (self.ack_pending_sessions or self.nack_pending_sessions):
+            delay = min(self.max_ack_delay, self.reorder_grace)
+            self._ack_timer = asyncio.get_running_loop().call_later(delay, self.on_ack_timer)
+
+    def on_ack_timer(self):
+        self._ack_timer = None
+        now = time.time()
+        self.flush_acks(now)
+        self.flush_nacks(now)
+        self.arm_control_timer()
+
+    def arm_playout_timer(self):
+        """Réveil à la prochaine échéance de lecture (une frame peut avancer l'échéance)"""
+        deadline = self.next_playout_deadline()
+        if deadline is None:
+            return
+        if self._playout_timer is not None:
+            if deadline >= self._playout_deadline:
+                return
+            self._playout_timer.cancel()
+        self._playout_deadline = deadline
+        self._playout_timer = asyncio.get_running_loop().call_later(
+            max(deadline - time.time(), 0.0), self.on_playout_timer)
+
+    def on_playout_timer(self):
+        self._playout_timer = None
+        self.flush_playout(time.time())
+        self.arm_playout_timer()
+
+    def error_received(self, exc):
+        print(f"Erreur: {exc}")
+
+    def stop(self):
+        self.running = False
+        self.stopped.set()
+
+    async def sweep_sessions(self):
+        while True:
+            await asyncio.sleep(1.0)
+            self.evict_idle_sessions(time.time())
+
+    async def serve(self, duration: int = 30) -> dict:
+        self.sock.bind((self.host, self.port))
+        # la boucle lit avec recvfrom: des datagrammes regroupés par GRO y arriveraient collés
+        self.receiver.disable()
+        loop = asyncio.get_running_loop()
+        await loop.create_datagram_endpoint(lambda: self, sock=self.sock)
+
+        self.running = True
+        self.stats.start_time = time.time()
+        cpu_start = time.process_time()
+        print(f"[rQUIC Server] Écoute sur {self.host}:{self.port} (asyncio)")
+
+        sweeper = asyncio.create_task(self.sweep_sessions())
+        try:
+            await asyncio.wait_for(self.stopped.wait(), timeout=duration + 5)
+        except asyncio.TimeoutError:
+            pass
+        sweeper.cancel()
+        for timer in (self._ack_timer, self._playout_timer):
+            if timer is not None:
+                timer.cancel()
+
+        self.running = False
+        self.stats.end_time = time.time()
+        self.stats.cpu_time = time.process_time() - cpu_start
+        self.transport.close()
+
+        return self.get_results()
+
+
+class rQUICAsyncClient(rQUICClient, asyncio.DatagramProtocol):
+
+    def __init__(self, server_host: str, server_port: int = 5000,
+                 datagram_size: int = DEFAULT_DATAGRAM_SIZE,
+                 payloads: Optional[PayloadProvider] = None,
+                 conn_id: Optional[int] = None,
+                 recovery: str = 'rfc9002',
+                 congestion: str = 'bbr',
+                 fec: str = 'none',
+                 scheduler: str = 'edf',
+                 frames: Optional[FrameSource] = None,
+                 tokens: Optional[TokenCache] = None):
+        super().__init__(server_host, server_port, datagram_size, payloads, conn_id,
+                         recovery, congestion, fec, scheduler, frames, tokens)
+        self.transport = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._timer_deadline: Optional[float] = None
+        self._pump_timer: Optional[asyncio.TimerHandle] = None
+
+    def connection_made(self, transport):
+        # le Packetizer n'a besoin que de sendto(): le transport fait office de socket,
+        # un datagramme par appel (pas de GSO)
+        self.transport = transport
+        self.sock = transport
+        self.packetizer.gso = None
+
+    def datagram_received(self, data: bytes, addr):
+        self.handle_packet(data)
+        # un ACK peut rouvrir la fenêtre de congestion
+        self.pump()
+        self.arm_timer()
+
+    def error_received(self, exc):
+        print(f"Erreur: {exc}")
+
+    def flush_send_queue(self, now: float) -> Optional[float]:
+        next_send = super().flush_send_queue(now)
+        if next_send is not None and self._pump_timer is None and self.transport is not None:
+            loop = asyncio.get_running_loop()
+            self._pump_timer = loop.call_later(max(next_send - now, 0.0005), self.on_pump_timer)
+        return next_send
+
+    def on_pump_timer(self):
+        self._pump_timer = None
+        self.pump()
+
+    def pump(self):
+        """Vide la file d'envoi; le prochain envoi pacé est reprogrammé par un timer"""
+        self.flush_send_queue(time.monotonic())
+
+    def arm_timer(self):
+        """(Re)programme le timer sur la prochaine échéance TTL/perte/PTO"""
+        deadline = self.next_deadline()
+        if deadline is None:
+            self.cancel_timer()
+            return
+        if self._timer is not None and self._timer_deadline <= deadline:
+            return
+
+        self.cancel_timer()
+        loop = asyncio.get_running_loop()
+        self._timer_deadline = deadline
+        self._timer = loop.call_later(max(deadline - time.monotonic(), 0.001), self.on_timer)
+
+    def cancel_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = None
+        self._timer_deadline = None
+
+    def on_timer(self):
+        self._timer = None
+        self._timer_deadline = None
+        self.check_timeouts()
+        self.arm_timer()
+
+    async def run(self, duration: int = 30) -> dict:
+        loop = asyncio.get_running_loop()
+        await loop.create_datagram_endpoint(lambda: self, sock=self.sock)
+
+        print(f"[rQUIC Client] Connexion à {self.server_host}:{self.server_port} (asyncio)")
+        print(f"[rQUIC Client] Durée: {duration}s, FPS: {self.fps}")
+
+        self.stats.start_time = time.time()
+        start_time = self.stats.start_time
+        frame_id = 0
+        frame_interval = 1.0 / self.fps
+        next_send = loop.time()
+        last_report = start_time
+
+        while time.time() - start_time < duration:
+            self.send_frame(frame_id)
+            frame_id += 1
+            self.arm_timer()
+
+            if time.time() - last_report >= 1.0:
+                elapsed = time.time() - start_time
+                print(f"[{elapsed:.1f}s] Envoyées: {self.stats.frames_sent}, "
+                      f"ACKs: {self.stats.acks_received}, "
+                      f"Retrans: {self.stats.retransmissions}")
+                last_report = time.time()
+
+            # les ACK arrivent pendant l'attente, pas au prochain tour de boucle
+            next_send += frame_interval
+            await asyncio.sleep(max(0.0, next_send - loop.time()))
+
+        await asyncio.sleep(0.5)
+
+        self.cancel_timer()
+        if self._pump_timer is not None:
+            self._pump_timer.cancel()
+        self.stats.end_time = time.time()
+        self.transport.close()
+
+        return self.get_results()
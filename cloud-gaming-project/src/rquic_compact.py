@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""En-tête compact rQUIC (version 2): entiers de longueur variable façon QUIC
+
+L'en-tête fixe FRAGMENT_HEADER dépasse à lui seul la charge d'un événement
+d'entrée (20 octets). Le format compact ne garde que ce qui change:
+
+    [flags][conn_id][frame_id tronqué 1-4 octets]
+    [stream_id][stream_seq]       varints, si FLAG_STREAM
+    [size][frag_index][frag_count] varints, si FLAG_FRAGMENTED
+    [ref_delta << 2 | frame_type]  varint, si FLAG_REFERENCE
+    + charge utile
+
+flags: bit 7 toujours à 1 (les types historiques sont tous < 0x80), bit 6
+FLAG_REFERENCE, bits 4-5 longueur du frame ID - 1, bit 3 FLAG_FRAGMENTED,
+bit 2 FLAG_STREAM, bits 0-1 priorité. Sans FLAG_FRAGMENTED la frame tient
+dans le datagramme: sa taille est celle de la charge. Sans FLAG_STREAM:
+flux 0, séquence = frame ID. Sans FLAG_REFERENCE: I-frame sans référence.
+
+Le frame ID est tronqué par rapport au plus grand frame ID acquitté
+(RFC 9000 A.2/A.3): le serveur le reconstruit autour de la frame attendue.
+"""
+
+from typing import Optional, Tuple
+
+from rquic_wire import PACKET_COMPACT, PACKET_FRAGMENT_NACK_COMPACT
+
+FLAG_STREAM = 0x04
+FLAG_FRAGMENTED = 0x08
+FLAG_REFERENCE = 0x40
+FRAME_ID_LENGTH_SHIFT = 4
+PRIORITY_MASK = 0x03
+# [flags][conn_id]
+COMPACT_PREFIX_SIZE = 5
+
+MAX_VARINT = (1 << 62) - 1
+
+
+def encode_varint(value: int) -> bytes:
+    """Varint QUIC (RFC 9000 §16): 2 bits de poids fort = longueur 1, 2, 4 ou 8 octets"""
+    if value < 0x40:
+        return bytes((value,))
+    if value < 0x4000:
+        return (value | 0x4000).to_bytes(2, 'big')
+    if value < 0x40000000:
+        return (value | 0x80000000).to_bytes(4, 'big')
+    if value <= MAX_VARINT:
+        return (value | 0xC000000000000000).to_bytes(8, 'big')
+    raise ValueError(f"varint hors limites: {value}")
+
+
+def decode_varint(data: bytes, offset: int) -> Tuple[int, int]:
+    """(valeur, offset suivant); IndexError si le paquet est tronqué"""
+    first = data[offset]
+    length = 1 << (first >> 6)
+    end = offset + length
+    if end > len(data):
+        raise IndexError("varint tronqué")
+    value = first & 0x3F
+    for byte in data[offset + 1:end]:
+        value = (value << 8) | byte
+    return value, end
+
+
+def frame_id_length(frame_id: int, largest_acked: int, largest_sent: int) -> int:
+    """Octets nécessaires pour que le serveur reconstruise frame_id
+
+    Le serveur attend une frame entre largest_acked + 1 et largest_sent + 1:
+    l'écart au pire des deux doit tenir dans une demi-fenêtre.
+    """
+    distance = max(abs(frame_id - largest_acked - 1), abs(frame_id - largest_sent - 1))
+    for length in (1, 2, 3):
+        if distance < 1 << (8 * length - 1):
+            return length
+    return 4
+
+
+def expand_frame_id(truncated: int, length: int, expected: int) -> int:
+    """Frame ID complet le plus proche de expected (RFC 9000 A.3)"""
+    if length == 4:
+        return truncated
+    window = 1 << (8 * length)
+    half_window = window // 2
+    candidate = (expected & ~(window - 1)) | truncated
+    if candidate <= expected - half_window and candidate < (1 << 32) - window:
+        return candidate + window
+    if candidate > expected + half_window and candidate >= window:
+        return candidate - window
+    return candidate
+
+
+def encode_compact_fragment(conn_id: int, frame_id: int, id_length: int, frame_size: int,
+                            priority: int, stream_id: int, stream_seq: int,
+                            frag_index: int, frag_count: int,
+                            frame_type: int = 0, reference_delta: int = 0) -> bytes:
+    flags = PACKET_COMPACT | (id_length - 1) << FRAME_ID_LENGTH_SHIFT | (priority & PRIORITY_MASK)
+    fields = []
+    if stream_id != 0 or stream_seq != frame_id & 0xFFFFFFFF:
+        flags |= FLAG_STREAM
+        fields += [encode_varint(stream_id), encode_varint(stream_seq)]
+    if frag_count > 1:
+        flags |= FLAG_FRAGMENTED
+        fields += [encode_varint(frame_size), encode_varint(frag_index), encode_varint(frag_count)]
+    if frame_type != 0 or reference_delta != 0:
+        flags |= FLAG_REFERENCE
+        fields.append(encode_varint(reference_delta << 2 | frame_type))
+    truncated = frame_id & ((1 << (8 * id_length)) - 1)
+    return (bytes((flags,)) + conn_id.to_bytes(4, 'big') + truncated.to_bytes(id_length, 'big')
+            + b''.join(fields))
+
+
+def compact_conn_id(data: bytes) -> int:
+    return int.from_bytes(data[1:COMPACT_PREFIX_SIZE], 'big')
+
+
+def decode_compact_fragment(data: bytes, expected: int) -> Optional[tuple]:
+    """(frame_id, size, priority, stream_id, stream_seq, frag_index, frag_count,
+    frame_type, ref_delta, début de la charge)
+
+    None si le paquet est tronqué.
+    """
+    flags = data[0]
+    id_length = ((flags >> FRAME_ID_LENGTH_SHIFT) & 0x03) + 1
+    offset = COMPACT_PREFIX_SIZE + id_length
+    if offset > len(data):
+        return None
+    frame_id = expand_frame_id(int.from_bytes(data[COMPACT_PREFIX_SIZE:offset], 'big'),
+                               id_length, expected)
+    stream_id, stream_seq = 0, frame_id & 0xFFFFFFFF
+    frag_index, frag_count = 0, 1
+    frame_type, reference_delta = 0, 0
+    try:
+        if flags & FLAG_STREAM:
+            stream_id, offset = decode_varint(data, offset)
+            stream_seq, offset = decode_varint(data, offset)
+        if flags & FLAG_FRAGMENTED:
+            frame_size, offset = decode_varint(data, offset)
+            frag_index, offset = decode_varint(data, offset)
+            frag_count, offset = decode_varint(data, offset)
+        if flags & FLAG_REFERENCE:
+            reference, offset = decode_varint(data, offset)
+            frame_type, reference_delta = reference & 0x03, reference >> 2
+        if not flags & FLAG_FRAGMENTED:
+            frame_size = len(data) - offset
+    except IndexError:
+        return None
+    return (frame_id, frame_size, flags & PRIORITY_MASK, stream_id, stream_seq,
+            frag_index, frag_count, frame_type, reference_delta, offset)
+
+
+def encode_compact_fragment_nack(conn_id: int, frame_id: int, frag_index: int) -> bytes:
+    """[type][conn_id][frame_id varint][frag_index varint]"""
+    return (bytes((PACKET_FRAGMENT_NACK_COMPACT,)) + conn_id.to_bytes(4, 'big')
+            + encode_varint(frame_id) + encode_varint(frag_index))
+
+
+def decode_compact_fragment_nack(data: bytes) -> Optional[Tuple[int, int]]:
+    try:
+        frame_id, offset = decode_varint(data, COMPACT_PREFIX_SIZE)
+        frag_index, _ = decode_varint(data, offset)
+    except IndexError:
+        return None
+    return frame_id, frag_index
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""Contrôle de congestion et pacing côté client
+
+Même interface pour chaque algorithme (choisi par rQUICClient.congestion):
+cwnd en octets, pacing_rate(srtt) en octets/s (None = pas de limite),
+on_ack(octets, rtt, now), on_loss(sent_time, now) et on_app_limited(octets en
+vol), appelé quand la file d'envoi se vide sous la fenêtre.
+
+Les ACK sont par frame et pas par datagramme: la fenêtre initiale doit
+couvrir quelques frames entières, sinon la première ne serait jamais acquittée.
+
+- none:    pas de fenêtre ni de pacing, une rafale par frame (comportement historique)
+- newreno: slow start, évitement de congestion, division par deux sur perte
+- bbr:     débit goulot estimé x RTT min, insensible aux pertes isolées
+"""
+
+from collections import deque
+from typing import Optional
+
+INITIAL_WINDOW_PACKETS = 10
+MINIMUM_WINDOW_PACKETS = 2
+
+
+class NoCongestionControl:
+
+    def __init__(self, mss: int, initial_window: int = 0):
+        self.mss = mss
+        self.cwnd = float('inf')
+
+    def pacing_rate(self, srtt: float) -> Optional[float]:
+        return None
+
+    def on_ack(self, acked_bytes: int, rtt: Optional[float], now: float):
+        pass
+
+    def on_loss(self, sent_time: float, now: float):
+        pass
+
+    def on_app_limited(self, bytes_in_flight: int):
+        pass
+
+
+class NewRenoController:
+    """RFC 9002 §7: une seule réduction par période de récupération"""
+
+    def __init__(self, mss: int, initial_window: int = 0):
+        self.mss = mss
+        self.cwnd = max(INITIAL_WINDOW_PACKETS * mss, initial_window)
+        self.ssthresh = float('inf')
+        self.recovery_start = -1.0
+
+    def pacing_rate(self, srtt: float) -> Optional[float]:
+        # 5/4 de la fenêtre par RTT: la fenêtre reste le vrai limiteur
+        return 1.25 * self.cwnd / max(srtt, 0.001)
+
+    def on_ack(self, acked_bytes: int, rtt: Optional[float], now: float):
+        if self.cwnd < self.ssthresh:
+            self.cwnd += acked_bytes
+        else:
+            self.cwnd += self.mss * acked_bytes / self.cwnd
+
+    def on_loss(self, sent_time: float, now: float):
+        # perte d'une frame envoyée avant la dernière réduction: déjà comptée
+        if sent_time <= self.recovery_start:
+            return
+        self.recovery_start = now
+        self.ssthresh = max(self.cwnd / 2, MINIMUM_WINDOW_PACKETS * self.mss)
+        self.cwnd = self.ssthresh
+
+    def on_app_limited(self, bytes_in_flight: int):
+        pass
+
+
+class BbrLikeController:
+    """Modèle du chemin: débit goulot (max des débits de livraison récents) et RTT min
+
+    Startup (gain 2.89) jusqu'à ce que le débit ne progresse plus de 25% sur
+    trois tours, puis cycle de gains autour du débit estimé. Les pertes ne
+    réduisent pas la fenêtre: c'est la hausse du RTT qui freine.
+
+    Un échantillon pris alors que l'application n'avait rien à envoyer (petites
+    frames CRITICAL acquittées avant la première vidéo) mesure l'application,
+    pas le chemin: il ne peut que relever le débit estimé, et ne compte pas
+    pour la sortie de Startup. Jusque-là, fenêtre et débit restent au moins
+    ceux de la fenêtre initiale.
+    """
+
+    STARTUP_GAIN = 2.89
+    GAIN_CYCLE = (1.25, 0.75, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0)
+    MIN_RTT_WINDOW = 10.0
+    BW_WINDOW_ROUNDS = 10
+    # le flux vidéo est limité par l'application: une I-frame toutes les
+    # secondes seulement, son échantillon de débit doit rester dans le filtre
+    BW_WINDOW_MIN = 1.0
+
+    def __init__(self, mss: int, initial_window: int = 0):
+        self.mss = mss
+        self.cwnd = max(INITIAL_WINDOW_PACKETS * mss, initial_window)
+        self.initial_window = self.cwnd
+        # plus gros ACK vu: une frame entière est acquittée d'un coup
+        self.max_acked = 0
+        self.btl_bw = 0.0
+        self.min_rtt: Optional[float] = None
+        self.min_rtt_stamp = 0.0
+
+        self.delivered = 0
+        # octets livrés jusqu'auxquels les ACK sont limités par l'application
+        self.app_limited_until = 0
+        self.ack_history = deque()
+        self.bw_samples = deque()
+
+        self.filled_pipe = False
+        self.full_bw = 0.0
+        self.full_bw_rounds = 0
+        self.round_start = 0.0
+        self.cycle_index = 0
+
+    @property
+    def pacing_gain(self) -> float:
+        if not self.filled_pipe:
+            return self.STARTUP_GAIN
+        return self.GAIN_CYCLE[self.cycle_index]
+
+    def pacing_rate(self, srtt: float) -> Optional[float]:
+        if self.btl_bw == 0:
+            return self.STARTUP_GAIN * self.cwnd / max(srtt, 0.001)
+        rate = self.pacing_gain * self.btl_bw
+        if not self.filled_pipe:
+            rate = max(rate, self.STARTUP_GAIN * self.initial_window / max(srtt, 0.001))
+        return rate
+
+    def on_ack(self, acked_bytes: int, rtt: Optional[float], now: float):
+        if rtt is not None and (self.min_rtt is None or rtt <= self.min_rtt
+                                or now - self.min_rtt_stamp > self.MIN_RTT_WINDOW):
+            self.min_rtt = rtt
+            self.min_rtt_stamp = now
+        if self.min_rtt is None:
+            return
+        round_time = max(self.min_rtt, 0.001)
+
+        # débit de livraison sur le dernier RTT min
+        self.delivered += acked_bytes
+        app_limited = self.delivered <= self.app_limited_until
+        self.max_acked = max(self.max_acked, acked_bytes)
+        self.ack_history.append((now, self.delivered))
+        while len(self.ack_history) > 2 and now - self.ack_history[1][0] >= round_time:
+            self.ack_history.popleft()
+        first_time, first_delivered = self.ack_history[0]
+        if now - first_time >= round_time / 2:
+            rate = (self.delivered - first_delivered) / (now - first_time)
+            if not app_limited or rate >= self.btl_bw:
+                self.bw_samples.append((now, rate))
+        bw_window = max(self.BW_WINDOW_ROUNDS * round_time, self.BW_WINDOW_MIN)
+        while self.bw_samples and now - self.bw_samples[0][0] > bw_window:
+            self.bw_samples.popleft()
+        if self.bw_samples:
+            self.btl_bw = max(rate for _, rate in self.bw_samples)
+
+        if now - self.round_start >= round_time:
+            self.round_start = now
+            self.on_round(app_limited)
+
+        if self.btl_bw:
+            gain = 2.0 if self.filled_pipe else self.STARTUP_GAIN
+            # BDP plus l'agrégation des ACK (une frame par ACK)
+            bdp = gain * self.btl_bw * self.min_rtt
+            self.cwnd = max(bdp + 2 * self.max_acked, 4 * self.mss)
+            if not self.filled_pipe:
+                self.cwnd = max(self.cwnd, self.initial_window)
+
+    def on_round(self, app_limited: bool):
+        if self.filled_pipe:
+            self.cycle_index = (self.cycle_index + 1) % len(self.GAIN_CYCLE)
+            return
+        if app_limited:
+            return
+        if self.btl_bw >= self.full_bw * 1.25:
+            self.full_bw = self.btl_bw
+            self.full_bw_rounds = 0
+            return
+        self.full_bw_rounds += 1
+        if self.full_bw_rounds >= 3:
+            self.filled_pipe = True
+
+    def on_loss(self, sent_time: float, now: float):
+        pass
+
+    def on_app_limited(self, bytes_in_flight: int):
+        # les ACK de ce qui est en vol (au moins le prochain) mesurent l'application
+        self.app_limited_until = self.delivered + max(bytes_in_flight, 1)
+
+
+class TokenBucketPacer:
+    """Jetons en octets, remplis à rate
+
+    La rafale autorisée est au moins burst, et au moins granularity secondes
+    de débit: la boucle d'envoi ne se réveille pas plus finement.
+    """
+
+    def __init__(self, burst: int, granularity: float = 0.002):
+        self.burst = burst
+        self.granularity = granularity
+        self.rate: Optional[float] = None
+        self.tokens = float(burst)
+        self.last_refill = 0.0
+
+    def refill(self, now: float):
+        if self.rate is not None:
+            cap = max(self.burst, self.rate * self.granularity)
+            self.tokens = min(cap, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+
+    def delay(self, size: int, now: float) -> float:
+        """Attente avant de pouvoir envoyer size octets (0 = tout de suite)"""
+        if self.rate is None:
+            return 0.0
+        self.refill(now)
+        if self.tokens >= size:
+            return 0.0
+        return (size - self.tokens) / self.rate
+
+    def consume(self, size: int):
+        if self.rate is not None:
+            self.tokens -= size
+
+
+CONGESTION_MODES = {
+    'none': NoCongestionControl,
+    'newreno': NewRenoController,
+    'bbr': BbrLikeController,
+}
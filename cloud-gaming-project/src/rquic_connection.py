@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""Connexion rQUIC embarquable: l'application pousse ses frames, la boucle lui appartient
+
+    conn = rQUICConnection('10.0.0.2', 5000, on_delivered=..., on_dropped=...)
+    conn.connect()
+    conn.open_stream(1, FramePriority.MEDIUM, name='VIDEO')
+    conn.send(1, memoryview(encoded), deadline=time.monotonic() + 0.05)
+    for event in conn.poll(0.005):
+        ...
+    conn.close(linger=0.5)
+
+send() copie la charge une fois dans un slot pré-alloué du pool de
+retransmission (rquic_pool), sans allocation: le tampon de l'encodeur est
+réutilisable dès le retour. Pool plein de frames plus prioritaires: la
+frame est refusée (on_dropped, raison backpressure), writable() permet de
+le savoir avant d'encoder. poll() traite ACK, timers et file d'envoi pacée
+puis rend la main; fileno() et next_wakeup() permettent de l'intégrer à une
+boucle select/asyncio existante, receive() l'attend depuis une coroutine.
+"""
+
+import asyncio
+import select
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from rquic_protocol import rQUICClient
+from rquic_source import FrameType
+from rquic_stream import DEFAULT_STREAM_ID, rQUICStream
+from rquic_wire import FramePriority
+
+
+@dataclass
+class FrameEvent:
+    """Issue d'une frame envoyée par send()"""
+    frame_id: int
+    stream_id: int
+    delivered: bool
+    # création -> ACK (frames livrées)
+    latency_ms: float = 0.0
+    # abandon: ttl, late, retries, gop, evicted, backpressure ou closed
+    reason: str = ''
+
+
+class rQUICConnection(rQUICClient):
+    """rQUICClient sans boucle propre: send / poll / close
+
+    on_delivered(frame_id, stream_id, latency_ms) et on_dropped(frame_id,
+    stream_id, reason) sont appelés pendant poll(), au moment où l'ACK ou
+    l'abandon est traité; les mêmes événements sont retournés par poll().
+    Les autres options sont celles de rQUICClient.
+    """
+
+    def __init__(self, server_host: str, server_port: int = 5000,
+                 on_delivered: Optional[Callable] = None,
+                 on_dropped: Optional[Callable] = None, **options):
+        super().__init__(server_host, server_port, **options)
+        self.on_delivered = on_delivered
+        self.on_dropped = on_dropped
+        self.events: deque = deque()
+        self.next_frame_id = 0
+        self.next_send: Optional[float] = None
+        self.closed = False
+        # poll() attend avec select(): le socket ne bloque jamais
+        self.sock.setblocking(False)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if not self.closed:
+            self.close()
+
+    def connect(self, timeout: float = 1.0) -> float:
+        # la poignée de main attend le HELLO_ACK sur le socket
+        self.sock.settimeout(0.001)
+        try:
+            return super().connect(timeout)
+        finally:
+            self.sock.setblocking(False)
+
+    def send(self, stream: int, payload, priority: Optional[FramePriority] = None,
+             deadline: Optional[float] = None, frame_type: Optional[FrameType] = None,
+             reference: Optional[int] = None) -> int:
+        """Envoie payload (bytes ou memoryview) sur le flux; retourne son frame ID
+
+        deadline: échéance en time.monotonic(), None = TTL du flux ou de la
+        priorité. frame_type/reference: position dans le GOP (vidéo).
+        """
+        if self.closed:
+            raise ConnectionError("connexion rQUIC fermée")
+        if stream not in self.streams:
+            raise ValueError(f"stream {stream} non ouvert")
+        frame_id = self.next_frame_id
+        self.next_frame_id += 1
+        self.send_frame(frame_id, priority, stream_id=stream, data=payload,
+                        frame_type=frame_type, reference=reference, deadline=deadline)
+        return frame_id
+
+    def on_frame_delivered(self, frame_id: int, stream: rQUICStream, latency_ms: float):
+        self.events.append(FrameEvent(frame_id, stream.stream_id, True, latency_ms))
+        if self.on_delivered is not None:
+            self.on_delivered(frame_id, stream.stream_id, latency_ms)
+
+    def on_frame_dropped(self, frame_id: int, stream: rQUICStream, reason: str):
+        self.events.append(FrameEvent(frame_id, stream.stream_id, False, reason=reason))
+        if self.on_dropped is not None:
+            self.on_dropped(frame_id, stream.stream_id, reason)
+
+    def writable(self, size: int, priority: FramePriority = FramePriority.MEDIUM) -> bool:
+        """send() de size octets à cette priorité aurait une place dans le pool"""
+        return self.pool is None or self.pool.has_room(size, priority)
+
+    def fileno(self) -> int:
+        return self.sock.fileno()
+
+    def next_wakeup(self) -> Optional[float]:
+        """Prochain appel utile à poll() hors réception (time.monotonic), None = aucun"""
+        deadlines = [d for d in (self.next_send, self.next_deadline()) if d is not None]
+        return min(deadlines) if deadlines else None
+
+    def poll(self, timeout: float = 0.0) -> List[FrameEvent]:
+        """Traite ACK, timers et envois pendant au plus timeout s
+
+        Rend la main dès qu'un événement est disponible; retourne les
+        événements survenus depuis le dernier appel.
+        """
+        end = time.monotonic() + timeout
+        while True:
+            self.process_acks()
+            self.check_timeouts()
+            now = time.monotonic()
+            self.next_send = self.flush_send_queue(now)
+            if self.events or now >= end:
+                break
+            wakeup = self.next_wakeup()
+            wakeup = end if wakeup is None else min(wakeup, end)
+            select.select([self.sock], [], [], max(wakeup - now, 0.0))
+        events = list(self.events)
+        self.events.clear()
+        return events
+
+    async def receive(self) -> FrameEvent:
+        """Prochain événement, sans bloquer la boucle asyncio"""
+        loop = asyncio.get_running_loop()
+        while not self.events:
+            readable = loop.create_future()
+            loop.add_reader(self.fileno(), lambda: readable.done() or readable.set_result(None))
+            wakeup = self.next_wakeup()
+            try:
+                await asyncio.wait_for(readable, None if wakeup is None
+                                       else max(wakeup - time.monotonic(), 0.0))
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                loop.remove_reader(self.fileno())
+            self.events.extend(self.poll())
+        return self.events.popleft()
+
+    def close(self, linger: float = 0.0) -> dict:
+        """Attend au plus linger s les ACK en attente, abandonne le reste, ferme le socket"""
+        if self.closed:
+            return self.get_results()
+        end = time.monotonic() + linger
+        while self.pending_acks and time.monotonic() < end:
+            self.poll(end - time.monotonic())
+        for frame_id in list(self.pending_acks):
+            self.discard_frame(frame_id, 'closed')
+        self.closed = True
+        self.stats.end_time = time.time()
+        self.sock.close()
+        return self.get_results()
+
+    def run(self, duration: int = 30) -> dict:
+        """Démo: frames de la source (synthétique ou trace) à self.fps sur le flux par défaut"""
+        print(f"[rQUIC Client] Connexion à {self.server_host}:{self.server_port}")
+        print(f"[rQUIC Client] Durée: {duration}s, FPS: {self.fps}")
+
+        self.stats.start_time = time.time()
+        frame_interval = 1.0 / self.fps
+        next_frame = time.monotonic()
+        end = next_frame + duration
+        last_report = next_frame
+
+        while next_frame < end:
+            size, frame_type = self.next_frame()
+            self.send(DEFAULT_STREAM_ID, self.payloads.get(size), frame_type=frame_type)
+
+            if next_frame - last_report >= 1.0:
+                print(f"[{next_frame + duration - end:.1f}s] Envoyées: {self.stats.frames_sent}, "
+                      f"ACKs: {self.stats.acks_received}, "
+                      f"Retrans: {self.stats.retransmissions}")
+                last_report = next_frame
+
+            next_frame += frame_interval
+            now = time.monotonic()
+            while now < next_frame:
+                self.poll(next_frame - now)
+                now = time.monotonic()
+
+        return self.close(linger=0.5)
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""Correction d'erreurs (FEC) par frame: datagrammes de parité après les fragments
+
+Le client ajoute parity_count symboles de parité à chaque frame (ratio par
+FramePriority), le serveur reconstruit les fragments perdus sans aller-retour.
+Tous les symboles ont la taille du premier fragment, le dernier est complété
+par des zéros.
+
+- xor: fragment i dans le groupe i % parity_count, une parité XOR par groupe;
+  répare une perte par groupe, quasi gratuit en CPU
+- rs:  Reed-Solomon systématique sur GF(256) (matrice de Cauchy); répare
+  n'importe quelles parity_count pertes, limité à 255 symboles par frame
+"""
+
+import math
+from typing import Dict, List, Optional, Sequence
+
+# GF(2^8), polynôme x^8 + x^4 + x^3 + x^2 + 1
+_EXP = [0] * 512
+_LOG = [0] * 256
+_x = 1
+for _i in range(255):
+    _EXP[_i] = _x
+    _LOG[_x] = _i
+    _x <<= 1
+    if _x & 0x100:
+        _x ^= 0x11D
+for _i in range(255, 512):
+    _EXP[_i] = _EXP[_i - 255]
+
+# une table de traduction par coefficient: c * symbole = symbole.translate(_MUL[c])
+_MUL = [bytes(256)] + [
+    bytes([0] + [_EXP[_LOG[c] + _LOG[v]] for v in range(1, 256)]) for c in range(1, 256)
+]
+
+
+def gf_mul(a: int, b: int) -> int:
+    if a == 0 or b == 0:
+        return 0
+    return _EXP[_LOG[a] + _LOG[b]]
+
+
+def gf_inv(a: int) -> int:
+    return _EXP[255 - _LOG[a]]
+
+
+def xor_symbols(symbols: Sequence[bytes], size: int) -> bytes:
+    acc = 0
+    for symbol in symbols:
+        acc ^= int.from_bytes(symbol, 'little')
+    return acc.to_bytes(size, 'little')
+
+
+def pad(symbol: bytes, size: int) -> bytes:
+    return symbol if len(symbol) == size else bytes(symbol).ljust(size, b'\0')
+
+
+class XorCodec:
+    scheme_id = 1
+    max_symbols = 0xFFFF
+
+    def encode(self, chunks: List[bytes], parity_count: int) -> List[bytes]:
+        size = len(chunks[0])
+        return [xor_symbols(chunks[group::parity_count], size) for group in range(parity_count)]
+
+    def decode(self, fragments: list, parity: Dict[int, bytes], parity_count: int) -> Dict[int, bytes]:
+        """Fragments reconstruits {index: symbole}, éventuellement aucun"""
+        recovered = {}
+        for group, symbol in parity.items():
+            indexes = range(group, len(fragments), parity_count)
+            missing = [i for i in indexes if fragments[i] is None]
+            if len(missing) != 1:
+                continue
+            size = len(symbol)
+            others = [pad(fragments[i], size) for i in indexes if fragments[i] is not None]
+            recovered[missing[0]] = xor_symbols(others + [symbol], size)
+        return recovered
+
+
+class ReedSolomonCodec:
+    """Parité j = somme des d_i * 1/(x_j + y_i), y_i = i et x_j = k + j
+
+    Toute sous-matrice carrée d'une matrice de Cauchy est inversible: e pertes
+    se résolvent avec n'importe quelles e parités reçues.
+    """
+
+    scheme_id = 2
+    max_symbols = 255
+
+    @staticmethod
+    def coefficient(frag_count: int, parity_index: int, frag_index: int) -> int:
+        return gf_inv((frag_count + parity_index) ^ frag_index)
+
+    def encode(self, chunks: List[bytes], parity_count: int) -> List[bytes]:
+        size = len(chunks[0])
+        count = len(chunks)
+        return [
+            xor_symbols([chunk.translate(_MUL[self.coefficient(count, j, i)])
+                         for i, chunk in enumerate(chunks)], size)
+            for j in range(parity_count)
+        ]
+
+    def decode(self, fragments: list, parity: Dict[int, bytes], parity_count: int) -> Dict[int, bytes]:
+        lost = [i for i, fragment in enumerate(fragments) if fragment is None]
+        if not lost or len(lost) > len(parity):
+            return {}
+        count = len(fragments)
+        rows = sorted(parity)[:len(lost)]
+        size = len(parity[rows[0]])
+
+        # syndromes: on retire des parités la contribution des fragments reçus
+        syndromes = []
+        for j in rows:
+            known = [pad(fragment, size).translate(_MUL[self.coefficient(count, j, i)])
+                     for i, fragment in enumerate(fragments) if fragment is not None]
+            syndromes.append(xor_symbols(known + [parity[j]], size))
+
+        matrix = [[self.coefficient(count, j, i) for i in lost] for j in rows]
+        inverse = invert_matrix(matrix)
+        return {
+            index: xor_symbols([syndromes[r].translate(_MUL[inverse[c][r]])
+                                for r in range(len(rows)) if inverse[c][r]], size)
+            for c, index in enumerate(lost)
+        }
+
+
+def invert_matrix(matrix: List[List[int]]) -> List[List[int]]:
+    """Gauss-Jordan sur GF(256), matrice carrée inversible"""
+    n = len(matrix)
+    rows = [list(row) + [int(i == r) for i in range(n)] for r, row in enumerate(matrix)]
+    for col in range(n):
+        pivot = next(r for r in range(col, n) if rows[r][col])
+        rows[col], rows[pivot] = rows[pivot], rows[col]
+        scale = gf_inv(rows[col][col])
+        rows[col] = [gf_mul(v, scale) for v in rows[col]]
+        for r in range(n):
+            factor = rows[r][col]
+            if r != col and factor:
+                rows[r] = [v ^ gf_mul(factor, p) for v, p in zip(rows[r], rows[col])]
+    return [row[n:] for row in rows]
+
+
+def parity_count(codec, frag_count: int, ratio: float) -> int:
+    """Nombre de symboles de parité pour une frame (0 si le codec ne peut pas la couvrir)"""
+    if codec is None or ratio <= 0:
+        return 0
+    count = max(1, math.ceil(frag_count * ratio))
+    if frag_count + count > codec.max_symbols:
+        return 0
+    return count
+
+
+FEC_CODECS = {
+    'xor': XorCodec,
+    'rs': ReedSolomonCodec,
+}
+
+FEC_SCHEMES = {codec.scheme_id: codec() for codec in FEC_CODECS.values()}
+
+
+def codec_for_scheme(scheme_id: int) -> Optional[object]:
+    return FEC_SCHEMES.get(scheme_id)
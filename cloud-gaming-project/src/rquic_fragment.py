@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""Découpage des frames en datagrammes MTU et réassemblage côté serveur"""
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from rquic_wire import FRAGMENT_HEADER, FEC_HEADER, PACKET_FRAGMENT, PACKET_FEC, DEFAULT_DATAGRAM_SIZE
+from rquic_fec import codec_for_scheme
+from rquic_compact import encode_compact_fragment, frame_id_length
+from rquic_gso import GsoSender
+
+
+class Packetizer:
+    """Découpe une frame en fragments [en-tête + morceau] de taille MTU"""
+
+    def __init__(self, datagram_size: int = DEFAULT_DATAGRAM_SIZE, conn_id: int = 0):
+        if datagram_size <= FRAGMENT_HEADER.size:
+            raise ValueError(f"datagram_size trop petit: {datagram_size}")
+        self.datagram_size = datagram_size
+        self.conn_id = conn_id
+        self.fragment_payload = datagram_size - FRAGMENT_HEADER.size
+
+        # buffers d'envoi réutilisés: en-tête écrit avec pack_into, jamais réalloué
+        self._header = bytearray(FRAGMENT_HEADER.size)
+        self._fec_header = bytearray(FEC_HEADER.size)
+        self._send_buffer = bytearray(datagram_size)
+        self._send_view = memoryview(self._send_buffer)
+        # HELLO 0-RTT collé devant chaque fragment tant que le serveur ne l'a pas acquitté,
+        # retiré de fragment_payload (set_prefix) pour rester dans datagram_size
+        self.prefix = b''
+        # en-tête compact (version 2), activé quand le HELLO_ACK l'annonce; le découpage
+        # ne change pas (fragment_payload), seul l'en-tête raccourcit
+        self.compact = False
+        # références de la troncature des frame IDs, tenues à jour même en format fixe
+        self.largest_acked = -1
+        self.largest_sent = -1
+        # envoi groupé (GSO) des datagrammes de ce socket, vidé par flush(); None = un sendmsg chacun
+        self.gso: Optional[GsoSender] = None
+        self.send_calls = 0
+        # découpage des frames encore vivantes au dernier resize(): leurs fragments
+        # retransmis doivent garder les mêmes bornes
+        self.layouts: Dict[int, int] = {}
+
+    def resize(self, datagram_size: int, live_frames):
+        """Nouvelle taille de datagramme (PMTU) pour les frames à venir"""
+        self.layouts = {frame_id: self.layouts.get(frame_id, self.fragment_payload)
+                        for frame_id in live_frames}
+        self.datagram_size = datagram_size
+        self.fragment_payload = datagram_size - FRAGMENT_HEADER.size - len(self.prefix)
+        self._send_buffer = bytearray(datagram_size)
+        self._send_view = memoryview(self._send_buffer)
+
+    def set_prefix(self, prefix: bytes, live_frames):
+        """Colle (ou retire) le HELLO 0-RTT; les frames en cours gardent leur découpage"""
+        self.prefix = prefix
+        self.resize(self.datagram_size, live_frames)
+
+    def fragment_count(self, frame_size: int, frame_id: Optional[int] = None) -> int:
+        """Fragments de la frame (frame_id: découpage d'avant un resize())"""
+        return max(1, -(-frame_size // self.layouts.get(frame_id, self.fragment_payload)))
+
+    def fragment_size(self, frame_size: int, index: int, frame_id: Optional[int] = None) -> int:
+        """Taille sur le fil du fragment index (en-tête compris)"""
+        fragment_payload = self.layouts.get(frame_id, self.fragment_payload)
+        start = index * fragment_payload
+        return FRAGMENT_HEADER.size + min(fragment_payload, frame_size - start)
+
+    def send_fragment(self, sock, addr, frame_id: int, payload: memoryview,
+                      priority: int, index: int, stream_id: int = 0, stream_seq: int = 0,
+                      frame_type: int = 0, reference_delta: int = 0) -> int:
+        """Envoie le fragment index de payload sans concaténer en-tête et données"""
+        size = len(payload)
+        fragment_payload = self.layouts.get(frame_id, self.fragment_payload)
+        start = index * fragment_payload
+        chunk = payload[start:start + fragment_payload]
+        end = FRAGMENT_HEADER.size + len(chunk)
+
+        header = None
+        if self.compact:
+            header = encode_compact_fragment(
+                self.conn_id, frame_id, frame_id_length(frame_id, self.largest_acked, self.largest_sent),
+                size, priority, stream_id, stream_seq, index, self.fragment_count(size, frame_id),
+                frame_type, reference_delta)
+        self.largest_sent = max(self.largest_sent, frame_id)
+        # varints énormes (séquence > 2^30): plus long que le fixe, le serveur accepte les deux
+        if header is not None and len(header) <= FRAGMENT_HEADER.size:
+            return self.send_datagram(sock, addr, [self.prefix, header, chunk] if self.prefix
+                                      else [header, chunk])
+
+        if hasattr(sock, 'sendmsg'):
+            FRAGMENT_HEADER.pack_into(self._header, 0, PACKET_FRAGMENT, self.conn_id, frame_id, size,
+                                      priority, stream_id, stream_seq, frame_type, reference_delta,
+                                      index, self.fragment_count(size, frame_id))
+            if self.prefix:
+                self.send_parts(sock, addr, [self.prefix, self._header, chunk])
+                return len(self.prefix) + end
+            self.send_parts(sock, addr, [self._header, chunk])
+            return end
+
+        # pas de scatter-gather (ou transport asyncio): copie dans le buffer d'envoi réutilisable
+        FRAGMENT_HEADER.pack_into(self._send_buffer, 0, PACKET_FRAGMENT, self.conn_id, frame_id, size,
+                                  priority, stream_id, stream_seq, frame_type, reference_delta,
+                                  index, self.fragment_count(size, frame_id))
+        self._send_buffer[FRAGMENT_HEADER.size:end] = chunk
+        self.send_calls += 1
+        if self.prefix:
+            sock.sendto(self.prefix + self._send_view[:end], addr)
+            return len(self.prefix) + end
+        sock.sendto(self._send_view[:end], addr)
+        return end
+
+    def send_datagram(self, sock, addr, parts: list) -> int:
+        if hasattr(sock, 'sendmsg'):
+            self.send_parts(sock, addr, parts)
+        else:
+            sock.sendto(b''.join(parts), addr)
+            self.send_calls += 1
+        return sum(len(part) for part in parts)
+
+    def send_parts(self, sock, addr, parts: list):
+        if self.gso is not None and sock is self.gso.sock:
+            self.gso.add(parts, addr)
+        else:
+            # autre socket (multipath): le lot GSO en cours part avant, l'ordre d'émission est gardé
+            self.flush()
+            sock.sendmsg(parts, (), 0, addr)
+            self.send_calls += 1
+
+    def flush(self):
+        """Envoie le lot GSO en cours"""
+        if self.gso is not None:
+            self.gso.flush()
+
+    @property
+    def syscalls(self) -> int:
+        return self.send_calls + (self.gso.send_calls if self.gso is not None else 0)
+
+    def frame_chunks(self, payload: memoryview) -> List[bytes]:
+        """Fragments de la frame, le dernier complété à la taille du premier (symboles FEC)"""
+        count = self.fragment_count(len(payload))
+        size = min(len(payload), self.fragment_payload)
+        chunks = [bytes(payload[i * self.fragment_payload:(i + 1) * self.fragment_payload])
+                  for i in range(count)]
+        chunks[-1] = chunks[-1].ljust(size, b'\0')
+        return chunks
+
+    def send_parity(self, sock, addr, frame_id: int, frame_size: int, priority: int,
+                    parity_index: int, parity_count: int, scheme: int, symbol: bytes,
+                    stream_id: int = 0, stream_seq: int = 0,
+                    frame_type: int = 0, reference_delta: int = 0) -> int:
+        FEC_HEADER.pack_into(self._fec_header, 0, PACKET_FEC, self.conn_id, frame_id, frame_size,
+                             priority, stream_id, stream_seq, frame_type, reference_delta,
+                             parity_index, self.fragment_count(frame_size, frame_id), parity_count, scheme)
+        if hasattr(sock, 'sendmsg'):
+            self.send_parts(sock, addr, [self._fec_header, symbol])
+        else:
+            sock.sendto(bytes(self._fec_header) + symbol, addr)
+            self.send_calls += 1
+        return FEC_HEADER.size + len(symbol)
+
+    def packetize(self, frame_id: int, data: bytes, priority: int,
+                  stream_id: int = 0, stream_seq: int = 0,
+                  frame_type: int = 0, reference_delta: int = 0) -> List[bytes]:
+        size = len(data)
+        count = self.fragment_count(size)
+        if count > 0xFFFF:
+            raise ValueError(f"frame {frame_id} trop grande: {size} octets")
+
+        packets = []
+        for index in range(count):
+            start = index * self.fragment_payload
+            header = FRAGMENT_HEADER.pack(PACKET_FRAGMENT, self.conn_id, frame_id, size, priority,
+                                          stream_id, stream_seq, frame_type, reference_delta,
+                                          index, count)
+            packets.append(header + data[start:start + self.fragment_payload])
+        return packets
+
+
+@dataclass
+class PartialFrame:
+    frame_size: int
+    priority: int
+    frag_count: int
+    first_seen: float
+    fragments: list = field(default_factory=list)
+    received: int = 0
+    highest_index: int = -1
+    # arrivée du dernier fragment neuf: la frame est encore en cours d'envoi (pacing)
+    last_seen: float = 0.0
+    # FEC: symboles de parité reçus, date de la première perte vue
+    parity: Dict[int, bytes] = field(default_factory=dict)
+    parity_count: int = 0
+    scheme: int = 0
+    loss_seen: Optional[float] = None
+    fec_repaired: bool = False
+    # NACK par fragment: première détection du trou et dernier envoi; probed = le
+    # client a fini d'envoyer la frame (doublon reçu), la fin manquante est perdue
+    gap_seen: Dict[int, float] = field(default_factory=dict)
+    nack_times: Dict[int, float] = field(default_factory=dict)
+    probed: bool = False
+
+    def __post_init__(self):
+        if not self.fragments:
+            self.fragments = [None] * self.frag_count
+
+    def missing(self) -> List[int]:
+        return [i for i in range(self.frag_count) if self.fragments[i] is None]
+
+    def pacing_interval(self) -> float:
+        """Écart moyen entre fragments reçus (0 avant le deuxième)"""
+        if self.received < 2:
+            return 0.0
+        return (self.last_seen - self.first_seen) / (self.received - 1)
+
+    def gaps(self, closed: bool) -> List[int]:
+        """Fragments manquants; frame encore en cours d'envoi: seulement avant le plus haut reçu"""
+        end = self.frag_count if closed else self.highest_index
+        return [i for i in range(end) if self.fragments[i] is None]
+
+
+class ReassemblyTable:
+    """Table de réassemblage bornée: au-delà de max_frames, la plus ancienne frame incomplète est évincée"""
+
+    def __init__(self, max_frames: int = 64):
+        self.max_frames = max_frames
+        self.frames: 'OrderedDict[int, PartialFrame]' = OrderedDict()
+        self.evicted = 0
+        self.fec_recovered = 0
+        # latence des réparations (depuis la première perte vue), vidées par le serveur
+        self.fec_recovery_ms: List[float] = []
+        self.retransmit_recovery_ms: List[float] = []
+
+    def __contains__(self, frame_id: int) -> bool:
+        return frame_id in self.frames
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+    def add(self, frame_id: int, frame_size: int, priority: int,
+            frag_index: int, frag_count: int, payload: bytes, now: float):
+        """Ajoute un fragment. Retourne (frame complète ou None, nouveau fragment ?, trous révélés)"""
+        if frag_count == 0 or frag_index >= frag_count:
+            return None, False, []
+
+        partial = self.get_partial(frame_id, frame_size, priority, frag_count, now)
+        if partial is None:
+            return None, False, []
+
+        if partial.fragments[frag_index] is not None:
+            return None, False, []
+
+        partial.fragments[frag_index] = payload
+        partial.received += 1
+        partial.last_seen = now
+
+        # Trous entre le dernier fragment vu et celui-ci (pas de réordonnancement attendu)
+        gaps = []
+        if frag_index > partial.highest_index:
+            gaps = [i for i in range(partial.highest_index + 1, frag_index)
+                    if partial.fragments[i] is None]
+            partial.highest_index = frag_index
+        if gaps and partial.loss_seen is None:
+            partial.loss_seen = now
+
+        if partial.received < partial.frag_count:
+            self.fec_repair(partial)
+        if partial.received < partial.frag_count:
+            return None, True, gaps
+        return self.complete(frame_id, partial, now), True, gaps
+
+    def add_parity(self, frame_id: int, frame_size: int, priority: int, frag_count: int,
+                   parity_index: int, parity_count: int, scheme: int, symbol: bytes, now: float):
+        """Ajoute un symbole de parité. Retourne (frame complète ou None, nouveau symbole ?)"""
+        if codec_for_scheme(scheme) is None or frag_count == 0 or parity_index >= parity_count:
+            return None, False
+        partial = self.get_partial(frame_id, frame_size, priority, frag_count, now)
+        if partial is None or parity_index in partial.parity:
+            return None, False
+
+        partial.parity[parity_index] = symbol
+        partial.parity_count = parity_count
+        partial.scheme = scheme
+        # la parité arrive après tous les fragments: ceux qui manquent sont perdus
+        if partial.received < partial.frag_count and partial.loss_seen is None:
+            partial.loss_seen = now
+
+        self.fec_repair(partial)
+        if partial.received < partial.frag_count:
+            return None, True
+        return self.complete(frame_id, partial, now), True
+
+    def get_partial(self, frame_id: int, frame_size: int, priority: int, frag_count: int,
+                    now: float) -> Optional[PartialFrame]:
+        partial = self.frames.get(frame_id)
+        if partial is None:
+            while len(self.frames) >= self.max_frames:
+                self.frames.popitem(last=False)
+                self.evicted += 1
+            partial = PartialFrame(frame_size, priority, frag_count, now)
+            self.frames[frame_id] = partial
+        elif partial.frag_count != frag_count:
+            return None
+        return partial
+
+    def fec_repair(self, partial: PartialFrame):
+        if not partial.parity:
+            return
+        codec = codec_for_scheme(partial.scheme)
+        for index, symbol in codec.decode(partial.fragments, partial.parity,
+                                          partial.parity_count).items():
+            partial.fragments[index] = symbol
+            partial.received += 1
+            partial.fec_repaired = True
+            self.fec_recovered += 1
+
+    def complete(self, frame_id: int, partial: PartialFrame, now: float) -> bytes:
+        del self.frames[frame_id]
+        if partial.loss_seen is not None:
+            latency = (now - partial.loss_seen) * 1000
+            if partial.fec_repaired:
+                self.fec_recovery_ms.append(latency)
+            else:
+                self.retransmit_recovery_ms.append(latency)
+        return b''.join(partial.fragments)[:partial.frame_size]
+
+    def missing(self, frame_id: int) -> List[int]:
+        partial = self.frames.get(frame_id)
+        return partial.missing() if partial is not None else []
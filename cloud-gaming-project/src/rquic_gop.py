@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""Dépendances entre frames vidéo (GOP): une P/B-frame ne se décode qu'avec sa référence
+
+Chaque fragment porte le type de sa frame et l'écart à sa frame de
+référence (0 = aucune, frame indépendante).
+
+Côté client (DependencyGraph): une référence abandonnée (TTL, trop de
+retransmissions) rend inutiles les frames qui en dépendent. Elles sont
+annulées tout de suite au lieu d'être envoyées ou retransmises pour rien,
+et l'encodeur doit repartir d'une I-frame.
+
+Côté serveur (DecodeTracker): une frame reçue n'est décodable qu'une fois
+toute sa chaîne de références reçue. Une référence attendue trop longtemps
+déclenche une demande de keyframe au client.
+"""
+
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from rquic_source import FrameType
+
+# écart à la référence, sur 16 bits dans l'en-tête fixe
+NO_REFERENCE = 0
+MAX_REFERENCE_DELTA = 0xFFFF
+
+
+def reference_delta(frame_id: int, reference: Optional[int]) -> int:
+    if reference is None or not 0 < frame_id - reference <= MAX_REFERENCE_DELTA:
+        return NO_REFERENCE
+    return frame_id - reference
+
+
+def reference_of(frame_id: int, delta: int) -> Optional[int]:
+    return frame_id - delta if delta != NO_REFERENCE else None
+
+
+class DependencyGraph:
+    """Frames récentes d'une connexion et leurs références (côté client)"""
+
+    def __init__(self, max_frames: int = 1024):
+        self.max_frames = max_frames
+        # frame_id -> (type, référence); les plus anciennes sont oubliées
+        self.frames: 'OrderedDict[int, Tuple[int, Optional[int]]]' = OrderedDict()
+        self.dependants: Dict[int, List[int]] = {}
+        self.lost: 'OrderedDict[int, None]' = OrderedDict()
+
+    def add(self, frame_id: int, frame_type: int, reference: Optional[int]) -> bool:
+        """Enregistre une frame; False si sa référence est déjà perdue (indécodable)"""
+        self.frames[frame_id] = (frame_type, reference)
+        while len(self.frames) > self.max_frames:
+            old_frame, _ = self.frames.popitem(last=False)
+            self.dependants.pop(old_frame, None)
+        if reference is None:
+            return True
+        if reference in self.lost:
+            self.mark_lost(frame_id)
+            return False
+        self.dependants.setdefault(reference, []).append(frame_id)
+        return True
+
+    def header(self, frame_id: int) -> Tuple[int, int]:
+        """(type, écart à la référence) pour l'en-tête; frame inconnue = indépendante"""
+        frame_type, reference = self.frames.get(frame_id, (FrameType.I, None))
+        return frame_type, reference_delta(frame_id, reference)
+
+    def is_reference(self, frame_id: int) -> bool:
+        """I et P servent de référence aux frames suivantes, pas les B"""
+        frame = self.frames.get(frame_id)
+        return frame is not None and frame[0] != FrameType.B
+
+    def mark_lost(self, frame_id: int):
+        self.lost[frame_id] = None
+        while len(self.lost) > self.max_frames:
+            self.lost.popitem(last=False)
+
+    def lose(self, frame_id: int) -> List[int]:
+        """Marque frame_id perdue; retourne ses dépendants, directs et indirects"""
+        self.mark_lost(frame_id)
+        lost = []
+        stack = [frame_id]
+        while stack:
+            for dependant in self.dependants.pop(stack.pop(), ()):
+                self.mark_lost(dependant)
+                lost.append(dependant)
+                stack.append(dependant)
+        return lost
+
+
+class DecodeTracker:
+    """Décodabilité des frames reçues d'une connexion (côté serveur)"""
+
+    def __init__(self, max_frames: int = 1024):
+        self.max_frames = max_frames
+        self.decodable: 'OrderedDict[int, None]' = OrderedDict()
+        # référence manquante -> [(frame, taille)] en attente, et date de la première attente
+        self.waiting: Dict[int, List[Tuple[int, int]]] = {}
+        self.waiting_since: Dict[int, float] = {}
+        self.lost: 'OrderedDict[int, None]' = OrderedDict()
+        self.decodable_frames = 0
+        self.undecodable_frames = 0
+        self.undecodable_bytes = 0
+
+    def on_frame(self, frame_id: int, reference: Optional[int], size: int, now: float):
+        # reçue: ce n'est plus elle que ses dépendants attendent, mais sa propre référence
+        self.waiting_since.pop(frame_id, None)
+        if reference is None or reference in self.decodable or self.forgotten(reference):
+            self.set_decodable(frame_id)
+        elif reference in self.lost:
+            self.give_up_frame(frame_id, size)
+            self.give_up(frame_id)
+        else:
+            self.waiting.setdefault(reference, []).append((frame_id, size))
+            self.waiting_since.setdefault(reference, now)
+
+    def forgotten(self, reference: int) -> bool:
+        """Référence plus ancienne que la fenêtre suivie: supposée reçue"""
+        return (len(self.decodable) == self.max_frames
+                and reference < next(iter(self.decodable)))
+
+    def set_decodable(self, frame_id: int):
+        stack = [frame_id]
+        while stack:
+            frame = stack.pop()
+            self.decodable[frame] = None
+            self.decodable_frames += 1
+            self.waiting_since.pop(frame, None)
+            stack.extend(dependant for dependant, _ in self.waiting.pop(frame, ()))
+        while len(self.decodable) > self.max_frames:
+            self.decodable.popitem(last=False)
+
+    def give_up_frame(self, frame_id: int, size: int):
+        self.lost[frame_id] = None
+        self.undecodable_frames += 1
+        self.undecodable_bytes += size
+        while len(self.lost) > self.max_frames:
+            self.lost.popitem(last=False)
+
+    def stale_reference(self, now: float, timeout: float) -> Optional[int]:
+        """Plus ancienne référence attendue depuis plus de timeout"""
+        for reference, since in self.waiting_since.items():
+            if now - since >= timeout:
+                return reference
+        return None
+
+    def give_up(self, reference: int):
+        """Référence abandonnée: ses dépendants en attente sont indécodables"""
+        self.lost[reference] = None
+        self.waiting_since.pop(reference, None)
+        stack = [reference]
+        while stack:
+            for frame, size in self.waiting.pop(stack.pop(), ()):
+                self.give_up_frame(frame, size)
+                stack.append(frame)
+
+    def summary(self) -> dict:
+        pending = sum(len(frames) for frames in self.waiting.values())
+        return {
+            'frames_decodable': self.decodable_frames,
+            'frames_undecodable': self.undecodable_frames,
+            'bytes_undecodable': self.undecodable_bytes,
+            'frames_waiting_reference': pending,
+        }
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""Envoi et réception groupés des datagrammes (Linux UDP GSO / GRO)
+
+GSO (UDP_SEGMENT): les datagrammes consécutifs de même taille vers la même
+adresse sont copiés bout à bout dans un tampon pré-alloué et partent en un
+seul sendmsg, le noyau les redécoupe (le dernier peut être plus court).
+GRO (UDP_GRO): le noyau regroupe les datagrammes reçus d'un même flux,
+recvmsg_into les livre en un appel dans un tampon pré-alloué, la taille de
+segment en donnée annexe.
+
+Noyau ou OS sans support: setsockopt ou le premier envoi groupé échoue, on
+revient à un appel système par datagramme.
+"""
+
+import errno
+import socket
+import struct
+from typing import List, Optional, Tuple
+
+SOL_UDP = getattr(socket, 'SOL_UDP', 17)
+UDP_SEGMENT = getattr(socket, 'UDP_SEGMENT', 103)
+UDP_GRO = getattr(socket, 'UDP_GRO', 104)
+
+# limites noyau: UDP_MAX_SEGMENTS segments et une charge IPv4 par appel
+MAX_SEGMENTS = 64
+MAX_BATCH_BYTES = 65507
+GRO_SIZE = struct.Struct('=i')
+
+# erreurs d'un noyau ou d'une interface sans GSO (EIO: pas de checksum matériel)
+UNSUPPORTED = {errno.EINVAL, errno.EIO, errno.ENOPROTOOPT, errno.EOPNOTSUPP}
+
+
+def gso_supported(sock) -> bool:
+    """Le noyau connaît UDP_SEGMENT (0 = pas de segmentation par défaut)"""
+    try:
+        sock.setsockopt(SOL_UDP, UDP_SEGMENT, 0)
+    except (OSError, AttributeError):
+        return False
+    return hasattr(sock, 'sendmsg')
+
+
+def enable_gro(sock) -> bool:
+    try:
+        sock.setsockopt(SOL_UDP, UDP_GRO, 1)
+    except (OSError, AttributeError):
+        return False
+    return hasattr(sock, 'recvmsg_into')
+
+
+class GsoSender:
+    """Lot de datagrammes d'une même taille, envoyé par flush()"""
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.enabled = gso_supported(sock)
+        self.buffer = bytearray(MAX_BATCH_BYTES)
+        self.view = memoryview(self.buffer)
+        self.addr = None
+        self.length = 0
+        self.segment = 0
+        self.count = 0
+        # appels système d'envoi, lots compris; datagrammes plus grands que le MTU
+        # de l'interface (bit DF, EMSGSIZE): perdus comme sur le réseau
+        self.send_calls = 0
+        self.oversize_drops = 0
+
+    def add(self, parts: list, addr) -> int:
+        """Ajoute au lot le datagramme formé des parts (copiées); retourne sa taille"""
+        size = sum(len(part) for part in parts)
+        if not self.enabled:
+            try:
+                self.sock.sendmsg(parts, (), 0, addr)
+                self.send_calls += 1
+            except OSError as e:
+                if e.errno != errno.EMSGSIZE:
+                    raise
+                self.oversize_drops += 1
+            return size
+        # un segment plus court clôt le lot: seul le dernier peut l'être
+        if self.count and (addr != self.addr or size > self.segment
+                           or self.length != self.count * self.segment
+                           or self.length + size > MAX_BATCH_BYTES or self.count == MAX_SEGMENTS):
+            self.flush()
+        if self.count == 0:
+            self.addr = addr
+            self.segment = size
+        for part in parts:
+            end = self.length + len(part)
+            self.buffer[self.length:end] = part
+            self.length = end
+        self.count += 1
+        return size
+
+    def flush(self):
+        if self.count == 0:
+            return
+        batch = self.view[:self.length]
+        try:
+            if self.count == 1:
+                self.sock.sendto(batch, self.addr)
+            else:
+                self.sock.sendmsg([batch], [(SOL_UDP, UDP_SEGMENT, struct.pack('=H', self.segment))],
+                                  0, self.addr)
+            self.send_calls += 1
+        except OSError as e:
+            if e.errno == errno.EMSGSIZE:
+                self.oversize_drops += self.count
+            elif e.errno not in UNSUPPORTED:
+                raise
+            # refusé à l'envoi: un appel par datagramme désormais (interface sans
+            # offload), sauf si c'étaient les segments qui dépassaient le MTU
+            elif not self.send_each(batch):
+                self.enabled = False
+        finally:
+            self.count = 0
+            self.length = 0
+
+    def send_each(self, batch: memoryview) -> bool:
+        """Un sendto par segment; True si certains dépassaient le MTU"""
+        oversize = False
+        for start in range(0, self.length, self.segment):
+            try:
+                self.sock.sendto(batch[start:start + self.segment], self.addr)
+                self.send_calls += 1
+            except OSError as e:
+                if e.errno != errno.EMSGSIZE:
+                    raise
+                self.oversize_drops += 1
+                oversize = True
+        return oversize
+
+
+class GroReceiver:
+    """Un appel de réception, un ou plusieurs datagrammes"""
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.enabled = enable_gro(sock)
+        self.buffer = bytearray(65535)
+        self.view = memoryview(self.buffer)
+        self.ancillary = socket.CMSG_SPACE(GRO_SIZE.size) if self.enabled else 0
+        self.recv_calls = 0
+
+    def disable(self):
+        """Lecteur tiers (asyncio, recvfrom): un datagramme par lecture"""
+        if self.enabled:
+            self.sock.setsockopt(SOL_UDP, UDP_GRO, 0)
+            self.enabled = False
+
+    def recv(self) -> Tuple[List[bytes], Optional[tuple]]:
+        """Datagrammes reçus et adresse de l'émetteur (socket.timeout si rien)"""
+        if not self.enabled:
+            data, addr = self.sock.recvfrom(65535)
+            self.recv_calls += 1
+            return [data], addr
+        nbytes, ancdata, _, addr = self.sock.recvmsg_into([self.buffer], self.ancillary)
+        self.recv_calls += 1
+        segment = nbytes
+        for level, kind, data in ancdata:
+            if level == SOL_UDP and kind == UDP_GRO:
+                segment = GRO_SIZE.unpack_from(data)[0]
+        # copies: les fragments gardés pour le réassemblage survivent au tampon
+        return [bytes(self.view[start:min(start + segment, nbytes)])
+                for start in range(0, nbytes, max(segment, 1))], addr
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""Poignée de main rQUIC et reprise de session 0-RTT
+
+À froid, le client envoie un HELLO sans jeton et attend le HELLO_ACK
+(1 RTT) avant ses premières frames. Le HELLO_ACK porte un jeton de reprise
+que le client garde en cache: à la reconnexion, le HELLO avec jeton est
+collé devant les premiers datagrammes de données (0-RTT), sans attente.
+
+Le serveur valide le jeton sans état par session: HMAC de (date, nonce,
+IP du client) avec un secret serveur. Contre le rejeu, chaque nonce n'est
+accepté qu'une fois; un nonce est retenu jusqu'à l'expiration du jeton,
+au-delà le jeton est refusé de toute façon. Les workers SO_REUSEPORT
+partagent secret et nonces utilisés (TokenIssuer.share): un HELLO rejoué
+depuis un autre port source, donc haché vers un autre worker, est refusé.
+"""
+
+import contextlib
+import hashlib
+import hmac
+import json
+import os
+import struct
+import time
+from typing import Dict, MutableMapping, Optional, Tuple
+
+from rquic_wire import (
+    HELLO_HEADER, HELLO_ACK_HEADER, PACKET_HELLO, PACKET_HELLO_ACK, HEADER_VERSION_FIXED,
+)
+
+# [issued_at][nonce][mac]
+TOKEN = struct.Struct('!I8s16s')
+TOKEN_SIZE = TOKEN.size
+
+# statut du HELLO_ACK
+HELLO_ACCEPTED = 0   # connexion à froid
+HELLO_RESUMED = 1    # jeton valide: données 0-RTT acceptées
+HELLO_REJECTED = 2   # jeton invalide, expiré ou rejoué: données 0-RTT ignorées
+
+
+class TokenIssuer:
+    """Émet et valide les jetons de reprise (côté serveur)"""
+
+    def __init__(self, secret: Optional[bytes] = None, lifetime: float = 600.0):
+        # partager le secret entre workers SO_REUSEPORT: un jeton est valide sur tous
+        self.secret = secret or os.urandom(32)
+        self.lifetime = lifetime
+        # nonce -> expiration; lock: vérification et ajout atomiques entre processus
+        self.used: MutableMapping[bytes, float] = {}
+        self.lock = contextlib.nullcontext()
+        self.last_purge = 0.0
+
+    def share(self, used: MutableMapping[bytes, float], lock):
+        """Nonces utilisés communs à plusieurs serveurs (dict d'un multiprocessing.Manager + Lock)"""
+        self.used = used
+        self.lock = lock
+
+    def mac(self, issued_at: int, nonce: bytes, host: str) -> bytes:
+        message = struct.pack('!I8s', issued_at, nonce) + host.encode()
+        return hmac.new(self.secret, message, hashlib.sha256).digest()[:16]
+
+    def issue(self, host: str, now: Optional[float] = None) -> bytes:
+        issued_at = int(now if now is not None else time.time())
+        nonce = os.urandom(8)
+        return TOKEN.pack(issued_at, nonce, self.mac(issued_at, nonce, host))
+
+    def authentic(self, token: bytes, host: str, now: Optional[float] = None) -> bool:
+        """Jeton authentique, pour cette IP et pas expiré (nonce non consommé)"""
+        if len(token) != TOKEN_SIZE:
+            return False
+        now = now if now is not None else time.time()
+        issued_at, nonce, mac = TOKEN.unpack(token)
+        if not hmac.compare_digest(mac, self.mac(issued_at, nonce, host)):
+            return False
+        return issued_at <= now + 1 and now <= issued_at + self.lifetime
+
+    def validate(self, token: bytes, host: str, now: Optional[float] = None) -> bool:
+        """Jeton authentique, pour cette IP, pas expiré et jamais utilisé"""
+        now = now if now is not None else time.time()
+        if not self.authentic(token, host, now):
+            return False
+        issued_at, nonce, _ = TOKEN.unpack(token)
+        expires = issued_at + self.lifetime
+        with self.lock:
+            self.purge(now)
+            if nonce in self.used:
+                return False
+            self.used[nonce] = expires
+        return True
+
+    def purge(self, now: float):
+        if now - self.last_purge < 1.0:
+            return
+        self.last_purge = now
+        for nonce in [n for n, expires in self.used.items() if expires < now]:
+            self.used.pop(nonce, None)
+
+
+class TokenCache:
+    """Jetons de reprise reçus, par adresse de serveur (côté client, à usage unique)
+
+    Avec path, le cache survit au processus (fichier JSON, jetons en hexa).
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.tokens: Dict[tuple, bytes] = {}
+        if path and os.path.exists(path):
+            with open(path) as f:
+                for key, token in json.load(f).items():
+                    host, port = key.rsplit(':', 1)
+                    self.tokens[(host, int(port))] = bytes.fromhex(token)
+
+    def __contains__(self, server_addr: tuple) -> bool:
+        return server_addr in self.tokens
+
+    def put(self, server_addr: tuple, token: bytes):
+        self.tokens[server_addr] = token
+        self.save()
+
+    def take(self, server_addr: tuple) -> Optional[bytes]:
+        token = self.tokens.pop(server_addr, None)
+        if token is not None:
+            self.save()
+        return token
+
+    def save(self):
+        if not self.path:
+            return
+        with open(self.path, 'w') as f:
+            json.dump({f"{host}:{port}": token.hex() for (host, port), token in self.tokens.items()}, f)
+
+
+def encode_hello(conn_id: int, token: bytes = b'') -> bytes:
+    return HELLO_HEADER.pack(PACKET_HELLO, conn_id, len(token)) + token
+
+
+def decode_hello(data: bytes) -> Tuple[int, bytes, int]:
+    """(conn_id, jeton, début du paquet collé derrière le HELLO)"""
+    _, conn_id, token_len = HELLO_HEADER.unpack_from(data)
+    end = HELLO_HEADER.size + token_len
+    return conn_id, bytes(data[HELLO_HEADER.size:end]), end
+
+
+def encode_hello_ack(conn_id: int, status: int, token: bytes,
+                     header_version: int = HEADER_VERSION_FIXED) -> bytes:
+    # la version suit le jeton: un ancien client lit le jeton par sa longueur et l'ignore
+    return (HELLO_ACK_HEADER.pack(PACKET_HELLO_ACK, conn_id, status, len(token)) + token
+            + bytes((header_version,)))
+
+
+def decode_hello_ack(data: bytes) -> Tuple[int, bytes, int]:
+    """(statut, jeton, plus haute version d'en-tête acceptée par le serveur)"""
+    _, _, status, token_len = HELLO_ACK_HEADER.unpack_from(data)
+    end = HELLO_ACK_HEADER.size + token_len
+    header_version = data[end] if end < len(data) else HEADER_VERSION_FIXED
+    return status, bytes(data[HELLO_ACK_HEADER.size:end]), header_version
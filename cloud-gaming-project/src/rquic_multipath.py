@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+"""Multipath rQUIC: une session sur plusieurs interfaces locales (Wi-Fi + cellulaire)
+
+Un chemin = un socket lié à une adresse locale (le routage par adresse
+source choisit l'interface), vers la même adresse serveur. Le serveur
+rattache les datagrammes à la session par connection ID quelle que soit
+leur adresse d'origine, et répond à la dernière vue: le client écoute sur
+tous les chemins.
+
+Chaque chemin a sa propre détection de pertes (frames numérotées par
+chemin, comme les espaces de paquets de MPQUIC) et son RTT, mesuré par les
+ACK des frames qu'il porte et par une sonde PATH_PING toutes les
+PING_INTERVAL, renvoyée par le serveur sur le même chemin. Pertes du
+chemin: sondes sans réponse, fragments NACKés émis depuis plus d'un RTT,
+frames déclarées perdues. Une frame dupliquée n'est perdue pour la
+connexion (contrôle de congestion, sonde) que perdue sur tous ses chemins.
+Une frame part entière sur un chemin (pas de réordonnancement entre ses
+fragments); ses retransmissions y restent, sauf si le chemin tombe
+(PATH_FAILURES sondes perdues d'affilée).
+
+Ordonnanceurs (rQUICMultipathClient.path_scheduler):
+- minrtt:    chemin du plus petit délai attendu, srtt/2 plus un RTT de
+             retransmission pondéré par la probabilité de perdre un des
+             fragments de la frame
+- redundant: idem, et une frame CRITICAL est dupliquée sur tous les
+             chemins actifs quand le meilleur la perdrait avec une
+             probabilité > REDUNDANCY_LOSS ou qu'une de ses sondes est
+             restée sans réponse
+
+Contrôle de congestion et pacer restent ceux de la connexion (débit
+agrégé des chemins); la taille des datagrammes est fixe, sans PMTUD.
+"""
+
+import select
+import socket
+import time
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Sequence, Set
+
+from rquic_protocol import rQUICClient
+from rquic_recovery import Rfc9002Recovery
+from rquic_pmtu import dont_fragment
+from rquic_wire import PACKET_PATH_PING, PACKET_PATH_PONG, PATH_PING_HEADER, FramePriority
+
+PING_INTERVAL = 0.025
+# sondes perdues d'affilée: chemin tombé, plus rien n'y est placé
+PATH_FAILURES = 3
+# compteurs de pertes divisés par deux au-delà de LOSS_WINDOW datagrammes
+LOSS_WINDOW = 1000
+MIN_LOSS_SAMPLES = 20
+REDUNDANCY_LOSS = 0.01
+# bascule vers un autre chemin seulement s'il est au moins 10% plus rapide
+SWITCH_MARGIN = 0.9
+
+
+@dataclass
+class PathStats:
+    datagrams_sent: int = 0
+    bytes_sent: int = 0
+    frames_placed: int = 0
+    datagrams_lost: int = 0
+    pings_sent: int = 0
+    pings_answered: int = 0
+
+
+class rQUICPath:
+    """Socket d'une interface locale, RTT et pertes mesurés sur ce chemin"""
+
+    def __init__(self, path_id: int, sock, local_address: Optional[str] = None):
+        self.path_id = path_id
+        self.sock = sock
+        self.local_address = local_address
+        # frames portées par ce chemin; son estimateur de RTT sert aussi aux sondes
+        self.recovery = Rfc9002Recovery()
+        self.sent = 0
+        self.lost = 0
+        self.failures = 0
+        self.ping_seq = 0
+        self.ping_sent: Optional[float] = None
+        self.next_ping = 0.0
+        self.stats = PathStats()
+
+    @property
+    def srtt(self) -> float:
+        return self.recovery.srtt
+
+    @property
+    def usable(self) -> bool:
+        """Chemin vivant; hors chemin d'origine, il faut un RTT mesuré pour y placer des frames"""
+        return self.failures < PATH_FAILURES and (self.path_id == 0 or self.recovery.rtt.has_sample)
+
+    @property
+    def loss_rate(self) -> float:
+        return self.lost / self.sent if self.sent >= MIN_LOSS_SAMPLES else 0.0
+
+    def frame_loss(self, fragments: int) -> float:
+        """Probabilité de perdre au moins un fragment de la frame"""
+        return 1.0 - (1.0 - self.loss_rate) ** fragments
+
+    def expected_delay(self, fragments: int) -> float:
+        return self.srtt / 2 + self.frame_loss(fragments) * self.srtt
+
+    def on_datagram_sent(self, size: int):
+        self.stats.datagrams_sent += 1
+        self.stats.bytes_sent += size
+        self.sent += 1
+        if self.sent > LOSS_WINDOW:
+            self.sent //= 2
+            self.lost //= 2
+
+    def on_lost(self):
+        self.lost += 1
+        self.stats.datagrams_lost += 1
+
+    def ping_deadline(self) -> float:
+        if self.ping_sent is not None:
+            return self.ping_sent + self.recovery.pto()
+        return self.next_ping
+
+    def on_ping_sent(self, now: float):
+        self.ping_sent = now
+        self.next_ping = now + PING_INTERVAL
+        self.stats.pings_sent += 1
+        self.on_datagram_sent(PATH_PING_HEADER.size)
+
+    def on_ping_lost(self):
+        self.ping_sent = None
+        self.ping_seq += 1
+        self.failures += 1
+        self.on_lost()
+
+    def on_pong(self, seq: int, now: float):
+        # réponse tardive (sonde perdue, comptée ou pas encore): le chemin vit, pas d'échantillon
+        self.failures = 0
+        if self.ping_sent is None or seq != self.ping_seq or now > self.ping_deadline():
+            return
+        self.recovery.rtt.update(now - self.ping_sent, 0.0, self.recovery.max_ack_delay)
+        self.ping_sent = None
+        self.ping_seq += 1
+        self.stats.pings_answered += 1
+
+    def summary(self) -> dict:
+        rtt = self.recovery.rtt
+        return {
+            'path_id': self.path_id,
+            'local_address': self.local_address,
+            'srtt_ms': rtt.smoothed_rtt * 1000 if rtt.has_sample else None,
+            'min_rtt_ms': rtt.min_rtt * 1000 if rtt.has_sample else None,
+            'loss_percent': self.loss_rate * 100,
+            'usable': self.usable,
+            **asdict(self.stats),
+        }
+
+
+class MultipathRecovery:
+    """Interface de Rfc9002Recovery, pertes détectées chemin par chemin
+
+    frame_paths: chemins de la dernière émission de chaque frame (plusieurs si dupliquée).
+    """
+
+    def __init__(self, paths: List[rQUICPath]):
+        self.paths = paths
+        self.frame_paths: Dict[int, List[rQUICPath]] = {}
+        # fragments NACKés par frame: le serveur répète ses NACK, une perte ne compte qu'une fois
+        self.nacked: Dict[int, Set[int]] = {}
+        # émission de chaque fragment: le serveur NACK aussi ceux encore en route ou dans la file
+        self.fragment_times: Dict[int, Dict[int, float]] = {}
+
+    @property
+    def srtt(self) -> float:
+        # pacing, abandon anticipé: le chemin le plus rapide, celui des frames suivantes
+        return min(path.srtt for path in self.usable_paths())
+
+    def usable_paths(self) -> List[rQUICPath]:
+        return [path for path in self.paths if path.usable] or self.paths[:1]
+
+    def on_sent(self, frame_id: int, now: float):
+        for path in self.frame_paths.get(frame_id) or self.paths[:1]:
+            path.recovery.on_sent(frame_id, now)
+
+    def move(self, frame_id: int, paths: List[rQUICPath], now: float):
+        """Frame replacée (chemin tombé): sa détection de pertes la suit"""
+        registered = any(frame_id in path.recovery.sent for path in self.frame_paths.get(frame_id, ()))
+        self.forget(frame_id)
+        self.frame_paths[frame_id] = paths
+        if registered:
+            self.on_sent(frame_id, now)
+
+    def forget(self, frame_id: int):
+        self.nacked.pop(frame_id, None)
+        self.fragment_times.pop(frame_id, None)
+        for path in self.frame_paths.pop(frame_id, ()):
+            path.recovery.forget(frame_id)
+
+    def on_fragment_sent(self, frame_id: int, index: int, now: float):
+        self.fragment_times.setdefault(frame_id, {})[index] = now
+
+    def on_fragment_lost(self, frame_id: int, index: int, now: float):
+        """Fragment NACKé: perte du chemin s'il a eu le temps d'arriver (émis il y a plus d'un RTT)"""
+        paths = self.frame_paths.get(frame_id, ())
+        sent = self.fragment_times.get(frame_id, {}).get(index)
+        if not paths or sent is None or now - sent < min(path.srtt for path in paths):
+            return
+        nacked = self.nacked.setdefault(frame_id, set())
+        if index in nacked:
+            return
+        nacked.add(index)
+        for path in paths:
+            path.on_lost()
+
+    def on_ack(self, acked: List[int], rtt_sample: Optional[float], retransmitted: bool,
+               ack_delay: float, now: float):
+        if not acked:
+            return [], None
+        # rtt_sample est celui de la plus grande frame acquittée; copie dupliquée:
+        # on ne sait pas laquelle est arrivée, pas d'échantillon
+        largest = max(acked)
+        largest_paths = self.frame_paths.get(largest, ())
+        # copie dupliquée acquittée: attribuée au chemin principal, oubliée ailleurs
+        # (elle ne fait pas avancer la détection de pertes d'un chemin plus lent)
+        for frame_id in acked:
+            for path in self.frame_paths.get(frame_id, ())[1:]:
+                path.recovery.forget(frame_id)
+        lost, accepted = [], None
+        for path in self.paths:
+            path_acked = [frame_id for frame_id in acked if frame_id in path.recovery.sent]
+            sample = rtt_sample if len(largest_paths) == 1 and path in largest_paths else None
+            path_lost, rtt = path.recovery.on_ack(path_acked, sample, retransmitted, ack_delay, now)
+            lost.extend(self.on_path_lost(path, path_lost))
+            if rtt is not None:
+                accepted = rtt
+        for frame_id in acked:
+            self.frame_paths.pop(frame_id, None)
+            self.nacked.pop(frame_id, None)
+            self.fragment_times.pop(frame_id, None)
+        return self.surviving(lost), accepted
+
+    def on_path_lost(self, path: rQUICPath, lost: List[int]) -> List[int]:
+        for _ in lost:
+            path.on_lost()
+        return lost
+
+    def surviving(self, lost: List[int]) -> List[int]:
+        """Frames perdues sur tous leurs chemins: une copie encore en route n'est pas une perte"""
+        return [frame_id for frame_id in dict.fromkeys(lost)
+                if not any(frame_id in path.recovery.sent for path in self.frame_paths.get(frame_id, ()))]
+
+    def deadline(self) -> Optional[float]:
+        deadlines = [d for d in (path.recovery.deadline() for path in self.paths) if d is not None]
+        return min(deadlines) if deadlines else None
+
+    def on_timeout(self, now: float) -> List[int]:
+        lost = []
+        for path in self.paths:
+            deadline = path.recovery.deadline()
+            if deadline is None or deadline > now:
+                continue
+            lost.extend(self.on_path_lost(path, path.recovery.on_timeout(now)))
+        return self.surviving(lost)
+
+
+class LowestLatencyScheduler:
+    """Toute la frame sur le chemin du plus petit délai attendu"""
+
+    def __init__(self):
+        self.current: Optional[rQUICPath] = None
+
+    def select(self, paths: List[rQUICPath], fragments: int, priority: int) -> List[rQUICPath]:
+        usable = [path for path in paths if path.usable] or paths[:1]
+        best = min(usable, key=lambda path: path.expected_delay(fragments))
+        # hystérésis: deux chemins proches ne se relaient pas à chaque frame
+        if (self.current in usable and best is not self.current
+                and best.expected_delay(fragments) > SWITCH_MARGIN * self.current.expected_delay(fragments)):
+            best = self.current
+        self.current = best
+        return [best]
+
+
+class RedundantScheduler(LowestLatencyScheduler):
+    """Plus petit délai, et frames CRITICAL dupliquées quand le meilleur chemin est peu sûr"""
+
+    def select(self, paths: List[rQUICPath], fragments: int, priority: int) -> List[rQUICPath]:
+        chosen = super().select(paths, fragments, priority)
+        best = chosen[0]
+        if priority != FramePriority.CRITICAL:
+            return chosen
+        if best.frame_loss(fragments) <= REDUNDANCY_LOSS and best.failures == 0:
+            return chosen
+        return chosen + [path for path in paths if path.usable and path is not best]
+
+
+PATH_SCHEDULERS = {
+    'minrtt': LowestLatencyScheduler,
+    'redundant': RedundantScheduler,
+}
+
+
+class rQUICMultipathClient(rQUICClient):
+    """rQUICClient sur plusieurs chemins
+
+    local_addresses: une adresse IP locale par chemin, la première pour le
+    socket d'origine (chemin 0, seul à porter la poignée de main). Les
+    autres options sont celles de rQUICClient (recovery: RFC 9002 par chemin).
+    """
+
+    def __init__(self, server_host: str, server_port: int = 5000,
+                 local_addresses: Sequence[str] = (), path_scheduler: str = 'minrtt', **options):
+        super().__init__(server_host, server_port, **options)
+        self.paths: List[rQUICPath] = []
+        for path_id, address in enumerate(local_addresses or [None]):
+            sock = self.sock if path_id == 0 else socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            if address is not None:
+                sock.bind((address, 0))
+            if path_id:
+                dont_fragment(sock)
+            # process_acks attend sur tous les sockets avec select()
+            sock.setblocking(False)
+            self.paths.append(rQUICPath(path_id, sock, address))
+        self.recovery = MultipathRecovery(self.paths)
+        self.recovery_mode = 'rfc9002'
+        self.path_scheduler_mode = path_scheduler
+        self.path_scheduler = PATH_SCHEDULERS[path_scheduler]()
+        # une taille de datagramme pour tous les chemins: pas de sondes PMTU
+        self.path_mtu_discovery = False
+        self.recv_wait = 0.001
+        self.ping = bytearray(PATH_PING_HEADER.size)
+        self.frames_duplicated = 0
+        self.nacks_reordered = 0
+
+    def process_acks(self):
+        readable, _, _ = select.select([path.sock for path in self.paths], [], [], self.recv_wait)
+        for sock in readable:
+            while True:
+                try:
+                    data, addr = sock.recvfrom(1024)
+                except (BlockingIOError, socket.timeout):
+                    break
+                self.handle_packet(data)
+
+    def handle_packet(self, data: bytes):
+        if data[:1] == bytes([PACKET_PATH_PONG]) and len(data) >= PATH_PING_HEADER.size:
+            _, conn_id, path_id, seq = PATH_PING_HEADER.unpack_from(data)
+            if conn_id == self.conn_id and path_id < len(self.paths):
+                self.paths[path_id].on_pong(seq, time.monotonic())
+            return
+        super().handle_packet(data)
+
+    def place(self, frame_id: int) -> List[rQUICPath]:
+        payload, send_time, retries, priority = self.pending_acks[frame_id]
+        fragments = self.packetizer.fragment_count(len(payload), frame_id)
+        paths = self.path_scheduler.select(self.paths, fragments, priority)
+        for path in paths:
+            path.stats.frames_placed += 1
+        if len(paths) > 1:
+            self.frames_duplicated += 1
+        return paths
+
+    def send_datagram(self, sock, frame_id: int, index: int, retransmit: bool) -> int:
+        """Sur le(s) chemin(s) de la frame, choisi(s) à son premier datagramme"""
+        paths = self.recovery.frame_paths.get(frame_id)
+        if paths is None:
+            paths = self.recovery.frame_paths[frame_id] = self.place(frame_id)
+        elif not any(path.usable for path in paths):
+            paths = self.place(frame_id)
+            self.recovery.move(frame_id, paths, time.monotonic())
+        self.recovery.on_fragment_sent(frame_id, index, time.monotonic())
+        sent = 0
+        for path in paths:
+            if not path.usable and len(paths) > 1:
+                continue
+            size = super().send_datagram(path.sock, frame_id, index, retransmit)
+            path.on_datagram_sent(size)
+            sent += size
+        return sent
+
+    def reordered(self, frame_id: int) -> bool:
+        """NACK arrivé avant que la frame ait pu traverser son chemin: des datagrammes
+        plus récents sont passés par un chemin plus rapide, ce n'est pas une perte
+
+        Frame dupliquée: le NACK dit que sa copie la plus rapide manque, on la renvoie.
+        """
+        paths = self.recovery.frame_paths.get(frame_id)
+        pending = self.pending_acks.get(frame_id)
+        if not paths or pending is None:
+            return False
+        own = min(path.srtt for path in paths)
+        fastest = self.recovery.srtt
+        return own > fastest and time.monotonic() - pending[1] < (own + fastest) / 2
+
+    def on_nack(self, frame_id: int):
+        if self.reordered(frame_id):
+            self.nacks_reordered += 1
+            return
+        super().on_nack(frame_id)
+
+    def retransmit_fragment(self, frame_id: int, frag_index: int):
+        if self.reordered(frame_id):
+            self.nacks_reordered += 1
+            return
+        self.recovery.on_fragment_lost(frame_id, frag_index, time.monotonic())
+        super().retransmit_fragment(frame_id, frag_index)
+
+    def check_timeouts(self):
+        super().check_timeouts()
+        now = time.monotonic()
+        for path in self.paths:
+            self.check_path(path, now)
+
+    def check_path(self, path: rQUICPath, now: float):
+        """Sonde de chemin perdue, puis suivante; un chemin tombé continue d'être sondé"""
+        if path.ping_sent is not None:
+            if now < path.ping_deadline():
+                return
+            path.on_ping_lost()
+        if now < path.next_ping:
+            return
+        PATH_PING_HEADER.pack_into(self.ping, 0, PACKET_PATH_PING, self.conn_id, path.path_id,
+                                   path.ping_seq)
+        try:
+            path.sock.sendto(self.ping, self.server_addr)
+        except OSError:
+            # interface sans lien ou sans route: comme une sonde perdue
+            path.on_ping_sent(now)
+            path.on_ping_lost()
+            return
+        path.on_ping_sent(now)
+
+    def next_deadline(self) -> Optional[float]:
+        deadline = super().next_deadline()
+        ping = min(path.ping_deadline() for path in self.paths)
+        return ping if deadline is None else min(deadline, ping)
+
+    def run(self, duration: int = 30) -> dict:
+        try:
+            return super().run(duration)
+        finally:
+            for path in self.paths[1:]:
+                path.sock.close()
+
+    def get_results(self) -> dict:
+        return {
+            **super().get_results(),
+            'path_scheduler': self.path_scheduler_mode,
+            'frames_duplicated': self.frames_duplicated,
+            'nacks_reordered': self.nacks_reordered,
+            'paths': [path.summary() for path in self.paths],
+        }
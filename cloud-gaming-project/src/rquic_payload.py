@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""Fournisseurs de charge utile pour les frames rQUIC"""
+
+import os
+
+
+class PayloadProvider:
+    """Interface: fournit la charge utile d'une frame sous forme de memoryview"""
+
+    def get(self, size: int) -> memoryview:
+        raise NotImplementedError
+
+
+class RandomPayloadPool(PayloadProvider):
+    """Buffer pré-alloué et pré-randomisé une seule fois, servi en tranches tournantes
+
+    Les tranches sont des memoryview en lecture seule: aucune allocation ni
+    génération aléatoire par frame, et une frame en attente d'ACK peut être
+    relue telle quelle pour la retransmission.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._buffer = os.urandom(capacity)
+        self._view = memoryview(self._buffer)
+        self._offset = 0
+
+    def get(self, size: int) -> memoryview:
+        if size > self.capacity:
+            raise ValueError(f"frame de {size} octets > pool de {self.capacity} octets")
+        if self._offset + size > self.capacity:
+            self._offset = 0
+        view = self._view[self._offset:self._offset + size]
+        self._offset += size
+        return view
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""Tampon de lecture (jitter buffer) côté récepteur, à délai cible adaptatif
+
+La frame n d'un flux est produite à n * interval: elle est rendue au
+consommateur à base + n * interval + target_delay, où base est le plus petit
+décalage arrivée - production des frames récentes (la plus rapide a un délai
+nul). Le délai cible suit un quantile des délais récents, lissé pour que
+l'horloge de lecture ne saute pas.
+
+frame_interval n'est que la cadence annoncée: la source dérive (boucle
+d'envoi, horloges), l'intervalle réel est estimé par régression des
+arrivées sur les numéros de séquence de la fenêtre.
+
+- on_time: arrivée avant son échéance, rendue à l'heure
+- late:    arrivée après son échéance, rendue dès l'arrivée (saccade)
+- skipped: jamais rendue: absente quand une frame plus récente est due,
+           ou arrivée après qu'une frame plus récente a été rendue
+
+Un quantile élevé ou un délai minimal plus grand échange de la latence
+contre de la fluidité.
+"""
+
+import heapq
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+
+@dataclass
+class PlayoutStats:
+    on_time: int = 0
+    late: int = 0
+    skipped: int = 0
+    # somme des attentes arrivée -> rendu des frames jouées (s)
+    buffered_time: float = 0.0
+    target_delay: float = 0.0
+
+    def summary(self) -> dict:
+        played = self.on_time + self.late
+        total = played + self.skipped
+        return {
+            'frames_played': played,
+            'frames_on_time': self.on_time,
+            'frames_late': self.late,
+            'frames_skipped': self.skipped,
+            'on_time_rate': self.on_time / total * 100 if total else 0,
+            'avg_buffer_ms': self.buffered_time / played * 1000 if played else 0,
+            'target_delay_ms': self.target_delay * 1000,
+        }
+
+
+class PlayoutBuffer:
+    """Rend les frames d'un flux, dans l'ordre, sur une horloge de lecture lissée
+
+    consumer(seq, data) est appelé par poll(); stats peut être partagé entre
+    plusieurs tampons (toutes sessions d'un même flux).
+    """
+
+    def __init__(self, frame_interval: float, consumer: Optional[Callable] = None,
+                 min_delay: float = 0.0, max_delay: float = 0.25, quantile: float = 0.95,
+                 window: int = 120, smoothing: float = 0.05,
+                 stats: Optional[PlayoutStats] = None):
+        self.frame_interval = frame_interval
+        self.consumer = consumer
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.quantile = quantile
+        self.smoothing = smoothing
+        self.stats = stats if stats is not None else PlayoutStats()
+
+        # (seq, arrivée) des dernières frames; seq comptés depuis la première frame
+        self.arrivals: deque = deque(maxlen=window)
+        self.origin: Optional[int] = None
+        self.interval = frame_interval
+        self.base = 0.0
+        self.target_delay = min_delay
+        # frames en attente: seq -> (données, arrivée), et tas des seq
+        self.frames: Dict[int, tuple] = {}
+        self.heap: List[int] = []
+        self.next_seq: Optional[int] = None
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+    def playout_time(self, seq: int) -> float:
+        return self.base + (seq - self.origin) * self.interval + self.target_delay
+
+    def push(self, seq: int, data: bytes, now: float):
+        if self.origin is None:
+            self.origin = seq
+        self.arrivals.append((seq, now))
+        self.adapt()
+
+        if self.next_seq is None:
+            self.next_seq = seq
+        if seq < self.next_seq or seq in self.frames:
+            # une frame plus récente est déjà partie: trop tard (déjà comptée sautée)
+            return
+        self.frames[seq] = (data, now)
+        heapq.heappush(self.heap, seq)
+
+    def adapt(self):
+        """Cadence estimée, puis délai cible vers le quantile des délais récents, borné et lissé"""
+        arrivals = self.arrivals
+        if len(arrivals) >= 8:
+            mean_seq = sum(seq for seq, _ in arrivals) / len(arrivals)
+            mean_time = sum(t for _, t in arrivals) / len(arrivals)
+            variance = sum((seq - mean_seq) ** 2 for seq, _ in arrivals)
+            if variance > 0:
+                slope = sum((seq - mean_seq) * (t - mean_time) for seq, t in arrivals) / variance
+                self.interval = min(max(slope, self.frame_interval / 2), self.frame_interval * 2)
+
+        offsets = sorted(t - (seq - self.origin) * self.interval for seq, t in arrivals)
+        self.base = offsets[0]
+        observed = offsets[min(int(len(offsets) * self.quantile), len(offsets) - 1)] - self.base
+        target = self.target_delay + self.smoothing * (observed - self.target_delay)
+        self.target_delay = min(max(target, self.min_delay), self.max_delay)
+        self.stats.target_delay = self.target_delay
+
+    def poll(self, now: float) -> int:
+        """Rend les frames dont l'échéance est passée; retourne leur nombre"""
+        released = 0
+        while self.heap:
+            seq = self.heap[0]
+            deadline = self.playout_time(seq)
+            if deadline > now:
+                break
+            # frames manquantes avant seq: leur créneau est passé, seq est due
+            self.stats.skipped += seq - self.next_seq
+            heapq.heappop(self.heap)
+            data, arrival = self.frames.pop(seq)
+            if arrival <= deadline:
+                self.stats.on_time += 1
+            else:
+                self.stats.late += 1
+            self.stats.buffered_time += now - arrival
+            self.next_seq = seq + 1
+            released += 1
+            if self.consumer is not None:
+                self.consumer(seq, data)
+        return released
+
+    def next_deadline(self) -> Optional[float]:
+        return self.playout_time(self.heap[0]) if self.heap else None
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""Découverte du MTU du chemin par sondes (DPLPMTUD, RFC 8899)
+
+Une sonde est un datagramme PMTU_PROBE bourré de zéros jusqu'à la taille
+testée, envoyé hors données et hors contrôle de congestion (bit DF: jamais
+fragmentée en route); le serveur l'acquitte s'il l'a reçue entière. Une
+taille acquittée devient la taille des datagrammes des frames suivantes.
+
+confirm:  la taille courante est sondée (démarrage, perte de frames)
+search:   max_size d'abord (cas courant: tout le chemin en Ethernet 1500 ou en
+          jumbo), puis dichotomie entre la dernière taille confirmée et la
+          plus petite refusée; MAX_PROBES sondes perdues d'affilée = trop grand
+complete: recherche relancée après RAISE_INTERVAL
+error:    même BASE_PLPMTU ne passe pas, nouvel essai après RAISE_INTERVAL
+
+Trou noir (tunnel, VPN qui jettent sans ICMP): la taille courante ne
+passe plus, retour à BASE_PLPMTU puis nouvelle recherche.
+"""
+
+import socket
+import sys
+from typing import Optional
+
+# plus petit datagramme garanti (QUIC, RFC 9000), en-têtes IP/UDP exclus
+BASE_PLPMTU = 1200
+# plafond par défaut: MTU Ethernet 1500 - IP 20 - UDP 8
+DEFAULT_MAX_PLPMTU = 1472
+MAX_PROBES = 3
+# la dichotomie s'arrête quand l'intervalle est plus petit
+SEARCH_GRANULARITY = 16
+RAISE_INTERVAL = 600.0
+# une perte de frame ne fait resonder la taille courante qu'une fois par intervalle
+CONFIRM_INTERVAL = 1.0
+
+# linux/in.h (absents du module socket)
+IP_MTU_DISCOVER = 10
+IP_PMTUDISC_PROBE = 3
+
+
+def dont_fragment(sock) -> bool:
+    """Bit DF sur tous les datagrammes, sans le PMTU appris par ICMP (Linux)
+
+    Un datagramme plus grand que le MTU de l'interface échoue (EMSGSIZE) au
+    lieu d'être fragmenté: sondes et données voient le vrai chemin.
+    """
+    if not sys.platform.startswith('linux'):
+        return False
+    try:
+        sock.setsockopt(socket.IPPROTO_IP, IP_MTU_DISCOVER, IP_PMTUDISC_PROBE)
+    except OSError:
+        return False
+    return True
+
+
+class PathMtuSearch:
+    """Machine à états de la recherche; le client envoie les sondes et applique plpmtu"""
+
+    def __init__(self, current: int, max_size: int = DEFAULT_MAX_PLPMTU, base: int = BASE_PLPMTU):
+        self.base = min(base, current)
+        self.max_size = max(max_size, current)
+        # taille des datagrammes de données, bornes de la dichotomie
+        self.plpmtu = current
+        self.low = self.base
+        self.high = self.max_size
+        self.state = 'confirm'
+        # taille en test (gardée entre deux essais), sonde en vol si probe_deadline
+        self.testing: Optional[int] = None
+        self.probe_count = 0
+        self.probe_id = 0
+        self.probe_deadline: Optional[float] = None
+        self.next_search = 0.0
+        self.last_confirm = float('-inf')
+        self.probes_sent = 0
+        self.probes_acked = 0
+        self.black_holes = 0
+
+    def next_probe(self, now: float) -> Optional[int]:
+        """Taille à sonder maintenant, None si une sonde est en vol ou rien à chercher"""
+        if self.probe_deadline is not None:
+            return None
+        if self.testing is not None:
+            return self.testing
+        if self.state in ('complete', 'error'):
+            if now < self.next_search:
+                return None
+            self.high = self.max_size
+            self.state = 'confirm' if self.state == 'error' else 'search'
+        if self.state == 'confirm':
+            return self.plpmtu
+        if self.high - self.low < SEARCH_GRANULARITY:
+            self.state = 'complete'
+            self.next_search = now + RAISE_INTERVAL
+            return None
+        if self.high == self.max_size:
+            return self.high
+        return (self.low + self.high + 1) // 2
+
+    def on_sent(self, size: int, now: float, timeout: float) -> int:
+        if size != self.testing:
+            self.testing = size
+            self.probe_count = 0
+        self.probe_count += 1
+        self.probe_id += 1
+        self.probe_deadline = now + timeout
+        self.probes_sent += 1
+        if self.state == 'confirm':
+            self.last_confirm = now
+        return self.probe_id
+
+    def deadline(self) -> Optional[float]:
+        if self.probe_deadline is not None:
+            return self.probe_deadline
+        return self.next_search if self.state in ('complete', 'error') else None
+
+    def on_ack(self, probe_id: int, size: int) -> Optional[int]:
+        """Sonde acquittée; retourne la nouvelle taille des datagrammes si elle monte"""
+        if probe_id != self.probe_id or size != self.testing:
+            return None
+        self.probes_acked += 1
+        self.testing = self.probe_deadline = None
+        self.low = max(self.low, size)
+        if self.state == 'confirm':
+            self.state = 'search'
+            return None
+        self.plpmtu = size
+        return size
+
+    def on_timeout(self, now: float) -> Optional[int]:
+        """Sonde sans réponse; retourne la nouvelle taille si un trou noir la fait baisser"""
+        if self.probe_deadline is None or now < self.probe_deadline:
+            return None
+        self.probe_deadline = None
+        if self.probe_count < MAX_PROBES:
+            # next_probe rend la même taille
+            return None
+        return self.too_big(self.testing, now)
+
+    def on_too_big(self, size: int, now: float) -> Optional[int]:
+        """Sonde refusée localement (EMSGSIZE): inutile de réessayer"""
+        self.probe_deadline = None
+        return self.too_big(size, now)
+
+    def too_big(self, size: int, now: float) -> Optional[int]:
+        self.testing = None
+        self.high = min(self.high, size - 1)
+        if self.state == 'search':
+            return None
+        # la taille courante ne passe plus: trou noir
+        self.black_holes += 1
+        if self.plpmtu > self.base:
+            self.plpmtu = self.low = self.base
+            return self.plpmtu
+        self.state = 'error'
+        self.next_search = now + RAISE_INTERVAL
+        return None
+
+    def on_loss(self, now: float):
+        """Frame perdue: la taille courante est resondée (au plus une fois par CONFIRM_INTERVAL)"""
+        if self.state not in ('search', 'complete') or now - self.last_confirm < CONFIRM_INTERVAL:
+            return
+        # sonde de recherche en cours abandonnée, la confirmation passe avant
+        self.testing = self.probe_deadline = None
+        self.state = 'confirm'
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Pool borné des frames en attente d'ACK (données à retransmettre)
+
+Les frames non acquittées sont copiées une fois dans des slots pré-alloués
+au démarrage, par classes de taille (petits slots pour les événements
+d'entrée, grands pour la vidéo); une frame est référencée par son numéro
+de slot. Mémoire constante quelle que soit la rafale de pertes, aucune
+allocation par frame, et l'appelant peut réutiliser son tampon dès l'envoi.
+
+Pool plein (backpressure): la frame en attente la moins prioritaire (la
+plus ancienne à priorité égale) est abandonnée pour faire de la place,
+jamais une frame plus prioritaire que la nouvelle; à défaut la nouvelle
+frame est refusée.
+
+Frame plus grande que le plus grand slot (rare: keyframe d'une trace):
+copie à part, hors des slots et du budget du pool.
+"""
+
+import gc
+import os
+import resource
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+
+@dataclass
+class PoolStats:
+    frames_stored: int = 0
+    frames_evicted: int = 0
+    frames_rejected: int = 0
+    frames_oversize: int = 0
+    used_bytes: int = 0
+    peak_used_bytes: int = 0
+
+
+class RetransmitPool:
+    """size_classes: [(taille de slot, nombre de slots)]"""
+
+    def __init__(self, size_classes: List[Tuple[int, int]]):
+        self.classes = sorted(size_classes)
+        self.views = [memoryview(bytearray(size * count)) for size, count in self.classes]
+        # slots libres (pile) et occupants par classe: frame_id -> priorité, du plus ancien au plus récent
+        self.free: List[List[int]] = [list(range(count - 1, -1, -1)) for _, count in self.classes]
+        self.owners: List[Dict[int, int]] = [{} for _ in self.classes]
+        self.slots: Dict[int, Tuple[int, int]] = {}
+        self.capacity_bytes = sum(size * count for size, count in self.classes)
+        self.max_size = self.classes[-1][0]
+        self.stats = PoolStats()
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def __contains__(self, frame_id: int) -> bool:
+        return frame_id in self.slots
+
+    def store(self, frame_id: int, data, priority: int) -> Optional[memoryview]:
+        """Copie data dans le plus petit slot libre assez grand; None si aucun"""
+        size = len(data)
+        if size > self.max_size:
+            self.stats.frames_oversize += 1
+            return memoryview(bytes(data))
+        for index, (slot_size, _) in enumerate(self.classes):
+            if size > slot_size or not self.free[index]:
+                continue
+            slot = self.free[index].pop()
+            view = self.views[index][slot * slot_size:slot * slot_size + size]
+            view[:] = data
+            self.slots[frame_id] = (index, slot)
+            self.owners[index][frame_id] = priority
+            self.stats.frames_stored += 1
+            self.stats.used_bytes += slot_size
+            self.stats.peak_used_bytes = max(self.stats.peak_used_bytes, self.stats.used_bytes)
+            return view
+        return None
+
+    def release(self, frame_id: int):
+        located = self.slots.pop(frame_id, None)
+        if located is None:
+            return
+        index, slot = located
+        del self.owners[index][frame_id]
+        self.free[index].append(slot)
+        self.stats.used_bytes -= self.classes[index][0]
+
+    def victim(self, size: int, priority: int) -> Optional[int]:
+        """Frame à abandonner pour loger size octets de priorité priority, None = refuser"""
+        chosen, chosen_priority = None, priority - 1
+        for index, (slot_size, _) in enumerate(self.classes):
+            if size > slot_size:
+                continue
+            for frame_id, owner_priority in self.owners[index].items():
+                # FramePriority: valeur plus grande = moins prioritaire
+                if owner_priority > chosen_priority or (
+                        owner_priority == chosen_priority and chosen is not None and frame_id < chosen):
+                    chosen, chosen_priority = frame_id, owner_priority
+        return chosen
+
+    def has_room(self, size: int, priority: int) -> bool:
+        if size > self.max_size:
+            return True
+        fits = any(size <= slot_size and self.free[index]
+                   for index, (slot_size, _) in enumerate(self.classes))
+        return fits or self.victim(size, priority) is not None
+
+
+def resident_memory() -> Tuple[int, int]:
+    """(RSS actuelle, RSS maximale) du processus en octets"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    try:
+        with open('/proc/self/statm') as f:
+            current = int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        current = peak
+    # ru_maxrss n'est mis à jour qu'aux changements de pages
+    return current, max(current, peak)
+
+
+def gc_allocations() -> int:
+    """Allocations d'objets suivis par le GC depuis le démarrage (estimation)
+
+    Une collecte de génération 0 a lieu toutes les threshold0 allocations
+    nettes: collectes x seuil, plus le compteur en cours.
+    """
+    return gc.get_stats()[0]['collections'] * gc.get_threshold()[0] + gc.get_count()[0]
@@ -1,100 +1,362 @@
 #!/usr/bin/env python3
 
+import os
+import errno
 import socket
 import struct
 import threading
 import time
 import json
-import random
 from collections import defaultdict
+from functools import partial
 from dataclasses import dataclass, field
-from typing import Dict, Set, Optional
+from typing import Dict, Set, Optional, List
 import argparse
-from enum import IntEnum
 
-
-PACKET_DATA = 0x01
-PACKET_ACK = 0x02
-PACKET_NACK = 0x03
-
-#hhhhhhhhhhhh
-class FramePriority(IntEnum):
-    CRITICAL = 0  # 500ms
-    HIGH = 1      # 100ms
-    MEDIUM = 2    # 50ms 
-    LOW = 3       # 20ms
+from rquic_wire import (
+    PACKET_DATA, PACKET_ACK, PACKET_NACK, PACKET_FRAGMENT, PACKET_FRAGMENT_NACK, PACKET_ACK_RANGES,
+    PACKET_FEC, FEC_HEADER, PACKET_HELLO, PACKET_HELLO_ACK, HELLO_HEADER, HELLO_ACK_HEADER,
+    PACKET_NACK_BITMAP, NACK_BITMAP_HEADER, PACKET_COMPACT, PACKET_ACK_COMPACT, PACKET_FRAGMENT_NACK_COMPACT,
+    PACKET_KEYFRAME_REQUEST, PACKET_PMTU_PROBE, PACKET_PMTU_ACK, PMTU_PROBE_HEADER,
+    PACKET_PATH_PING, PACKET_PATH_PONG, PATH_PING_HEADER,
+    PACKET_FRAGMENT_NACK_BITMAP, FRAGMENT_NACK_BITMAP_HEADER,
+    FramePriority, FRAGMENT_HEADER, ACK_HEADER, CONN_HEADER, CONN_ACK_HEADER, FRAGMENT_NACK_HEADER,
+    ACK_RANGES_HEADER, DEFAULT_DATAGRAM_SIZE, LEGACY_CONN_ID, HEADER_VERSION_FIXED, HEADER_VERSION_COMPACT,
+)
+from rquic_fragment import Packetizer, ReassemblyTable
+from rquic_window import ReceiveWindow
+from rquic_timers import DeadlineHeap
+from rquic_recovery import RECOVERY_MODES
+from rquic_congestion import CONGESTION_MODES, TokenBucketPacer
+from rquic_fec import FEC_CODECS, parity_count
+from rquic_scheduler import SCHEDULERS
+from rquic_stream import DEFAULT_STREAM_ID, rQUICStream, StreamReceiveStats
+from rquic_playout import PlayoutBuffer, PlayoutStats
+from rquic_gop import DependencyGraph, DecodeTracker, reference_of
+from rquic_pool import RetransmitPool, resident_memory, gc_allocations
+from rquic_gso import GsoSender, GroReceiver, MAX_BATCH_BYTES, MAX_SEGMENTS
+from rquic_pmtu import PathMtuSearch, DEFAULT_MAX_PLPMTU, dont_fragment
+from rquic_ack import (
+    AckRangeSet, encode_ack_ranges, decode_ack_ranges, encode_nack_bitmap, decode_nack_bitmap,
+    encode_fragment_nack_bitmap, decode_fragment_nack_bitmap,
+    encode_compact_ack_ranges, decode_compact_ack_ranges,
+)
+from rquic_compact import (
+    COMPACT_PREFIX_SIZE, compact_conn_id, decode_compact_fragment, encode_compact_fragment_nack,
+    decode_compact_fragment_nack,
+)
+from rquic_payload import PayloadProvider, RandomPayloadPool
+from rquic_source import FrameSource, FrameType, SyntheticFrameSource, open_trace
+from rquic_handshake import (
+    TokenIssuer, TokenCache, encode_hello, decode_hello, encode_hello_ack, decode_hello_ack,
+    HELLO_ACCEPTED, HELLO_RESUMED, HELLO_REJECTED,
+)
 
 
 @dataclass
 class rQUICStats:
     frames_sent: int = 0
     frames_received: int = 0
+    i_frames_sent: int = 0
     total_bytes_sent: int = 0
     total_bytes_received: int = 0
     retransmissions: int = 0
     acks_sent: int = 0
     acks_received: int = 0
+    ack_packets_received: int = 0
     nacks_sent: int = 0
+    nack_packets_sent: int = 0
+    nacks_suppressed: int = 0
     
     # HHHHHHHHHHHHHH
     frames_dropped_ttl: int = 0
+    # retransmission qui arriverait après l'échéance: frame abandonnée avant l'envoi
+    frames_dropped_predicted: int = 0
+    bytes_saved_predicted: int = 0
+    
+    # fragmentation MTU
+    fragments_sent: int = 0
+    fragments_received: int = 0
+    fragment_retransmissions: int = 0
+    fragment_nacks_sent: int = 0
+    fragment_nack_packets_sent: int = 0
+    bytes_retransmitted: int = 0
+    frames_evicted_incomplete: int = 0
+    duplicate_fragments: int = 0
+    
+    # FEC
+    fec_packets_sent: int = 0
+    fec_bytes_sent: int = 0
+    fec_packets_received: int = 0
+    fec_recovered_fragments: int = 0
+    
+    # poignée de main et reprise 0-RTT
+    handshakes: int = 0
+    resumptions: int = 0
+    resumptions_rejected: int = 0
+    packets_rejected: int = 0
     
+    # en-tête compact: fragments reçus (serveur), octets ACK/NACK reçus (client)
+    compact_packets_received: int = 0
+    control_bytes_received: int = 0
+    
+    # GOP: dépendants annulés avec leur référence (client), demandes de keyframe
+    frames_cancelled_gop: int = 0
+    bytes_saved_gop: int = 0
+    keyframe_requests: int = 0
+    keyframe_requests_sent: int = 0
+    
+    # sondes PMTU acquittées, sondes de chemin renvoyées (serveur)
+    pmtu_probes_acked: int = 0
+    path_pings_answered: int = 0
     
     frame_times: list = field(default_factory=list)
     frame_sizes: list = field(default_factory=list)
     rtt_samples: list = field(default_factory=list)
+    loss_detection_ms: list = field(default_factory=list)
+    # (priorité, ms entre la création de la frame et son ACK)
+    delivery_latency_ms: list = field(default_factory=list)
+    fec_recovery_ms: list = field(default_factory=list)
+    retransmit_recovery_ms: list = field(default_factory=list)
     start_time: float = 0
     end_time: float = 0
+    cpu_time: float = 0
+
+
+@dataclass
+class rQUICSession:
+    """État d'une connexion côté serveur, indexé par connection ID"""
+    conn_id: int
+    addr: tuple
+    created: float
+    last_seen: float
+    legacy: bool = False
+    # fenêtre glissante bornée: mémoire constante quelle que soit la durée
+    received: ReceiveWindow = field(default_factory=ReceiveWindow)
+    highest_frame_seen: int = -1
+    reassembly: ReassemblyTable = field(default_factory=lambda: ReassemblyTable(max_frames=64))
+    frames_received: int = 0
+    bytes_received: int = 0
+    
+    # ACK cumulatif: plages reçues + frames pas encore acquittées
+    ack_ranges: AckRangeSet = field(default_factory=AckRangeSet)
+    ack_pending: int = 0
+    ack_deadline: float = 0.0
+    largest_received_time: float = 0.0
+    last_ack_sent: float = 0.0
+    
+    # NACK: première détection du trou (délai de réordonnancement) et dernier envoi
+    gap_seen: Dict[int, float] = field(default_factory=dict)
+    nack_times: Dict[int, float] = field(default_factory=dict)
+    nack_deadline: float = 0.0
+    
+    # le client envoie de la parité: les trous attendent la fin de la frame
+    fec: bool = False
+    
+    # réponse au HELLO, renvoyée tant que le client colle son HELLO aux données
+    hello_ack: bytes = b''
+    hello_ack_sent: float = 0.0
+    # jeton accepté pour le 0-RTT: seul jeton admis sur les HELLO répétés
+    resume_token: bytes = b''
+    
+    # le client envoie des en-têtes compacts: ACK et NACK de fragment en varints
+    compact: bool = False
+    
+    # tampons de lecture de la session, par stream ID
+    playout: Dict[int, PlayoutBuffer] = field(default_factory=dict)
+    
+    # décodabilité des frames reçues (chaînes de références), dernière demande de keyframe
+    gop: DecodeTracker = field(default_factory=DecodeTracker)
+    keyframe_request_sent: float = 0.0
+    
+    def summary(self) -> dict:
+        duration = self.last_seen - self.created
+        return {
+            'conn_id': self.conn_id,
+            'frames_received': self.frames_received,
+            'total_bytes': self.bytes_received,
+            'duration_sec': duration,
+            'throughput_mbps': (self.bytes_received * 8) / (duration * 1_000_000) if duration > 0 else 0,
+            **self.gop.summary(),
+        }
 
 
 class rQUICServer:
     
-    def __init__(self, host: str = '0.0.0.0', port: int = 5000):
+    def __init__(self, host: str = '0.0.0.0', port: int = 5000, reuse_port: bool = False,
+                 ack_frequency: int = 2, require_handshake: bool = False,
+                 token_secret: Optional[bytes] = None):
         self.host = host
         self.port = port
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if reuse_port:
+            # plusieurs workers sur le même port: le noyau répartit les flux (hash 4-tuple)
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        # un seul socket pour toutes les sessions: buffer large pour absorber les rafales
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
         self.sock.settimeout(1.0)
+        # GRO: plusieurs datagrammes d'un client par appel de réception, si le noyau sait faire
+        self.receiver = GroReceiver(self.sock)
         
         self.stats = rQUICStats()
-        self.received_frames: Set[int] = set()
-        self.expected_frame = 0
         self.running = False
         self.client_addr = None
         
-    def start(self, duration: int = 30):
+        # une entrée par connexion, évincée après idle_timeout sans paquet
+        self.sessions: Dict[int, rQUICSession] = {}
+        self.closed_sessions: List[dict] = []
+        # statistiques par stream ID, toutes sessions confondues
+        self.streams: Dict[int, StreamReceiveStats] = defaultdict(StreamReceiveStats)
+        self.idle_timeout = 10.0
+        self.last_sweep = 0.0
+        
+        # un ACK toutes les ack_frequency frames, au plus tard après max_ack_delay
+        # (bien en dessous du plus petit TTL, sinon le client droppe des frames livrées)
+        self.ack_frequency = ack_frequency
+        self.max_ack_delay = 0.005
+        self.ack_pending_sessions: Set[int] = set()
+        self.recv_timeout = 1.0
+        
+        # un trou n'est signalé qu'après reorder_grace, puis au plus une fois par nack_interval
+        self.nack_window = 128
+        self.reorder_grace = 0.005
+        self.nack_interval = 0.05
+        self.nack_pending_sessions: Set[int] = set()
+        # fragment renvoyé puis reperdu: redemandé avant le TTL LOW (le client
+        # ignore lui-même les NACK répétés à moins d'un RTT de son renvoi)
+        self.fragment_nack_interval = 0.01
+        # fin d'une frame dépassée par une plus récente (ordonnanceur, pacing): manquante
+        # seulement quand ses fragments cessent d'arriver, reorder_grace ou
+        # fragment_reorder_intervals écarts moyens après le dernier
+        self.fragment_reorder_intervals = 4
+        # frame partielle plus vieille que le TTL de sa priorité (défauts du client):
+        # le client l'a abandonnée, ses fragments ne sont plus demandés
+        self.partial_ttl_by_priority = {
+            FramePriority.CRITICAL: 0.5,
+            FramePriority.HIGH: 0.1,
+            FramePriority.MEDIUM: 0.050,
+            FramePriority.LOW: 0.020
+        }
+        
+        # require_handshake: pas de session sans HELLO (à froid ou jeton de reprise valide)
+        self.require_handshake = require_handshake
+        self.tokens = TokenIssuer(token_secret)
+        # plus haute version d'en-tête annoncée dans le HELLO_ACK (FIXED: serveur d'avant le compact)
+        self.header_version = HEADER_VERSION_COMPACT
+        
+        # lecture: stream ID -> intervalle entre frames à la source; les flux
+        # absents ne sont pas tamponnés. Stats par flux, toutes sessions confondues
+        self.playout_intervals: Dict[int, float] = {}
+        self.playout_stats: Dict[int, PlayoutStats] = defaultdict(PlayoutStats)
+        self.playout_sessions: Set[int] = set()
+        self.cpu_start = 0.0
+        
+        # référence attendue plus de keyframe_timeout: ses dépendants sont
+        # abandonnés et le client doit repartir d'une I-frame (une demande par délai)
+        self.keyframe_timeout = 0.2
+        
+    def bind(self):
+        """Ouvre le port; la boucle appartient ensuite à l'appelant (poll)"""
         self.sock.bind((self.host, self.port))
         self.running = True
         self.stats.start_time = time.time()
+        self.cpu_start = time.process_time()
         
         print(f"[rQUIC Server] Écoute sur {self.host}:{self.port}")
+    
+    def poll(self, timeout: float = 1.0) -> bool:
+        """Attend au plus timeout un datagramme, puis ACK/NACK retardés et lecture dus
         
-        end_time = time.time() + duration + 5
-        
-        while self.running and time.time() < end_time:
-            try:
-                data, addr = self.sock.recvfrom(65535)
-                self.client_addr = addr
+        Retourne True si un datagramme a été traité.
+        """
+        # réveil court tant qu'un ACK retardé attend
+        pending = self.ack_pending_sessions or self.nack_pending_sessions
+        if pending:
+            timeout = min(timeout, self.max_ack_delay, self.reorder_grace)
+        playout = self.next_playout_deadline()
+        if playout is not None:
+            timeout = min(timeout, max(playout - time.time(), 0.0005))
+        if timeout != self.recv_timeout:
+            self.sock.settimeout(timeout)
+            self.recv_timeout = timeout
+        received = False
+        try:
+            datagrams, addr = self.receiver.recv()
+            self.client_addr = addr
+            for data in datagrams:
                 self.handle_packet(data, addr)
-            except socket.timeout:
-                continue
-            except Exception as e:
-                print(f"Erreur: {e}")
-                break
+            received = True
+        except socket.timeout:
+            pass
+        except Exception as e:
+            print(f"Erreur: {e}")
+            self.running = False
         
+        now = time.time()
+        if self.ack_pending_sessions:
+            self.flush_acks(now)
+        if self.nack_pending_sessions:
+            self.flush_nacks(now)
+        if self.playout_sessions:
+            self.flush_playout(now)
+        if now - self.last_sweep >= 1.0:
+            self.evict_idle_sessions(now)
+        return received
+    
+    def close(self) -> dict:
+        self.running = False
         self.stats.end_time = time.time()
+        self.stats.cpu_time = time.process_time() - self.cpu_start
         self.sock.close()
         
         return self.get_results()
     
+    def start(self, duration: int = 30):
+        self.bind()
+        end_time = time.time() + duration + 5
+        while self.running and time.time() < end_time:
+            self.poll()
+        return self.close()
+    
+    def get_session(self, conn_id: int, addr, now: float, legacy: bool = False) -> rQUICSession:
+        session = self.sessions.get(conn_id)
+        if session is None:
+            session = rQUICSession(conn_id, addr, now, now, legacy)
+            self.sessions[conn_id] = session
+        # l'adresse peut changer (rebinding NAT): le connection ID fait foi
+        session.addr = addr
+        session.last_seen = now
+        return session
+    
+    def evict_idle_sessions(self, now: float):
+        self.last_sweep = now
+        for conn_id, session in list(self.sessions.items()):
+            if now - session.last_seen > self.idle_timeout:
+                self.closed_sessions.append(session.summary())
+                del self.sessions[conn_id]
+                self.ack_pending_sessions.discard(conn_id)
+                self.nack_pending_sessions.discard(conn_id)
+                self.playout_sessions.discard(conn_id)
+    
+    def known_session(self, conn_id: int, addr, now: float) -> Optional[rQUICSession]:
+        """Session du paquet, None si une poignée de main est exigée et n'a pas eu lieu"""
+        if self.require_handshake and conn_id not in self.sessions:
+            self.stats.packets_rejected += 1
+            return None
+        return self.get_session(conn_id, addr, now)
+    
     def handle_packet(self, data: bytes, addr):
-        if len(data) < 9:
+        if len(data) < HELLO_HEADER.size:
             return
         
         packet_type = data[0]
+        now = time.time()
         
         #format
         if packet_type == PACKET_DATA:
+            if len(data) < 9:
+                return
             #hhhhhhhhhhhh
             if len(data) >= 10:
                 frame_id, frame_size, priority = struct.unpack('!IIB', data[1:10])
@@ -104,38 +366,421 @@ class rQUICServer:
                 frame_data = data[9:9+frame_size]
                 priority = FramePriority.MEDIUM  
             
-            recv_time = time.time()
-            
-            if frame_id not in self.received_frames:
-                self.received_frames.add(frame_id)
-                self.stats.frames_received += 1
-                self.stats.total_bytes_received += len(frame_data)
-                self.stats.frame_times.append(recv_time)
-                self.stats.frame_sizes.append(len(frame_data))
-                
-                if self.stats.frames_received % 60 == 0:
-                    print(f"[rQUIC] Frames reçues: {self.stats.frames_received}, "
-                          f"Retransmissions demandées: {self.stats.nacks_sent}")
+            session = self.get_session(LEGACY_CONN_ID, addr, now, legacy=True)
+            if frame_id not in session.received:
+                self.on_frame_complete(session, frame_id, frame_data)
             
-            self.send_ack(frame_id, addr)
-            self.check_missing_frames(frame_id, addr)
+            self.send_ack(session, frame_id)
+            session.highest_frame_seen = max(session.highest_frame_seen, frame_id)
+            self.check_missing_frames(session, session.highest_frame_seen, now)
+        
+        elif packet_type == PACKET_FRAGMENT:
+            if len(data) < FRAGMENT_HEADER.size:
+                return
+            (_, conn_id, frame_id, frame_size, priority, stream_id, stream_seq, frame_type,
+             reference_delta, frag_index, frag_count) = FRAGMENT_HEADER.unpack_from(data)
+            session = self.known_session(conn_id, addr, now)
+            if session is None:
+                return
+            self.handle_fragment(session, frame_id, frame_size, priority, stream_id, stream_seq,
+                                 frag_index, frag_count, data[FRAGMENT_HEADER.size:], now,
+                                 reference_delta)
+        
+        elif packet_type & PACKET_COMPACT:
+            self.handle_compact_fragment(data, addr, now)
+        
+        elif packet_type == PACKET_FEC:
+            self.handle_parity(data, addr, now)
+        
+        elif packet_type == PACKET_HELLO:
+            self.handle_hello(data, addr, now)
+        
+        elif packet_type == PACKET_PMTU_PROBE:
+            self.handle_pmtu_probe(data, addr, now)
+        
+        elif packet_type == PACKET_PATH_PING:
+            self.handle_path_ping(data, addr)
+    
+    def handle_fragment(self, session: rQUICSession, frame_id: int, frame_size: int, priority: int,
+                        stream_id: int, stream_seq: int, frag_index: int, frag_count: int,
+                        payload: bytes, now: float, reference_delta: int = 0):
+        self.stats.fragments_received += 1
+        
+        # frame déjà reconstruite: l'ACK a dû se perdre, on le renvoie
+        # sans attendre (mais pas à chaque fragment d'une rafale)
+        if frame_id in session.received:
+            self.stats.duplicate_fragments += 1
+            self.schedule_ack(session, now, now - session.last_ack_sent >= self.max_ack_delay)
+            return
+        
+        reassembly = session.reassembly
+        new_frame = frame_id not in reassembly
+        evicted_before = reassembly.evicted
+        recovered_before = reassembly.fec_recovered
+        frame_data, is_new, gaps = reassembly.add(
+            frame_id, frame_size, priority, frag_index, frag_count, payload, now)
+        self.stats.frames_evicted_incomplete += reassembly.evicted - evicted_before
+        self.stats.fec_recovered_fragments += reassembly.fec_recovered - recovered_before
+        
+        if frame_data is not None:
+            self.complete_frame(session, frame_id, frame_data, now, stream_id, stream_seq,
+                                reference_delta)
+        elif not is_new or gaps:
+            # doublon = sonde du client après RTO: la fin manquante est perdue aussi
+            partial = reassembly.frames.get(frame_id)
+            if partial is not None:
+                partial.probed = partial.probed or not is_new
+                self.check_missing_fragments(session, [frame_id], now)
+        
+        # premier fragment d'une nouvelle frame: on relance les fragments
+        # manquants des frames précédentes et les frames absentes
+        if new_frame and frame_id > session.highest_frame_seen:
+            session.highest_frame_seen = frame_id
+            self.check_missing_fragments(session, list(reassembly.frames), now)
+            self.check_missing_frames(session, frame_id, now)
+    
+    def handle_compact_fragment(self, data: bytes, addr, now: float):
+        """Fragment à en-tête compact: frame ID reconstruit autour de la frame attendue"""
+        if len(data) <= COMPACT_PREFIX_SIZE:
+            return
+        session = self.known_session(compact_conn_id(data), addr, now)
+        if session is None:
+            return
+        expected = max(session.highest_frame_seen, session.ack_ranges.largest) + 1
+        fields = decode_compact_fragment(data, expected)
+        if fields is None:
+            return
+        (frame_id, frame_size, priority, stream_id, stream_seq, frag_index, frag_count,
+         frame_type, reference_delta, offset) = fields
+        session.compact = True
+        self.stats.compact_packets_received += 1
+        self.handle_fragment(session, frame_id, frame_size, priority, stream_id, stream_seq,
+                             frag_index, frag_count, data[offset:], now, reference_delta)
     
-    def send_ack(self, frame_id: int, addr):
-        ack_packet = struct.pack('!BI', PACKET_ACK, frame_id)
-        self.sock.sendto(ack_packet, addr)
+    def handle_hello(self, data: bytes, addr, now: float):
+        conn_id, token, end = decode_hello(data)
+        if end > len(data):
+            return
+        session = self.sessions.get(conn_id)
+        if session is None:
+            # nouvelle connexion: les données collées au HELLO (0-RTT)
+            # ne sont acceptées qu'avec un jeton valide
+            early_data = bool(token) and self.tokens.validate(token, addr[0])
+            if not token:
+                status = HELLO_ACCEPTED
+            elif early_data:
+                status = HELLO_RESUMED
+                self.stats.resumptions += 1
+            else:
+                status = HELLO_REJECTED
+                self.stats.resumptions_rejected += 1
+            self.stats.handshakes += 1
+            session = self.get_session(conn_id, addr, now)
+            if early_data:
+                session.resume_token = token
+            session.hello_ack = encode_hello_ack(conn_id, status, self.tokens.issue(addr[0]),
+                                                 self.header_version)
+        else:
+            # HELLO répété: jeton revérifié (nonce déjà consommé par cette session),
+            # sinon un conn_id connu suffirait à faire passer des données
+            early_data = (bool(token) and token == session.resume_token
+                          and self.tokens.authentic(token, addr[0]))
+            if not early_data and end < len(data):
+                self.stats.packets_rejected += 1
+        
+        # HELLO répété (collé aux datagrammes suivants): un HELLO_ACK par délai d'ACK
+        if session.hello_ack and now - session.hello_ack_sent >= self.max_ack_delay:
+            self.sock.sendto(session.hello_ack, addr)
+            session.hello_ack_sent = now
+        if early_data and end < len(data):
+            self.handle_packet(data[end:], addr)
+    
+    def handle_pmtu_probe(self, data: bytes, addr, now: float):
+        if len(data) < PMTU_PROBE_HEADER.size:
+            return
+        _, conn_id, probe_id, probe_size = PMTU_PROBE_HEADER.unpack_from(data)
+        # tronquée en route: pas d'ACK, le client conclura à une perte
+        if len(data) != probe_size:
+            return
+        session = self.known_session(conn_id, addr, now)
+        if session is None:
+            return
+        self.sock.sendto(PMTU_PROBE_HEADER.pack(PACKET_PMTU_ACK, conn_id, probe_id, probe_size), addr)
+        self.stats.pmtu_probes_acked += 1
+    
+    def handle_path_ping(self, data: bytes, addr):
+        """Renvoyée sur le chemin d'où elle vient, sans toucher à la session: ACK et NACK
+        restent sur le chemin des données"""
+        if len(data) < PATH_PING_HEADER.size:
+            return
+        _, conn_id, path_id, seq = PATH_PING_HEADER.unpack_from(data)
+        if self.require_handshake and conn_id not in self.sessions:
+            self.stats.packets_rejected += 1
+            return
+        self.sock.sendto(PATH_PING_HEADER.pack(PACKET_PATH_PONG, conn_id, path_id, seq), addr)
+        self.stats.path_pings_answered += 1
+    
+    def handle_parity(self, data: bytes, addr, now: float):
+        if len(data) < FEC_HEADER.size:
+            return
+        (_, conn_id, frame_id, frame_size, priority, stream_id, stream_seq, frame_type,
+         reference_delta, parity_index, frag_count, parity_count, scheme) = FEC_HEADER.unpack_from(data)
+        session = self.known_session(conn_id, addr, now)
+        if session is None:
+            return
+        self.stats.fec_packets_received += 1
+        session.fec = True
+        if frame_id in session.received:
+            return
+        
+        reassembly = session.reassembly
+        evicted_before = reassembly.evicted
+        recovered_before = reassembly.fec_recovered
+        frame_data, is_new = reassembly.add_parity(
+            frame_id, frame_size, priority, frag_count, parity_index, parity_count,
+            scheme, data[FEC_HEADER.size:], now)
+        self.stats.frames_evicted_incomplete += reassembly.evicted - evicted_before
+        self.stats.fec_recovered_fragments += reassembly.fec_recovered - recovered_before
+        
+        if frame_data is not None:
+            self.complete_frame(session, frame_id, frame_data, now, stream_id, stream_seq,
+                                reference_delta)
+        elif is_new and parity_index == parity_count - 1:
+            # dernière parité et toujours incomplète: la FEC ne suffit pas
+            reassembly.frames[frame_id].probed = True
+            self.check_missing_fragments(session, [frame_id], now)
+    
+    def complete_frame(self, session: rQUICSession, frame_id: int, frame_data: bytes, now: float,
+                       stream_id: int = DEFAULT_STREAM_ID, stream_seq: int = 0,
+                       reference_delta: int = 0):
+        # hors ordre ou trou: ACK immédiat pour que le client voie la plage manquante
+        in_order = frame_id == session.ack_ranges.largest + 1
+        self.on_frame_complete(session, frame_id, frame_data, stream_id, stream_seq)
+        session.gop.on_frame(frame_id, reference_of(frame_id, reference_delta), len(frame_data), now)
+        if session.gop.waiting_since:
+            self.check_stale_reference(session, now)
+        session.ack_ranges.add(frame_id)
+        if frame_id == session.ack_ranges.largest:
+            session.largest_received_time = now
+        session.ack_pending += 1
+        self.schedule_ack(session, now,
+                          not in_order or session.ack_pending >= self.ack_frequency)
+        
+        reassembly = session.reassembly
+        self.stats.fec_recovery_ms.extend(reassembly.fec_recovery_ms)
+        self.stats.retransmit_recovery_ms.extend(reassembly.retransmit_recovery_ms)
+        reassembly.fec_recovery_ms.clear()
+        reassembly.retransmit_recovery_ms.clear()
+    
+    def check_stale_reference(self, session: rQUICSession, now: float):
+        """Référence jamais arrivée: dépendants indécodables, keyframe demandée au client"""
+        if session.legacy or now - session.keyframe_request_sent < self.keyframe_timeout:
+            return
+        reference = session.gop.stale_reference(now, self.keyframe_timeout)
+        if reference is None:
+            return
+        session.gop.give_up(reference)
+        self.sock.sendto(self.frame_control_packet(session, PACKET_KEYFRAME_REQUEST, reference),
+                         session.addr)
+        session.keyframe_request_sent = now
+        self.stats.keyframe_requests_sent += 1
+    
+    def on_frame_complete(self, session: rQUICSession, frame_id: int, frame_data: bytes,
+                          stream_id: int = DEFAULT_STREAM_ID, stream_seq: int = 0):
+        session.received.add(frame_id)
+        session.gap_seen.pop(frame_id, None)
+        session.nack_times.pop(frame_id, None)
+        session.frames_received += 1
+        session.bytes_received += len(frame_data)
+        self.stats.frames_received += 1
+        self.stats.total_bytes_received += len(frame_data)
+        self.stats.frame_times.append(time.time())
+        self.stats.frame_sizes.append(len(frame_data))
+        self.streams[stream_id].on_frame(stream_seq, len(frame_data), self.stats.frame_times[-1])
+        if stream_id in self.playout_intervals:
+            self.playout_buffer(session, stream_id).push(stream_seq, frame_data, self.stats.frame_times[-1])
+            self.playout_sessions.add(session.conn_id)
+        
+        if self.stats.frames_received % 60 == 0:
+            print(f"[rQUIC] Frames reçues: {self.stats.frames_received}, "
+                  f"Retransmissions demandées: {self.stats.nacks_sent + self.stats.fragment_nacks_sent}")
+    
+    def playout_buffer(self, session: rQUICSession, stream_id: int) -> PlayoutBuffer:
+        buffer = session.playout.get(stream_id)
+        if buffer is None:
+            buffer = PlayoutBuffer(self.playout_intervals[stream_id],
+                                   partial(self.on_playout, session, stream_id),
+                                   stats=self.playout_stats[stream_id])
+            session.playout[stream_id] = buffer
+        return buffer
+    
+    def on_playout(self, session: rQUICSession, stream_id: int, seq: int, frame_data: bytes):
+        """Frame rendue par le tampon de lecture, à son heure (à surcharger)"""
+    
+    def flush_playout(self, now: float):
+        for conn_id in list(self.playout_sessions):
+            session = self.sessions.get(conn_id)
+            if session is None:
+                self.playout_sessions.discard(conn_id)
+                continue
+            for buffer in session.playout.values():
+                buffer.poll(now)
+            if not any(session.playout.values()):
+                self.playout_sessions.discard(conn_id)
+    
+    def next_playout_deadline(self) -> Optional[float]:
+        deadlines = [buffer.next_deadline() for conn_id in self.playout_sessions
+                     if conn_id in self.sessions
+                     for buffer in self.sessions[conn_id].playout.values() if buffer]
+        return min(deadlines) if deadlines else None
+    
+    def frame_control_packet(self, session: rQUICSession, packet_type: int, frame_id: int) -> bytes:
+        if session.legacy:
+            return ACK_HEADER.pack(packet_type, frame_id)
+        return CONN_ACK_HEADER.pack(packet_type, session.conn_id, frame_id)
+    
+    def send_ack(self, session: rQUICSession, frame_id: int):
+        self.sock.sendto(self.frame_control_packet(session, PACKET_ACK, frame_id), session.addr)
+        self.stats.acks_sent += 1
+    
+    def schedule_ack(self, session: rQUICSession, now: float, immediate: bool = False):
+        if immediate:
+            self.send_ack_ranges(session, now)
+            return
+        if session.conn_id not in self.ack_pending_sessions:
+            session.ack_deadline = now + self.max_ack_delay
+            self.ack_pending_sessions.add(session.conn_id)
+    
+    def flush_acks(self, now: float):
+        """Envoie les ACK retardés dont l'échéance max_ack_delay est passée"""
+        for conn_id in list(self.ack_pending_sessions):
+            session = self.sessions.get(conn_id)
+            if session is None:
+                self.ack_pending_sessions.discard(conn_id)
+            elif now >= session.ack_deadline:
+                self.send_ack_ranges(session, now)
+    
+    def send_ack_ranges(self, session: rQUICSession, now: float):
+        if not session.ack_ranges:
+            return
+        ack_delay_us = int((now - session.largest_received_time) * 1_000_000)
+        encode = encode_compact_ack_ranges if session.compact else encode_ack_ranges
+        packet = encode(session.conn_id, session.ack_ranges.ranges, ack_delay_us)
+        self.sock.sendto(packet, session.addr)
         self.stats.acks_sent += 1
+        session.ack_pending = 0
+        session.last_ack_sent = now
+        self.ack_pending_sessions.discard(session.conn_id)
     
-    def send_nack(self, frame_id: int, addr):
-        nack_packet = struct.pack('!BI', PACKET_NACK, frame_id)
-        self.sock.sendto(nack_packet, addr)
+    def send_nack(self, session: rQUICSession, frame_id: int):
+        self.sock.sendto(self.frame_control_packet(session, PACKET_NACK, frame_id), session.addr)
         self.stats.nacks_sent += 1
     
-    def check_missing_frames(self, latest_frame: int, addr):
-        window_start = max(0, latest_frame - 100)
+    def send_fragment_nack(self, session: rQUICSession, frame_id: int, missing: List[int]):
+        """Un datagramme par frame: bitmap dès que plusieurs fragments manquent"""
+        if len(missing) > 1:
+            nack_packet = encode_fragment_nack_bitmap(session.conn_id, frame_id, missing)
+        elif session.compact:
+            nack_packet = encode_compact_fragment_nack(session.conn_id, frame_id, missing[0])
+        else:
+            nack_packet = FRAGMENT_NACK_HEADER.pack(PACKET_FRAGMENT_NACK, session.conn_id, frame_id, missing[0])
+        self.sock.sendto(nack_packet, session.addr)
+        self.stats.fragment_nacks_sent += len(missing)
+        self.stats.fragment_nack_packets_sent += 1
+    
+    def send_nack_bitmap(self, session: rQUICSession, missing: List[int]):
+        self.sock.sendto(encode_nack_bitmap(session.conn_id, missing), session.addr)
+        self.stats.nacks_sent += len(missing)
+        self.stats.nack_packets_sent += 1
+    
+    def flush_nacks(self, now: float):
+        """Relance la détection des trous dont le délai de réordonnancement a expiré"""
+        for conn_id in list(self.nack_pending_sessions):
+            session = self.sessions.get(conn_id)
+            if session is None:
+                self.nack_pending_sessions.discard(conn_id)
+            elif now >= session.nack_deadline:
+                self.nack_pending_sessions.discard(conn_id)
+                self.check_missing_fragments(session, list(session.reassembly.frames), now)
+                self.check_missing_frames(session, session.highest_frame_seen, now)
+    
+    def check_missing_frames(self, session: rQUICSession, latest_frame: int, now: float):
+        window_start = max(0, latest_frame - self.nack_window)
+        gap_seen = session.gap_seen
+        nack_times = session.nack_times
+        
+        missing = []
+        grace_end = None
+        for frame_id in session.received.missing(window_start, latest_frame):
+            # les frames partielles sont relancées fragment par fragment
+            if frame_id in session.reassembly:
+                continue
+            first_seen = gap_seen.setdefault(frame_id, now)
+            if now - first_seen < self.reorder_grace:
+                # peut encore arriver dans le désordre: on revérifiera
+                if grace_end is None:
+                    grace_end = first_seen + self.reorder_grace
+            elif now - nack_times.get(frame_id, 0.0) >= self.nack_interval:
+                missing.append(frame_id)
+                nack_times[frame_id] = now
+        
+        # les trous sortis de la fenêtre ne seront plus demandés
+        for table in (gap_seen, nack_times):
+            if len(table) > self.nack_window:
+                for frame_id in [f for f in table if f < window_start]:
+                    del table[frame_id]
         
-        for frame_id in range(window_start, latest_frame):
-            if frame_id not in self.received_frames:
-                self.send_nack(frame_id, addr)
+        if missing:
+            if session.legacy:
+                for frame_id in missing:
+                    self.send_nack(session, frame_id)
+            else:
+                self.send_nack_bitmap(session, missing)
+        self.schedule_nack_check(session, grace_end)
+    
+    def check_missing_fragments(self, session: rQUICSession, frame_ids: List[int], now: float):
+        """Fragments manquants des frames partielles: délai de réordonnancement, puis un NACK groupé par frame"""
+        reassembly = session.reassembly
+        grace_end = None
+        for frame_id in frame_ids:
+            partial = reassembly.frames.get(frame_id)
+            if partial is None or now - partial.first_seen > self.partial_ttl_by_priority.get(partial.priority, 0.5):
+                continue
+            # frame terminée côté client: un doublon est arrivé, ou une frame plus
+            # récente et plus aucun fragment de celle-ci depuis un moment
+            closed = partial.probed
+            if not closed and frame_id < session.highest_frame_seen:
+                settled = partial.last_seen + max(
+                    self.reorder_grace, self.fragment_reorder_intervals * partial.pacing_interval())
+                closed = now >= settled
+                if not closed:
+                    grace_end = settled if grace_end is None else min(grace_end, settled)
+            # FEC: les trous de la frame en cours attendent sa parité
+            if session.fec and not closed:
+                continue
+            missing = []
+            for index in partial.gaps(closed):
+                first_seen = partial.gap_seen.setdefault(index, now)
+                if now - first_seen < self.reorder_grace:
+                    end = first_seen + self.reorder_grace
+                    grace_end = end if grace_end is None else min(grace_end, end)
+                elif now - partial.nack_times.get(index, 0.0) >= self.fragment_nack_interval:
+                    missing.append(index)
+                    partial.nack_times[index] = now
+            if missing:
+                self.send_fragment_nack(session, frame_id, missing)
+        self.schedule_nack_check(session, grace_end)
+    
+    def schedule_nack_check(self, session: rQUICSession, grace_end: Optional[float]):
+        if grace_end is not None and session.conn_id not in self.nack_pending_sessions:
+            session.nack_deadline = grace_end
+            self.nack_pending_sessions.add(session.conn_id)
+    
+    @staticmethod
+    def gop_summary(sessions: List[dict]) -> dict:
+        """Décodabilité GOP, toutes sessions confondues"""
+        keys = ('frames_decodable', 'frames_undecodable', 'bytes_undecodable', 'frames_waiting_reference')
+        return {key: sum(session.get(key, 0) for session in sessions) for key in keys}
     
     def get_results(self) -> dict:
         duration = self.stats.end_time - self.stats.start_time
@@ -151,6 +796,8 @@ class rQUICServer:
         if len(delays) > 1:
             jitter = sum(abs(delays[i] - delays[i-1]) for i in range(1, len(delays))) / (len(delays) - 1)
         
+        sessions = self.closed_sessions + [s.summary() for s in self.sessions.values()]
+        
         return {
             'protocol': 'rQUIC',
             'port': self.port,
@@ -164,26 +811,80 @@ class rQUICServer:
             'avg_inter_frame_delay_ms': avg_delay,
             'jitter_ms': jitter,
             'acks_sent': self.stats.acks_sent,
+            'ack_frequency': self.ack_frequency,
             'nacks_sent': self.stats.nacks_sent,
-            'retransmission_requests': self.stats.nacks_sent,
+            'nack_packets_sent': self.stats.nack_packets_sent,
+            'retransmission_requests': self.stats.nacks_sent + self.stats.fragment_nacks_sent,
+            'fragments_received': self.stats.fragments_received,
+            'fragment_nacks_sent': self.stats.fragment_nacks_sent,
+            'fragment_nack_packets_sent': self.stats.fragment_nack_packets_sent,
+            'frames_evicted_incomplete': self.stats.frames_evicted_incomplete,
+            'duplicate_fragments': self.stats.duplicate_fragments,
+            'fec_packets_received': self.stats.fec_packets_received,
+            'fec_recovered_fragments': self.stats.fec_recovered_fragments,
+            'fec_recovered_frames': len(self.stats.fec_recovery_ms),
+            # latence de réparation depuis la première perte vue: parité vs retransmission
+            'avg_fec_recovery_ms': (sum(self.stats.fec_recovery_ms) / len(self.stats.fec_recovery_ms)
+                                    if self.stats.fec_recovery_ms else 0),
+            'avg_retransmit_recovery_ms': (sum(self.stats.retransmit_recovery_ms)
+                                           / len(self.stats.retransmit_recovery_ms)
+                                           if self.stats.retransmit_recovery_ms else 0),
+            'cpu_time_sec': self.stats.cpu_time,
+            'cpu_percent': self.stats.cpu_time / duration * 100 if duration > 0 else 0,
+            'require_handshake': self.require_handshake,
+            'handshakes': self.stats.handshakes,
+            'resumptions': self.stats.resumptions,
+            'resumptions_rejected': self.stats.resumptions_rejected,
+            'packets_rejected': self.stats.packets_rejected,
+            'header_version': self.header_version,
+            'compact_packets_received': self.stats.compact_packets_received,
+            'gro': self.receiver.enabled,
+            'recv_syscalls': self.receiver.recv_calls,
+            'keyframe_requests_sent': self.stats.keyframe_requests_sent,
+            'pmtu_probes_acked': self.stats.pmtu_probes_acked,
+            'path_pings_answered': self.stats.path_pings_answered,
+            **self.gop_summary(sessions),
+            'sessions_active': len(self.sessions),
+            'sessions_evicted': len(self.closed_sessions),
+            'sessions': sessions,
+            'streams': {stream_id: stream.summary() for stream_id, stream in sorted(self.streams.items())},
+            'playout': {stream_id: stats.summary() for stream_id, stats in sorted(self.playout_stats.items())},
         }
 
 
 class rQUICClient:
     
-    def __init__(self, server_host: str, server_port: int = 5000):
+    def __init__(self, server_host: str, server_port: int = 5000,
+                 datagram_size: int = DEFAULT_DATAGRAM_SIZE,
+                 payloads: Optional[PayloadProvider] = None,
+                 conn_id: Optional[int] = None,
+                 recovery: str = 'rfc9002',
+                 congestion: str = 'bbr',
+                 fec: str = 'none',
+                 scheduler: str = 'edf',
+                 frames: Optional[FrameSource] = None,
+                 tokens: Optional[TokenCache] = None):
         self.server_host = server_host
         self.server_port = server_port
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         self.sock.settimeout(0.001)
         
+        # identifie la session côté serveur (0 réservé au format historique);
+        # os.urandom et pas random: deux processus forkés auraient le même état
+        self.conn_id = conn_id if conn_id is not None else (int.from_bytes(os.urandom(4), 'big') or 1)
+        
         self.stats = rQUICStats()
+        self.packetizer = Packetizer(datagram_size, self.conn_id)
+        # datagrammes d'un même passage dans flush_send_queue groupés par sendmsg (GSO)
+        self.packetizer.gso = GsoSender(self.sock)
         
         self.pending_acks: Dict[int, tuple] = {}
         self.acked_frames: Set[int] = set()
+        # échéance TTL par frame; RTT, pertes et sondes sont gérés par self.recovery
+        self.timers = DeadlineHeap()
         self.max_retries = 3
-        self.rto = 0.1
-        self.srtt = 0.1
+        self.recovery_mode = recovery
+        self.recovery = RECOVERY_MODES[recovery]()
          # HHHHHHHHHHHHHH
         self.frame_ttl = 0.050  # 50ms
         
@@ -195,17 +896,161 @@ class rQUICClient:
             FramePriority.LOW: 0.020        # 20ms
         }
         
+        # FEC: symboles de parité par fragment de données; sous un RTT de
+        # 100ms une retransmission arrive après le TTL MEDIUM/LOW
+        self.fec_mode = fec
+        self.fec = FEC_CODECS[fec]() if fec != 'none' else None
+        self.fec_ratio_by_priority = {
+            FramePriority.CRITICAL: 0.5,
+            FramePriority.HIGH: 0.2,
+            FramePriority.MEDIUM: 0.1,
+            FramePriority.LOW: 0.1
+        }
+        self.fec_parity: Dict[int, List[bytes]] = {}
+        
+        # abandon anticipé: pas de retransmission si âge + srtt/2 dépasse le TTL
+        self.predictive_drop = True
+        
         self.fps = 60
         self.avg_frame_size = 50000
         self.max_frame_size = 60000
         
+        # tailles et types des frames: trace enregistrée ou générateur synthétique
+        self.frames = frames or SyntheticFrameSource(self.avg_frame_size, self.max_frame_size)
+        self.max_frame_size = max(self.max_frame_size, self.frames.max_frame_size)
+        
+        # charge utile pré-randomisée une fois pour toutes (plus de random par octet)
+        self.payloads = payloads or RandomPayloadPool(self.max_frame_size * 4)
+        
+        # frames en attente d'ACK copiées dans des slots pré-alloués (None: la
+        # vue fournie à send_frame est gardée telle quelle, sans borne)
+        self.pool: Optional[RetransmitPool] = RetransmitPool([
+            (datagram_size, 256), (16 * 1024, 64), (self.max_frame_size, 48)])
+        # base du taux d'allocation rapporté dans get_results
+        self.created = time.monotonic()
+        self.allocations_start = gc_allocations()
+        self.server_addr = (server_host, server_port)
+        
+        # datagrammes en file (neufs et retransmis): l'ordonnanceur choisit le
+        # suivant, la fenêtre de congestion et le pacer décident quand il part
+        self.congestion_mode = congestion
+        self.congestion = CONGESTION_MODES[congestion](
+            datagram_size, initial_window=2 * self.max_frame_size)
+        self.pacer = TokenBucketPacer(burst=2 * datagram_size)
+        # GSO: au plus 4ms de débit par sendmsg (latence ajoutée aux frames urgentes)
+        self.pacing_batch_time = 0.004
+        self.scheduler_mode = scheduler
+        self.scheduler = SCHEDULERS[scheduler]()
+        # échéance de chaque frame (création + TTL), et index des datagrammes neufs pas encore partis
+        self.frame_deadlines: Dict[int, float] = {}
+        self.unsent: Dict[int, Set[int]] = {}
+        # dernière retransmission de chaque fragment NACKé (frame_id -> index -> date)
+        self.fragment_retransmits: Dict[int, Dict[int, float]] = {}
+        self.queued_bytes = 0
+        self.spread_rate: Optional[float] = None
+        self.in_flight: Dict[int, int] = {}
+        self.bytes_in_flight = 0
+        
+        # flux multiplexés sur ce socket; frame_id -> (flux, séquence dans le flux)
+        self.streams: Dict[int, rQUICStream] = {DEFAULT_STREAM_ID: rQUICStream(DEFAULT_STREAM_ID)}
+        self.frame_streams: Dict[int, tuple] = {}
+        # TTL des frames envoyées avec une échéance explicite (send_frame deadline)
+        self.frame_ttls: Dict[int, float] = {}
+        
+        # poignée de main optionnelle (connect): jetons de reprise par serveur
+        self.tokens = tokens if tokens is not None else TokenCache()
+        self.handshake_status: Optional[int] = None
+        self.handshake_start = 0.0
+        self.handshake_ms: Optional[float] = None
+        self.resumed = False
+        # en-tête compact si le serveur l'annonce (False: reste au format fixe)
+        self.compact_header = True
+        
+        # GOP: une référence abandonnée annule ses dépendants encore en file
+        # ou en vol, et la source repart d'une I-frame; au plus une I-frame
+        # forcée par keyframe_interval (une I-frame pèse ~3 P-frames)
+        self.gop_tracking = True
+        self.gop = DependencyGraph()
+        self.keyframe_interval = 0.2
+        # frames dont une perte a été détectée (NACK, seuils RFC 9002); une frame
+        # expirée sans perte détectée attend encore un RTT un ACK en retard
+        # avant de compter comme perdue pour le GOP (frame_id -> fin de l'attente)
+        self.loss_detected: Set[int] = set()
+        self.gop_expired: Dict[int, float] = {}
+        self.last_keyframe_request = float('-inf')
+        
+        # DPLPMTUD (rquic_pmtu): datagram_size est la taille de départ, confirmée
+        # puis montée vers le MTU du chemin (au plus pmtu.max_size), ou ramenée à
+        # BASE_PLPMTU sur un trou noir; bit DF sur tout le socket
+        self.path_mtu_discovery = True
+        self.pmtu = PathMtuSearch(datagram_size, DEFAULT_MAX_PLPMTU)
+        self.pmtu_probe = bytearray(65507)
+        self.pmtu_changes: List[tuple] = []
+        dont_fragment(self.sock)
+        
+    def connect(self, timeout: float = 1.0) -> float:
+        """Poignée de main; retourne l'attente avant la première frame (s)
+        
+        Avec un jeton en cache: 0-RTT, le HELLO part collé au premier
+        fragment, rien à attendre. Sinon HELLO seul puis attente du HELLO_ACK.
+        """
+        self.handshake_start = time.monotonic()
+        token = self.tokens.take(self.server_addr)
+        if token is not None:
+            self.resumed = True
+            # fragments raccourcis d'autant: le bit DF est posé, datagram_size est un plafond
+            self.packetizer.set_prefix(encode_hello(self.conn_id, token), self.pending_acks)
+            return 0.0
+        
+        hello = encode_hello(self.conn_id)
+        deadline = self.handshake_start + timeout
+        next_hello = self.handshake_start
+        while self.handshake_status is None:
+            now = time.monotonic()
+            if now >= deadline:
+                raise TimeoutError(f"pas de HELLO_ACK de {self.server_host}:{self.server_port}")
+            if now >= next_hello:
+                self.sock.sendto(hello, self.server_addr)
+                next_hello = now + self.recovery.srtt
+            self.process_acks()
+        return time.monotonic() - self.handshake_start
+    
+    def on_hello_ack(self, data: bytes):
+        status, token, header_version = decode_hello_ack(data)
+        self.tokens.put(self.server_addr, token)
+        if self.handshake_status is None:
+            self.handshake_status = status
+            self.handshake_ms = (time.monotonic() - self.handshake_start) * 1000
+            self.packetizer.set_prefix(b'', self.pending_acks)
+            self.packetizer.compact = self.compact_header and header_version >= HEADER_VERSION_COMPACT
+        
+    def open_stream(self, stream_id: int, priority: Optional[FramePriority] = None,
+                    ttl: Optional[float] = None, name: str = '') -> rQUICStream:
+        """Déclare un flux; ttl None = TTL de la priorité de chaque frame"""
+        if stream_id in self.streams and stream_id != DEFAULT_STREAM_ID:
+            raise ValueError(f"stream {stream_id} déjà ouvert")
+        stream = rQUICStream(stream_id, priority, ttl, name)
+        self.streams[stream_id] = stream
+        return stream
+    
+    def frame_stream(self, frame_id: int) -> rQUICStream:
+        return self.frame_streams[frame_id][0]
+    
+    def ttl_of(self, frame_id: int, priority: FramePriority) -> float:
+        ttl = self.frame_ttls.get(frame_id)
+        if ttl is not None:
+            return ttl
+        ttl = self.frame_stream(frame_id).ttl
+        return ttl if ttl is not None else self.frame_ttl_by_priority[priority]
+    
+    def next_frame(self) -> tuple:
+        size, frame_type = self.frames.next_frame()
+        if frame_type == FrameType.I:
+            self.stats.i_frames_sent += 1
+        return size, frame_type
+    
     def generate_frame_size(self) -> int:
-        is_i_frame = random.random() < 0.1
-        if is_i_frame:
-            size = int(random.gauss(self.avg_frame_size * 2.5, self.avg_frame_size * 0.5))
-        else:
-            size = int(random.gauss(self.avg_frame_size * 0.7, self.avg_frame_size * 0.2))
-        return max(1000, min(size, self.max_frame_size))
+        return self.next_frame()[0]
     
     #
     def detect_frame_priority(self, frame_size: int) -> FramePriority:
@@ -216,74 +1061,502 @@ class rQUICClient:
         else:
             return FramePriority.LOW
     
-    def send_frame(self, frame_id: int, priority: Optional[FramePriority] = None) -> int:
-        size = self.generate_frame_size()
-        data = bytes(random.getrandbits(8) for _ in range(size))
+    def send_frame(self, frame_id: int, priority: Optional[FramePriority] = None,
+                   size: Optional[int] = None, stream_id: int = DEFAULT_STREAM_ID,
+                   data: Optional[bytes] = None, frame_type: Optional[FrameType] = None,
+                   reference: Optional[int] = None, deadline: Optional[float] = None) -> int:
+        """Envoie une frame sur un flux: data fournie, ou size octets du pool
+        
+        data (bytes ou memoryview) est copiée dans un slot du pool de
+        retransmission: le tampon de l'appelant est réutilisable dès le retour.
+        Sans pool (self.pool None), la vue est gardée jusqu'à l'ACK ou l'abandon.
+        deadline (time.monotonic) remplace le TTL du flux ou de la priorité.
+        
+        frame_type None: type donné par la source; sans type (taille ou données
+        imposées), frame indépendante hors GOP. Une P/B-frame sans reference
+        dépend de la dernière I/P du flux.
+        """
+        stream = self.streams[stream_id]
+        if data is not None:
+            payload = memoryview(data)
+            size = len(payload)
+        else:
+            if size is None:
+                size, source_type = self.next_frame()
+                frame_type = source_type if frame_type is None else frame_type
+            payload = self.payloads.get(size)
+        if frame_type is not None:
+            if frame_type == FrameType.I:
+                reference = None
+            elif reference is None:
+                reference = stream.last_reference
+            if frame_type != FrameType.B:
+                stream.last_reference = frame_id
         
         #pas de priorité envoyer avec une priorité au talent
         if priority is None:
-            priority = self.detect_frame_priority(size)
+            priority = stream.priority if stream.priority is not None else self.detect_frame_priority(size)
         
-        packet = struct.pack('!BIIB', PACKET_DATA, frame_id, size, priority) + data
+        now = time.monotonic()
+        if self.pool is not None:
+            payload = self.store_payload(frame_id, payload, priority)
+            if payload is None:
+                # pool plein de frames plus prioritaires: la nouvelle est refusée
+                self.pool.stats.frames_rejected += 1
+                self.on_frame_dropped(frame_id, stream, 'backpressure')
+                return size
+        if (frame_type is not None and not self.gop.add(frame_id, frame_type, reference)
+                and self.gop_tracking):
+            # référence déjà abandonnée: indécodable, inutile de l'envoyer
+            self.stats.frames_sent += 1
+            self.stats.frame_sizes.append(size)
+            stream.next_sequence()
+            stream.stats.frames_sent += 1
+            stream.stats.bytes_sent += size
+            self.count_cancelled(stream, size + self.packetizer.fragment_count(size) * FRAGMENT_HEADER.size)
+            if self.pool is not None:
+                self.pool.release(frame_id)
+            self.on_frame_dropped(frame_id, stream, 'gop')
+            return size
+        self.frame_streams[frame_id] = (stream, stream.next_sequence())
+        if deadline is not None:
+            self.frame_ttls[frame_id] = max(deadline - now, 0.0)
+        ttl = self.ttl_of(frame_id, priority)
+        deadline = now + ttl
+        self.frame_deadlines[frame_id] = deadline
         
-        self.sock.sendto(packet, (self.server_host, self.server_port))
+        # découpage MTU: une perte ne coûte plus qu'un fragment
+        count = self.packetizer.fragment_count(size)
+        for index in range(count):
+            self.scheduler.push(frame_id, index, priority, deadline)
+        self.queued_bytes += size + count * FRAGMENT_HEADER.size
         
-        self.pending_acks[frame_id] = (packet, time.time(), 0, priority)
+        # parité en fin de frame: le serveur sait alors quels fragments manquent
+        parity = self.encode_parity(payload, count, priority)
+        if parity:
+            self.fec_parity[frame_id] = parity
+            for index in range(count, count + len(parity)):
+                self.scheduler.push(frame_id, index, priority, deadline)
+            self.queued_bytes += len(parity) * (FEC_HEADER.size + len(parity[0]))
+        self.unsent[frame_id] = set(range(count + len(parity)))
+        # pacing: la file est étalée sur un intervalle de frame, mais sans
+        # consommer plus de la moitié du TTL (20ms pour LOW)
+        spread = max(min(1.0 / self.fps, ttl / 2), 0.001)
+        self.spread_rate = self.queued_bytes / spread
+        
+        # vue sur le slot du pool (ou sur les données fournies), pas une copie du paquet
+        self.pending_acks[frame_id] = (payload, now, 0, priority)
+        self.arm_frame_timer(frame_id)
         
         self.stats.frames_sent += 1
-        self.stats.total_bytes_sent += len(packet)
         self.stats.frame_sizes.append(size)
+        stream.stats.frames_sent += 1
+        stream.stats.bytes_sent += size
         
+        self.flush_send_queue(now)
         return size
     
+    def store_payload(self, frame_id: int, payload: memoryview,
+                      priority: FramePriority) -> Optional[memoryview]:
+        """Slot du pool pour la frame; pool plein: abandon des frames en attente moins prioritaires"""
+        while True:
+            stored = self.pool.store(frame_id, payload, priority)
+            if stored is not None:
+                return stored
+            victim = self.pool.victim(len(payload), priority)
+            if victim is None:
+                return None
+            self.pool.stats.frames_evicted += 1
+            self.forget_frame(victim, 'evicted')
+    
+    def encode_parity(self, payload: memoryview, count: int, priority: FramePriority) -> List[bytes]:
+        parity = parity_count(self.fec, count, self.fec_ratio_by_priority[priority])
+        if parity == 0:
+            return []
+        return self.fec.encode(self.packetizer.frame_chunks(payload), parity)
+    
+    def flush_send_queue(self, now: float) -> Optional[float]:
+        """Envoie, dans l'ordre de l'ordonnanceur, les datagrammes autorisés par cwnd et le pacer
+        
+        Retourne la date du prochain envoi possible, None si la file est vide
+        ou bloquée par la fenêtre (un ACK la débloquera).
+        """
+        cc_rate = self.congestion.pacing_rate(self.recovery.srtt)
+        if cc_rate is not None:
+            # avant le premier RTT mesuré, srtt n'est qu'une valeur initiale:
+            # seul l'étalement sur l'intervalle de frame s'applique
+            if self.stats.rtt_samples:
+                cc_rate = min(cc_rate, self.spread_rate or cc_rate)
+            else:
+                cc_rate = self.spread_rate
+        self.pacer.rate = cc_rate
+        datagram_size = self.packetizer.datagram_size
+        batch = 0
+        
+        while len(self.scheduler):
+            frame_id, index, retransmit = self.scheduler.peek()
+            pending = self.pending_acks.get(frame_id)
+            if pending is None or (retransmit and self.drop_if_late(
+                    frame_id, self.packetizer.fragment_size(len(pending[0]), index, frame_id), now)):
+                # frame droppée (TTL, retransmission trop tardive) ou acquittée
+                # avant le départ de ce datagramme
+                self.scheduler.pop(charge=False)
+                self.queued_bytes -= min(datagram_size, self.queued_bytes)
+                continue
+            
+            # les ACK sont par frame: une frame commencée doit finir, la
+            # fenêtre ne décide que du départ d'une nouvelle frame
+            if index == 0 and not retransmit and self.bytes_in_flight > 0:
+                frame_bytes = (len(pending[0]) + self.packetizer.fragment_count(len(pending[0]), frame_id)
+                               * FRAGMENT_HEADER.size)
+                if self.bytes_in_flight + frame_bytes > self.congestion.cwnd:
+                    self.packetizer.flush()
+                    return None
+            if batch <= 0:
+                wait = self.pacer.delay(datagram_size, now)
+                if wait > 0:
+                    self.packetizer.flush()
+                    return now + wait
+                # GSO: le pacer libère un lot (un sendmsg); la dette de jetons
+                # retarde d'autant le réveil suivant, le débit moyen est inchangé
+                batch = self.pacer_batch()
+            
+            payload, send_time, retries, priority = pending
+            stream = self.frame_streams[frame_id][0]
+            sent = self.send_datagram(self.sock, frame_id, index, retransmit)
+            if retransmit:
+                self.stats.bytes_retransmitted += sent
+            elif index < self.packetizer.fragment_count(len(payload), frame_id):
+                self.stats.fragments_sent += 1
+            else:
+                self.stats.fec_packets_sent += 1
+                self.stats.fec_bytes_sent += sent
+            self.scheduler.pop()
+            batch -= sent
+            self.queued_bytes -= min(sent, self.queued_bytes)
+            self.pacer.consume(sent)
+            self.add_in_flight(frame_id, sent)
+            self.stats.total_bytes_sent += sent
+            stream.stats.wire_bytes += sent
+            stream.stats.datagrams_sent += 1
+            if retransmit:
+                continue
+            
+            # dernier datagramme neuf parti: c'est l'envoi qui compte pour le RTT et les pertes
+            unsent = self.unsent[frame_id]
+            unsent.discard(index)
+            if not unsent:
+                del self.unsent[frame_id]
+                self.fec_parity.pop(frame_id, None)
+                self.pending_acks[frame_id] = (payload, now, retries, priority)
+                self.recovery.on_sent(frame_id, now)
+        # file vide sous la fenêtre: les prochains ACK mesurent l'application, pas le chemin
+        if self.bytes_in_flight < self.congestion.cwnd:
+            self.congestion.on_app_limited(self.bytes_in_flight)
+        self.packetizer.flush()
+        return None
+    
+    def pacer_batch(self) -> int:
+        """Octets envoyés par réveil du pacer: un lot GSO, sinon un datagramme
+
+        Le lot est borné à pacing_batch_time de débit: c'est la dette qu'une
+        frame CRITICAL arrivant juste après peut avoir à attendre.
+        """
+        size = self.packetizer.datagram_size
+        gso = self.packetizer.gso
+        if gso is None or not gso.enabled:
+            return size
+        batch = min(MAX_SEGMENTS, MAX_BATCH_BYTES // size) * size
+        if self.pacer.rate is not None:
+            batch = min(batch, max(size, int(self.pacer.rate * self.pacing_batch_time)))
+        return batch
+    
+    def send_datagram(self, sock, frame_id: int, index: int, retransmit: bool) -> int:
+        """Fragment index de la frame (au-delà du dernier: symbole de parité) sur sock; octets envoyés"""
+        payload, send_time, retries, priority = self.pending_acks[frame_id]
+        stream, seq = self.frame_streams[frame_id]
+        frame_type, reference_delta = self.gop.header(frame_id)
+        count = self.packetizer.fragment_count(len(payload), frame_id)
+        if retransmit or index < count:
+            return self.packetizer.send_fragment(sock, self.server_addr, frame_id, payload, priority,
+                                                 index, stream.stream_id, seq, frame_type, reference_delta)
+        parity = self.fec_parity[frame_id]
+        return self.packetizer.send_parity(sock, self.server_addr, frame_id, len(payload), priority,
+                                           index - count, len(parity), self.fec.scheme_id,
+                                           parity[index - count], stream.stream_id, seq,
+                                           frame_type, reference_delta)
+    
+    def queue_retransmission(self, frame_id: int, indexes, priority: FramePriority):
+        """Retransmissions ordonnées avec les données neuves, par échéance de frame"""
+        deadline = self.frame_deadlines[frame_id]
+        for index in indexes:
+            self.scheduler.push(frame_id, index, priority, deadline, retransmit=True)
+        self.queued_bytes += len(indexes) * self.packetizer.datagram_size
+        self.flush_send_queue(time.monotonic())
+    
+    def add_in_flight(self, frame_id: int, sent: int):
+        self.in_flight[frame_id] = self.in_flight.get(frame_id, 0) + sent
+        self.bytes_in_flight += sent
+    
+    def remove_in_flight(self, frame_id: int) -> int:
+        sent = self.in_flight.pop(frame_id, 0)
+        self.bytes_in_flight -= sent
+        return sent
+    
+    def forget_frame(self, frame_id: int, reason: str = 'ttl'):
+        """Abandon d'une frame (TTL ou trop de retransmissions)"""
+        detected = frame_id in self.loss_detected
+        self.discard_frame(frame_id, reason)
+        if not self.gop_tracking:
+            return
+        # échéance seule: la frame est peut-être livrée et son ACK en retard
+        if reason == 'ttl' and not detected:
+            self.gop_expired[frame_id] = time.monotonic() + self.recovery.srtt
+            return
+        self.lose_reference(frame_id)
+    
+    def lose_reference(self, frame_id: int):
+        """Frame perdue pour le GOP: dépendants annulés, keyframe si c'était une référence"""
+        for dependant in self.gop.lose(frame_id):
+            self.cancel_frame(dependant)
+        if self.gop.is_reference(frame_id):
+            self.request_keyframe()
+    
+    def cancel_frame(self, frame_id: int):
+        """Dépendant d'une référence abandonnée: ce qui reste à envoyer est économisé"""
+        pending = self.pending_acks.get(frame_id)
+        if pending is None:
+            return
+        payload = pending[0]
+        stream = self.frame_stream(frame_id)
+        # datagrammes pas encore partis, ou la frame entière si elle attend une retransmission
+        wire_size = len(payload) + self.packetizer.fragment_count(len(payload), frame_id) * FRAGMENT_HEADER.size
+        unsent = self.unsent.get(frame_id)
+        saved = min(len(unsent) * self.packetizer.datagram_size, wire_size) if unsent else wire_size
+        self.discard_frame(frame_id, 'gop')
+        self.count_cancelled(stream, saved)
+    
+    def count_cancelled(self, stream: rQUICStream, saved: int):
+        stream.stats.frames_cancelled_gop += 1
+        stream.stats.bytes_saved_gop += saved
+        self.stats.frames_cancelled_gop += 1
+        self.stats.bytes_saved_gop += saved
+    
+    def request_keyframe(self):
+        now = time.monotonic()
+        if now - self.last_keyframe_request < self.keyframe_interval:
+            return
+        self.last_keyframe_request = now
+        self.frames.request_keyframe()
+        self.stats.keyframe_requests += 1
+    
+    def discard_frame(self, frame_id: int, reason: str):
+        del self.pending_acks[frame_id]
+        self.timers.cancel(frame_id)
+        self.recovery.forget(frame_id)
+        self.remove_in_flight(frame_id)
+        self.fec_parity.pop(frame_id, None)
+        self.frame_deadlines.pop(frame_id, None)
+        self.unsent.pop(frame_id, None)
+        self.fragment_retransmits.pop(frame_id, None)
+        self.loss_detected.discard(frame_id)
+        self.frame_ttls.pop(frame_id, None)
+        if self.pool is not None:
+            self.pool.release(frame_id)
+        stream = self.frame_streams.pop(frame_id)[0]
+        self.on_frame_dropped(frame_id, stream, reason)
+    
+    def on_frame_delivered(self, frame_id: int, stream: rQUICStream, latency_ms: float):
+        """Frame acquittée par le serveur (à surcharger)"""
+    
+    def on_frame_dropped(self, frame_id: int, stream: rQUICStream, reason: str):
+        """Frame abandonnée: ttl, late, retries, gop, evicted, backpressure ou closed (à surcharger)"""
+    
     def process_acks(self):
         while True:
             try:
                 data, addr = self.sock.recvfrom(1024)
-                if len(data) < 5:
-                    continue
-                
-                packet_type = data[0]
-                frame_id = struct.unpack('!I', data[1:5])[0]
-                
-                #hhhh adaptation
-                if packet_type == PACKET_ACK:
-                    if frame_id in self.pending_acks:
-                        
-                        send_time = self.pending_acks[frame_id][1]
-                        rtt = time.time() - send_time
-                        self.stats.rtt_samples.append(rtt * 1000)
-                        
-                        self.srtt = 0.875 * self.srtt + 0.125 * rtt
-                        self.rto = max(0.05, min(1.0, self.srtt * 2))
-                        
-                        del self.pending_acks[frame_id]
-                        self.acked_frames.add(frame_id)
-                        self.stats.acks_received += 1
-                
-                elif packet_type == PACKET_NACK:
-                    self.retransmit_frame(frame_id)
-                    
             except socket.timeout:
                 break
             except BlockingIOError:
                 break
+            self.handle_packet(data)
     
-    def retransmit_frame(self, frame_id: int):
-        if frame_id not in self.pending_acks:
+    def handle_packet(self, data: bytes):
+        if len(data) < CONN_HEADER.size:
+            return
+        
+        packet_type, conn_id = CONN_HEADER.unpack_from(data)
+        if conn_id != self.conn_id:
+            return
+        self.stats.control_bytes_received += len(data)
+        
+        if packet_type == PACKET_ACK_RANGES or packet_type == PACKET_ACK_COMPACT:
+            self.handle_ack_ranges(data)
+        
+        elif packet_type == PACKET_FRAGMENT_NACK_COMPACT:
+            nack = decode_compact_fragment_nack(data)
+            if nack is not None:
+                self.retransmit_fragment(*nack)
+        
+        elif len(data) < CONN_ACK_HEADER.size:
+            return
+        
+        #hhhh adaptation
+        elif packet_type == PACKET_ACK:
+            frame_id = CONN_ACK_HEADER.unpack_from(data)[2]
+            self.stats.ack_packets_received += 1
+            if frame_id in self.gop_expired:
+                self.on_late_acks([frame_id])
+            if frame_id in self.pending_acks:
+                self.on_frames_acked([frame_id], frame_id, 0.0)
+        
+        elif packet_type == PACKET_NACK:
+            self.on_nack(CONN_ACK_HEADER.unpack_from(data)[2])
+        
+        elif packet_type == PACKET_KEYFRAME_REQUEST:
+            self.on_keyframe_request(CONN_ACK_HEADER.unpack_from(data)[2])
+        
+        elif packet_type == PACKET_NACK_BITMAP and len(data) >= NACK_BITMAP_HEADER.size:
+            for frame_id in decode_nack_bitmap(data):
+                self.on_nack(frame_id)
+        
+        elif packet_type == PACKET_FRAGMENT_NACK and len(data) >= FRAGMENT_NACK_HEADER.size:
+            _, _, frame_id, frag_index = FRAGMENT_NACK_HEADER.unpack_from(data)
+            self.retransmit_fragment(frame_id, frag_index)
+        
+        elif packet_type == PACKET_FRAGMENT_NACK_BITMAP and len(data) >= FRAGMENT_NACK_BITMAP_HEADER.size:
+            frame_id, missing = decode_fragment_nack_bitmap(data)
+            for frag_index in missing:
+                self.retransmit_fragment(frame_id, frag_index)
+        
+        elif packet_type == PACKET_HELLO_ACK and len(data) >= HELLO_ACK_HEADER.size:
+            self.on_hello_ack(data)
+        
+        elif packet_type == PACKET_PMTU_ACK and len(data) >= PMTU_PROBE_HEADER.size:
+            self.on_pmtu_ack(data)
+    
+    def handle_ack_ranges(self, data: bytes):
+        if data[0] == PACKET_ACK_COMPACT:
+            decoded = decode_compact_ack_ranges(data)
+            if decoded is None:
+                return
+        elif len(data) < ACK_RANGES_HEADER.size:
             return
+        else:
+            decoded = decode_ack_ranges(data)
+        _, largest, ack_delay_us, ranges = decoded
+        self.stats.ack_packets_received += 1
+        if self.gop_expired:
+            self.on_late_acks([frame_id for frame_id in self.gop_expired
+                               if any(lo <= frame_id <= hi for lo, hi in ranges)])
+        
+        # un seul passage, sur le plus petit des deux: plages ou pending_acks
+        span = sum(hi - lo + 1 for lo, hi in ranges)
+        if span <= len(self.pending_acks):
+            acked = [frame_id for lo, hi in ranges for frame_id in range(lo, hi + 1)
+                     if frame_id in self.pending_acks]
+        else:
+            acked = []
+            for frame_id in self.pending_acks:
+                if frame_id > largest:
+                    continue
+                # plages décroissantes
+                for lo, hi in ranges:
+                    if frame_id > hi:
+                        break
+                    if frame_id >= lo:
+                        acked.append(frame_id)
+                        break
+        
+        self.on_frames_acked(acked, largest, ack_delay_us / 1_000_000)
+    
+    def on_frames_acked(self, acked: List[int], largest: int, ack_delay: float):
+        now = time.monotonic()
+        # base de la troncature des frame IDs de l'en-tête compact
+        self.packetizer.largest_acked = max(self.packetizer.largest_acked, largest)
+        
+        # un seul échantillon RTT: la plus grande frame acquittée
+        rtt_sample = None
+        retransmitted = False
+        if largest in self.pending_acks:
+            payload, send_time, retries, priority = self.pending_acks[largest]
+            rtt_sample = now - send_time
+            retransmitted = retries > 0
         
+        acked_bytes = 0
+        for frame_id in acked:
+            priority = self.pending_acks.pop(frame_id)[3]
+            if self.pool is not None:
+                self.pool.release(frame_id)
+            self.timers.cancel(frame_id)
+            acked_bytes += self.remove_in_flight(frame_id)
+            self.fec_parity.pop(frame_id, None)
+            self.unsent.pop(frame_id, None)
+            self.fragment_retransmits.pop(frame_id, None)
+            self.loss_detected.discard(frame_id)
+            created = self.frame_deadlines.pop(frame_id) - self.ttl_of(frame_id, priority)
+            latency = (now - created) * 1000
+            self.stats.delivery_latency_ms.append((int(priority), latency))
+            self.frame_ttls.pop(frame_id, None)
+            stream = self.frame_streams.pop(frame_id)[0]
+            stream.stats.frames_acked += 1
+            stream.stats.delivery_latency_ms.append(latency)
+            self.acked_frames.add(frame_id)
+            self.on_frame_delivered(frame_id, stream, latency)
+        self.stats.acks_received += len(acked)
+        
+        lost, rtt = self.recovery.on_ack(acked, rtt_sample, retransmitted, ack_delay, now)
+        if rtt is not None:
+            self.stats.rtt_samples.append(rtt * 1000)
+        self.congestion.on_ack(acked_bytes, rtt, now)
+        for frame_id in lost:
+            self.on_frame_lost(frame_id, now)
+    
+    def on_nack(self, frame_id: int):
+        pending = self.pending_acks.get(frame_id)
+        if pending is None:
+            return
+        # pas encore partie: l'ordonnanceur a fait passer une frame plus récente
+        # d'un autre flux devant elle, le trou n'est pas une perte
+        if frame_id in self.unsent:
+            self.stats.nacks_suppressed += 1
+            return
+        # déjà retransmise il y a moins d'un RTT: ce NACK est parti avant qu'elle n'arrive
+        payload, send_time, retries, priority = pending
+        if retries > 0 and time.monotonic() - send_time < self.recovery.srtt:
+            self.stats.nacks_suppressed += 1
+            return
+        self.loss_detected.add(frame_id)
+        self.retransmit_frame(frame_id)
+    
+    def on_late_acks(self, frame_ids: List[int]):
+        """Frames expirées mais livrées: leur GOP est intact"""
+        for frame_id in frame_ids:
+            del self.gop_expired[frame_id]
+    
+    def on_keyframe_request(self, frame_id: int):
+        """Le serveur a renoncé à la référence frame_id"""
+        if not self.gop_tracking:
+            return
+        if frame_id in self.pending_acks:
+            self.forget_frame(frame_id, 'gop')
+        else:
+            self.request_keyframe()
+    
+    def drop_if_expired(self, frame_id: int) -> bool:
         #recup la prio
-        packet, send_time, retries, priority = self.pending_acks[frame_id]
+        payload, send_time, retries, priority = self.pending_acks[frame_id]
         
         # HHHHHHHHHHHHHH
-        frame_age = time.time() - send_time
+        frame_age = time.monotonic() - send_time
         # recup le temp
-        ttl_for_this_frame = self.frame_ttl_by_priority[priority]
+        ttl_for_this_frame = self.ttl_of(frame_id, priority)
         
         if frame_age > ttl_for_this_frame:
             
-            del self.pending_acks[frame_id]
+            self.frame_stream(frame_id).stats.frames_dropped_ttl += 1
+            self.forget_frame(frame_id)
             self.stats.frames_dropped_ttl += 1
             
             # Log 
@@ -292,46 +1565,200 @@ class rQUICClient:
                 priority_name = FramePriority(priority).name
                 print(f"[rQUIC TTL] {self.stats.frames_dropped_ttl} frames droppées "
                       f"(obsolètes > {ttl_for_this_frame*1000:.0f}ms, dernière: {priority_name})")
+            return True
+        return False
+    
+    def drop_if_late(self, frame_id: int, retransmit_bytes: int, now: float) -> bool:
+        """Abandon anticipé: la copie (trajet srtt/2) arriverait après l'échéance de la frame"""
+        # sans RTT mesuré, srtt vaut la valeur initiale (100ms): aucune prédiction
+        if not self.predictive_drop or not self.stats.rtt_samples:
+            return False
+        # échéance fixée à la création: la date d'envoi, elle, repart à chaque retransmission
+        if now + self.recovery.srtt / 2 <= self.frame_deadlines[frame_id]:
+            return False
+        stream = self.frame_stream(frame_id)
+        stream.stats.frames_dropped_predicted += 1
+        stream.stats.bytes_saved_predicted += retransmit_bytes
+        self.forget_frame(frame_id, 'late')
+        self.stats.frames_dropped_predicted += 1
+        self.stats.bytes_saved_predicted += retransmit_bytes
+        return True
+    
+    def retransmit_frame(self, frame_id: int):
+        if frame_id not in self.pending_acks or self.drop_if_expired(frame_id):
+            return
+        
+        payload, send_time, retries, priority = self.pending_acks[frame_id]
+        wire_size = len(payload) + self.packetizer.fragment_count(len(payload), frame_id) * FRAGMENT_HEADER.size
+        if self.drop_if_late(frame_id, wire_size, time.monotonic()):
             return
         
-        # Frame ok
+        # Frame ok: aucun fragment reçu, on renvoie tout
         if retries < self.max_retries:
-            self.sock.sendto(packet, (self.server_host, self.server_port))
-            self.pending_acks[frame_id] = (packet, time.time(), retries + 1, priority)
+            now = time.monotonic()
+            self.pending_acks[frame_id] = (payload, now, retries + 1, priority)
+            self.arm_frame_timer(frame_id)
+            self.recovery.on_sent(frame_id, now)
             self.stats.retransmissions += 1
+            self.frame_stream(frame_id).stats.retransmissions += 1
+            self.queue_retransmission(frame_id, range(self.packetizer.fragment_count(len(payload), frame_id)),
+                                      priority)
     
-    def check_timeouts(self):
-        current_time = time.time()
-        frames_to_drop = []
-        frames_to_retransmit = []
-         # HHHHHHHHHHHHHH
-        for frame_id, (packet, send_time, retries, priority) in list(self.pending_acks.items()):
-            frame_age = current_time - send_time
-            
-            ttl_for_this_frame = self.frame_ttl_by_priority[priority]
+    def retransmit_fragment(self, frame_id: int, frag_index: int):
+        if frame_id not in self.pending_acks or self.drop_if_expired(frame_id):
+            return
         
-            if frame_age > ttl_for_this_frame:
-                # Frame morte
-                frames_to_drop.append(frame_id)
-                
-            elif current_time - send_time > self.rto:
-                # Frame ok
-                if retries < self.max_retries:
-                    frames_to_retransmit.append(frame_id)
-                else:
-                    del self.pending_acks[frame_id]
+        payload, send_time, retries, priority = self.pending_acks[frame_id]
+        if frag_index >= self.packetizer.fragment_count(len(payload), frame_id):
+            return
         
-         # HHHHHHHHHHHHHH
-        for frame_id in frames_to_drop:
-            del self.pending_acks[frame_id]
+        now = time.monotonic()
+        # déjà renvoyé il y a moins d'un RTT: ce NACK est parti avant qu'il n'arrive
+        retransmitted = self.fragment_retransmits.setdefault(frame_id, {})
+        last = retransmitted.get(frag_index)
+        if last is not None and now - last < self.recovery.srtt:
+            self.stats.nacks_suppressed += 1
+            return
+        if self.drop_if_late(frame_id, self.packetizer.fragment_size(len(payload), frag_index, frame_id), now):
+            return
+        # pas encore parti: l'ordonnanceur a fait passer une frame plus récente devant
+        # lui, le serveur a vu le trou mais le fragment est toujours dans la file
+        if frag_index in self.unsent.get(frame_id, ()):
+            self.stats.nacks_suppressed += 1
+            return
+        retransmitted[frag_index] = now
+        self.loss_detected.add(frame_id)
+        # fragment signalé manquant par le serveur: signal de congestion
+        self.congestion.on_loss(send_time, now)
+        self.stats.fragment_retransmissions += 1
+        self.frame_stream(frame_id).stats.retransmissions += 1
+        # frame encore en partie dans la file: son envoi n'est pas terminé
+        if frame_id not in self.unsent:
+            self.recovery.on_sent(frame_id, now)
+        self.queue_retransmission(frame_id, [frag_index], priority)
+    
+    def on_frame_lost(self, frame_id: int, now: float, detected: bool = True):
+        """Perte au seuil de paquets ou de temps; detected=False pour une sonde PTO"""
+        pending = self.pending_acks.get(frame_id)
+        if pending is None:
+            return
+        if detected:
+            self.loss_detected.add(frame_id)
+        # les octets perdus ne sont plus en vol; la sonde sera recomptée
+        self.remove_in_flight(frame_id)
+        self.congestion.on_loss(pending[1], now)
+        if self.path_mtu_discovery:
+            # frame entière perdue: peut-être un trou noir, la taille courante est resondée
+            self.pmtu.on_loss(now)
+        self.probe_frame(frame_id, now)
+    
+    def probe_frame(self, frame_id: int, now: float):
+        """Frame déclarée perdue (ou sonde PTO): seul le dernier fragment est renvoyé,
+        le serveur NACK les trous ou réacquitte"""
+        if frame_id not in self.pending_acks or self.drop_if_expired(frame_id):
+            return
+        
+        payload, send_time, retries, priority = self.pending_acks[frame_id]
+        if retries >= self.max_retries:
+            self.forget_frame(frame_id, 'retries')
+            return
+        
+        self.stats.loss_detection_ms.append((now - send_time) * 1000)
+        last_index = self.packetizer.fragment_count(len(payload), frame_id) - 1
+        if self.drop_if_late(frame_id, self.packetizer.fragment_size(len(payload), last_index, frame_id),
+                             now):
+            return
+        self.pending_acks[frame_id] = (payload, now, retries + 1, priority)
+        self.arm_frame_timer(frame_id)
+        self.recovery.on_sent(frame_id, now)
+        self.stats.retransmissions += 1
+        self.frame_stream(frame_id).stats.retransmissions += 1
+        self.queue_retransmission(frame_id, [last_index], priority)
+    
+    def arm_frame_timer(self, frame_id: int):
+        payload, send_time, retries, priority = self.pending_acks[frame_id]
+        self.timers.schedule(frame_id, send_time + self.ttl_of(frame_id, priority))
+    
+    def check_timeouts(self):
+        current_time = time.monotonic()
+        # seules les frames dont le TTL est passé sont visitées
+        for frame_id in self.timers.pop_expired(current_time):
+            # déjà annulée avec une référence expirée dans le même passage
+            if frame_id not in self.pending_acks:
+                continue
+             # HHHHHHHHHHHHHH Frame morte
+            self.frame_stream(frame_id).stats.frames_dropped_ttl += 1
+            self.forget_frame(frame_id)
             self.stats.frames_dropped_ttl += 1
         
-         # HHHHHHHHHHHHHH on reconstruit avec la prio
-        for frame_id in frames_to_retransmit:
-            packet, send_time, retries, priority = self.pending_acks[frame_id]
-            self.sock.sendto(packet, (self.server_host, self.server_port))
-            self.pending_acks[frame_id] = (packet, current_time, retries + 1, priority)
-            self.stats.retransmissions += 1
+        deadline = self.recovery.deadline()
+        if deadline is not None and deadline <= current_time:
+            # RFC 9002 sans seuil de temps armé: c'est une sonde PTO, pas une perte
+            detected = getattr(self.recovery, 'loss_time', True) is not None
+            for frame_id in self.recovery.on_timeout(current_time):
+                self.on_frame_lost(frame_id, current_time, detected)
+        
+        # pas d'ACK en retard pour ces frames expirées: perdues pour le GOP
+        for frame_id, expiry in list(self.gop_expired.items()) if self.gop_expired else ():
+            if expiry <= current_time:
+                del self.gop_expired[frame_id]
+                self.lose_reference(frame_id)
+        
+        if self.path_mtu_discovery:
+            self.check_pmtu(current_time)
+    
+    def next_deadline(self) -> Optional[float]:
+        """Prochaine échéance (TTL, seuil de perte, PTO, sonde PMTU ou ACK en retard attendu), en time.monotonic()"""
+        pmtu = self.pmtu.deadline() if self.path_mtu_discovery else None
+        gop = min(self.gop_expired.values()) if self.gop_expired else None
+        deadlines = [d for d in (self.timers.next_deadline(), self.recovery.deadline(), pmtu, gop)
+                     if d is not None]
+        return min(deadlines) if deadlines else None
+    
+    def check_pmtu(self, now: float):
+        """Sonde perdue (trou noir éventuel) puis sonde suivante"""
+        lowered = self.pmtu.on_timeout(now)
+        if lowered is not None:
+            self.set_datagram_size(lowered, now)
+        # HELLO 0-RTT collé devant les fragments: taille fixe jusqu'au HELLO_ACK
+        if self.packetizer.prefix:
+            return
+        size = self.pmtu.next_probe(now)
+        if size is None:
+            return
+        # une perte de sonde n'est pas un signal de congestion: hors cwnd et pacer
+        timeout = max(3 * self.recovery.srtt, 0.05)
+        probe_id = self.pmtu.on_sent(size, now, timeout)
+        PMTU_PROBE_HEADER.pack_into(self.pmtu_probe, 0, PACKET_PMTU_PROBE, self.conn_id, probe_id, size)
+        try:
+            self.sock.sendto(memoryview(self.pmtu_probe)[:size], self.server_addr)
+        except OSError as e:
+            if e.errno != errno.EMSGSIZE:
+                raise
+            # plus grand que le MTU de l'interface locale
+            lowered = self.pmtu.on_too_big(size, now)
+            if lowered is not None:
+                self.set_datagram_size(lowered, now)
+    
+    def on_pmtu_ack(self, data: bytes):
+        _, _, probe_id, probe_size = PMTU_PROBE_HEADER.unpack_from(data)
+        raised = self.pmtu.on_ack(probe_id, probe_size)
+        now = time.monotonic()
+        if raised is not None:
+            self.set_datagram_size(raised, now)
+        self.check_pmtu(now)
+    
+    def set_datagram_size(self, size: int, now: float):
+        """Taille des datagrammes des frames suivantes; les frames en cours gardent leur découpage"""
+        # parité FEC: en-tête plus long que celui d'un fragment, à garder sous le PLPMTU
+        if self.fec is not None:
+            size -= FEC_HEADER.size - FRAGMENT_HEADER.size
+        if size == self.packetizer.datagram_size:
+            return
+        self.packetizer.resize(size, self.pending_acks)
+        self.pacer.burst = 2 * size
+        self.congestion.mss = size
+        self.pmtu_changes.append((round(now - self.created, 3), size))
     
     def run(self, duration: int = 30) -> dict:
         print(f"[rQUIC Client] Connexion à {self.server_host}:{self.server_port}")
@@ -344,14 +1771,11 @@ class rQUICClient:
         last_report = start_time
         
         while time.time() - start_time < duration:
-            frame_start = time.time()
+            frame_start = time.monotonic()
             
             self.send_frame(frame_id)
             frame_id += 1
             
-            self.process_acks()
-            self.check_timeouts()
-            
             if time.time() - last_report >= 1.0:
                 elapsed = time.time() - start_time
                 print(f"[{elapsed:.1f}s] Envoyées: {self.stats.frames_sent}, "
@@ -359,10 +1783,16 @@ class rQUICClient:
                       f"Retrans: {self.stats.retransmissions}")
                 last_report = time.time()
             
-            elapsed_frame = time.time() - frame_start
-            sleep_time = frame_interval - elapsed_frame
-            if sleep_time > 0:
-                time.sleep(sleep_time)
+            # jusqu'à la frame suivante: ACK, timers et file d'envoi pacée
+            # (process_acks attend au plus 1ms, la durée du timeout du socket)
+            next_frame = frame_start + frame_interval
+            while True:
+                self.process_acks()
+                self.check_timeouts()
+                now = time.monotonic()
+                self.flush_send_queue(now)
+                if now >= next_frame:
+                    break
         
         time.sleep(0.5)
         self.process_acks()
@@ -381,21 +1811,113 @@ class rQUICClient:
             'start_time': time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.stats.start_time)),
             'protocol': 'rQUIC',
             'fps': self.fps,
+            'frame_source': type(self.frames).__name__,
+            'i_frames_sent': self.stats.i_frames_sent,
             'frame_sizes': self.stats.frame_sizes,
             'retransmissions': self.stats.retransmissions,
+            'nacks_suppressed': self.stats.nacks_suppressed,
             'acks_received': self.stats.acks_received,
+            'ack_packets_received': self.stats.ack_packets_received,
+            'fragments_sent': self.stats.fragments_sent,
+            'fragment_retransmissions': self.stats.fragment_retransmissions,
+            'bytes_retransmitted': self.stats.bytes_retransmitted,
+            'datagram_size': self.packetizer.datagram_size,
+            'path_mtu_discovery': self.path_mtu_discovery,
+            'pmtu_state': self.pmtu.state,
+            'pmtu_probes_sent': self.pmtu.probes_sent,
+            'pmtu_probes_acked': self.pmtu.probes_acked,
+            'pmtu_black_holes': self.pmtu.black_holes,
+            # (s depuis la création, nouvelle taille de datagramme)
+            'pmtu_changes': self.pmtu_changes,
+            'gso': self.packetizer.gso is not None and self.packetizer.gso.enabled,
+            'send_syscalls': self.packetizer.syscalls,
+            'datagrams_too_big': self.packetizer.gso.oversize_drops if self.packetizer.gso is not None else 0,
             
             # HHHHHHHHHHHHHH
             'frames_dropped_ttl': self.stats.frames_dropped_ttl,
+            'frames_dropped_predicted': self.stats.frames_dropped_predicted,
+            'bytes_saved_predicted': self.stats.bytes_saved_predicted,
+            'gop_tracking': self.gop_tracking,
+            'frames_cancelled_gop': self.stats.frames_cancelled_gop,
+            'bytes_saved_gop': self.stats.bytes_saved_gop,
+            'keyframe_requests': self.stats.keyframe_requests,
+            **self.memory_summary(),
             
             'avg_rtt_ms': avg_rtt,
+            'min_rtt_ms': min(self.stats.rtt_samples) if self.stats.rtt_samples else 0,
+            'p95_rtt_ms': sorted(self.stats.rtt_samples)[int(len(self.stats.rtt_samples) * 0.95)]
+                          if self.stats.rtt_samples else 0,
+            'congestion_control': self.congestion_mode,
+            'cwnd_bytes': self.congestion.cwnd if self.congestion.cwnd != float('inf') else None,
+            'recovery': self.recovery_mode,
+            'fec': self.fec_mode,
+            'fec_packets_sent': self.stats.fec_packets_sent,
+            # octets de parité / octets de données envoyés
+            'fec_overhead_percent': (self.stats.fec_bytes_sent
+                                     / (self.stats.total_bytes_sent - self.stats.fec_bytes_sent) * 100
+                                     if self.stats.total_bytes_sent > self.stats.fec_bytes_sent else 0),
+            'srtt_ms': self.recovery.srtt * 1000,
+            'avg_loss_detection_ms': (sum(self.stats.loss_detection_ms) / len(self.stats.loss_detection_ms)
+                                      if self.stats.loss_detection_ms else 0),
             'delivery_rate': (self.stats.acks_received / self.stats.frames_sent * 100) if self.stats.frames_sent > 0 else 0,
+            'scheduler': self.scheduler_mode,
+            'resumed': self.resumed,
+            'handshake_status': self.handshake_status,
+            'handshake_ms': self.handshake_ms,
+            'header_version': HEADER_VERSION_COMPACT if self.packetizer.compact else HEADER_VERSION_FIXED,
+            # ACK et NACK reçus (octets rQUIC, sans IP/UDP)
+            'control_bytes_received': self.stats.control_bytes_received,
+            # création de la frame -> ACK, par priorité
+            'p99_latency_ms': self.latency_percentile(0.99),
+            'streams': {stream_id: stream.summary() for stream_id, stream in sorted(self.streams.items())
+                        if stream.stats.frames_sent},
+        }
+    
+    def memory_summary(self) -> dict:
+        """Pool de retransmission, RSS du processus et taux d'allocation d'objets"""
+        rss, peak_rss = resident_memory()
+        elapsed = time.monotonic() - self.created
+        pool = self.pool.stats if self.pool is not None else None
+        return {
+            'retransmit_pool_bytes': self.pool.capacity_bytes if pool else None,
+            'retransmit_pool_peak_bytes': pool.peak_used_bytes if pool else None,
+            'frames_evicted_pool': pool.frames_evicted if pool else 0,
+            'frames_rejected_pool': pool.frames_rejected if pool else 0,
+            'frames_oversize_pool': pool.frames_oversize if pool else 0,
+            'rss_mb': rss / 1e6,
+            'peak_rss_mb': peak_rss / 1e6,
+            'allocations_per_sec': ((gc_allocations() - self.allocations_start) / elapsed
+                                    if elapsed > 0 else 0),
         }
+    
+    def latency_percentile(self, q: float) -> Dict[str, float]:
+        by_priority = defaultdict(list)
+        for priority, latency in self.stats.delivery_latency_ms:
+            by_priority[priority].append(latency)
+        return {FramePriority(p).name: sorted(v)[min(int(len(v) * q), len(v) - 1)]
+                for p, v in sorted(by_priority.items())}
 
-def run_server(host: str, port: int, duration: int, output_file: str):
-    """Lance le serveur rQUIC"""
-    server = rQUICServer(host, port)
-    results = server.start(duration)
+def run_server(host: str, port: int, duration: int, output_file: str, use_asyncio: bool = False,
+               workers: int = 1, ack_frequency: int = 2, require_handshake: bool = False,
+               playout_fps: Optional[float] = None):
+    """Lance le serveur rQUIC (playout_fps: tampon de lecture sur le flux par défaut)"""
+    if workers > 1:
+        from rquic_sharding import rQUICShardedServer
+        results = rQUICShardedServer(host, port, workers, ack_frequency,
+                                     require_handshake).start(duration)
+    elif use_asyncio:
+        import asyncio
+        from rquic_async import rQUICAsyncServer
+        server = rQUICAsyncServer(host, port, ack_frequency, require_handshake)
+        if playout_fps:
+            server.playout_intervals[DEFAULT_STREAM_ID] = 1.0 / playout_fps
+        results = asyncio.run(server.serve(duration))
+    else:
+        server = rQUICServer(host, port, ack_frequency=ack_frequency,
+                             require_handshake=require_handshake)
+        if playout_fps:
+            server.playout_intervals[DEFAULT_STREAM_ID] = 1.0 / playout_fps
+        results = server.start(duration)
     
     with open(output_file, 'w') as f:
         json.dump(results, f, indent=2)
@@ -403,14 +1925,67 @@ def run_server(host: str, port: int, duration: int, output_file: str):
     print(f"[rQUIC Server] Résultats sauvegardés: {output_file}")
     print(f"[rQUIC] Frames reçues: {results['frames_received']}")
     print(f"[rQUIC] Retransmissions demandées: {results['retransmission_requests']}")
+    for stream_id, playout in results.get('playout', {}).items():
+        print(f"[rQUIC] Lecture flux {stream_id}: {playout['frames_on_time']} à l'heure, "
+              f"{playout['frames_late']} en retard, {playout['frames_skipped']} sautées "
+              f"(délai cible {playout['target_delay_ms']:.1f}ms)")
     
     return results
 
 
-def run_client(server_host: str, server_port: int, duration: int, output_file: str):
-    """Lance le client rQUIC"""
-    client = rQUICClient(server_host, server_port)
-    results = client.run(duration)
+def run_client(server_host: str, server_port: int, duration: int, output_file: str,
+               datagram_size: int = DEFAULT_DATAGRAM_SIZE, use_asyncio: bool = False,
+               recovery: str = 'rfc9002', congestion: str = 'bbr', fec: str = 'none',
+               scheduler: str = 'edf', trace: Optional[str] = None,
+               handshake: bool = False, token_cache: Optional[str] = None,
+               gop_tracking: bool = True, path_mtu_discovery: bool = True,
+               pmtu_max: int = DEFAULT_MAX_PLPMTU, local_addresses: Optional[List[str]] = None,
+               path_scheduler: str = 'minrtt'):
+    """Lance le client rQUIC (trace: CSV ou binaire rejoué au lieu du générateur)
+    
+    handshake: HELLO avant les frames, 0-RTT si token_cache contient un jeton du serveur
+    gop_tracking: False = les dépendants d'une référence perdue partent quand même
+    path_mtu_discovery: False = datagram_size gardé tel quel; pmtu_max: plafond des sondes
+    local_addresses: plusieurs adresses locales = un chemin par adresse (rquic_multipath)
+    """
+    multipath = bool(local_addresses) and len(local_addresses) > 1
+    if multipath and use_asyncio:
+        raise ValueError("multipath: transport asyncio non pris en charge")
+    frames = open_trace(trace) if trace else None
+    tokens = TokenCache(token_cache)
+    if use_asyncio:
+        import asyncio
+        from rquic_async import rQUICAsyncClient
+        client = rQUICAsyncClient(server_host, server_port, datagram_size, recovery=recovery,
+                                  congestion=congestion, fec=fec, scheduler=scheduler, frames=frames,
+                                  tokens=tokens)
+        client.gop_tracking = gop_tracking
+        client.path_mtu_discovery = path_mtu_discovery
+        client.pmtu = PathMtuSearch(datagram_size, pmtu_max)
+        if handshake:
+            client.connect()
+        results = asyncio.run(client.run(duration))
+    elif multipath:
+        from rquic_multipath import rQUICMultipathClient
+        client = rQUICMultipathClient(server_host, server_port, local_addresses, path_scheduler,
+                                      datagram_size=datagram_size, recovery=recovery,
+                                      congestion=congestion, fec=fec, scheduler=scheduler,
+                                      frames=frames, tokens=tokens)
+        client.gop_tracking = gop_tracking
+        if handshake:
+            client.connect()
+        results = client.run(duration)
+    else:
+        from rquic_connection import rQUICConnection
+        client = rQUICConnection(server_host, server_port, datagram_size=datagram_size,
+                                 recovery=recovery, congestion=congestion, fec=fec,
+                                 scheduler=scheduler, frames=frames, tokens=tokens)
+        client.gop_tracking = gop_tracking
+        client.path_mtu_discovery = path_mtu_discovery
+        client.pmtu = PathMtuSearch(datagram_size, pmtu_max)
+        if handshake:
+            client.connect()
+        results = client.run(duration)
     
     with open(output_file, 'w') as f:
         json.dump(results, f, indent=2)
@@ -418,7 +1993,18 @@ def run_client(server_host: str, server_port: int, duration: int, output_file: s
     print(f"[rQUIC Client] Résultats sauvegardés: {output_file}")
     print(f"[rQUIC] Frames envoyées: {results['frames_sent']}")
     print(f"[rQUIC] Retransmissions: {results['retransmissions']}")
+    print(f"[rQUIC] Octets retransmis: {results['bytes_retransmitted']}")
     print(f"[rQUIC] Taux de livraison: {results['delivery_rate']:.1f}%")
+    if results['pmtu_changes']:
+        print(f"[rQUIC] Taille des datagrammes: {results['datagram_size']} octets "
+              f"({results['pmtu_probes_sent']} sondes PMTU, {results['pmtu_black_holes']} trous noirs)")
+    for path in results.get('paths', []):
+        print(f"[rQUIC] Chemin {path['path_id']} ({path['local_address']}): "
+              f"{path['frames_placed']} frames, srtt {path['srtt_ms'] or 0:.1f}ms, "
+              f"pertes {path['loss_percent']:.1f}%")
+    if results['frames_cancelled_gop']:
+        print(f"[rQUIC] Dépendants annulés (GOP): {results['frames_cancelled_gop']}, "
+              f"{results['bytes_saved_gop']} octets économisés")
     
     return results
 
@@ -430,10 +2016,49 @@ if __name__ == '__main__':
     parser.add_argument('--port', type=int, default=5000, help='Port')
     parser.add_argument('--duration', type=int, default=30, help='Durée en secondes')
     parser.add_argument('--output', default='rquic_results.json', help='Fichier de sortie')
+    parser.add_argument('--mtu', type=int, default=DEFAULT_DATAGRAM_SIZE, help='Taille max des datagrammes (client)')
+    parser.add_argument('--asyncio', action='store_true', help='Transport asyncio au lieu des sockets bloquants')
+    parser.add_argument('--workers', type=int, default=1, help='Workers SO_REUSEPORT (serveur)')
+    parser.add_argument('--ack-frequency', type=int, default=2, help='Frames reçues par ACK (serveur)')
+    parser.add_argument('--recovery', choices=['rfc9002', 'legacy'], default='rfc9002',
+                        help='Détection de pertes et RTT (client)')
+    parser.add_argument('--cc', choices=['none', 'newreno', 'bbr'], default='bbr',
+                        help='Contrôle de congestion + pacing (client), none = rafale par frame')
+    parser.add_argument('--fec', choices=['none', 'xor', 'rs'], default='none',
+                        help='Parité FEC par frame (client): xor léger, rs Reed-Solomon')
+    parser.add_argument('--scheduler', choices=['fifo', 'edf'], default='edf',
+                        help='Ordre d\'envoi (client): edf = échéance + équité pondérée par priorité')
+    parser.add_argument('--playout-fps', type=float, default=None,
+                        help='Tampon de lecture adaptatif sur le flux par défaut, cadence source (serveur, sans --workers)')
+    parser.add_argument('--require-handshake', action='store_true',
+                        help='Refuse les données sans HELLO préalable (serveur)')
+    parser.add_argument('--handshake', action='store_true',
+                        help='HELLO avant les frames, 0-RTT avec un jeton en cache (client)')
+    parser.add_argument('--token-cache', default=None,
+                        help='Fichier des jetons de reprise, conservé entre deux lancements (client)')
+    parser.add_argument('--trace', default=None,
+                        help='Trace de frames à rejouer (client): CSV size,type ou binaire .rqtr')
+    parser.add_argument('--no-gop', action='store_true',
+                        help='Envoie les P/B-frames même si leur référence est perdue (client)')
+    parser.add_argument('--no-pmtud', action='store_true',
+                        help='Pas de sondes PMTU, taille de datagramme fixe --mtu (client)')
+    parser.add_argument('--pmtu-max', type=int, default=DEFAULT_MAX_PLPMTU,
+                        help='Plus grand datagramme sondé (client), 8972 pour un chemin jumbo')
+    parser.add_argument('--paths', default=None,
+                        help='Adresses locales séparées par des virgules, un chemin par adresse (client)')
+    parser.add_argument('--path-scheduler', choices=['minrtt', 'redundant'], default='minrtt',
+                        help='Placement multipath (client): redundant = CRITICAL dupliquées si le chemin perd')
     
     args = parser.parse_args()
+    if args.paths and ',' in args.paths and args.asyncio:
+        parser.error("--paths avec plusieurs adresses: pas de transport --asyncio")
     
     if args.mode == 'server':
-        run_server(args.host, args.port, args.duration, args.output)
+        run_server(args.host, args.port, args.duration, args.output, args.asyncio, args.workers,
+                   args.ack_frequency, args.require_handshake, args.playout_fps)
     else:
-        run_client(args.host, args.port, args.duration, args.output)
+        run_client(args.host, args.port, args.duration, args.output, args.mtu, args.asyncio,
+                   args.recovery, args.cc, args.fec, args.scheduler, args.trace,
+                   args.handshake, args.token_cache, not args.no_gop, not args.no_pmtud,
+                   args.pmtu_max, args.paths.split(',') if args.paths else None,
+                   args.path_scheduler)
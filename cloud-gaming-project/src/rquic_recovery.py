@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""Estimation du RTT et détection de pertes côté client (inspiré de la RFC 9002)
+
+Deux stratégies avec la même interface, choisies par rQUICClient.recovery:
+
+- Rfc9002Recovery: srtt/rttvar/min_rtt, pertes par seuil de paquets et de
+  temps à chaque ACK, PTO pour les pertes en fin de rafale, règle de Karn
+- LegacyRecovery: l'ancien EWMA srtt avec rto = 2*srtt borné à [50ms, 1s]
+  et un timer RTO par frame (gardé pour comparaison)
+
+Toutes les dates viennent de time.monotonic().
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from rquic_timers import DeadlineHeap
+
+# RFC 9002 §6.1 et §6.2
+PACKET_THRESHOLD = 3
+TIME_THRESHOLD = 9 / 8
+GRANULARITY = 0.001
+
+
+class RttEstimator:
+    """RFC 9002 §5: latest_rtt, smoothed_rtt, rttvar, min_rtt"""
+
+    def __init__(self, initial_rtt: float = 0.1):
+        self.latest_rtt = 0.0
+        self.smoothed_rtt = initial_rtt
+        self.rttvar = initial_rtt / 2
+        self.min_rtt = 0.0
+        self.has_sample = False
+
+    def update(self, latest_rtt: float, ack_delay: float, max_ack_delay: float):
+        self.latest_rtt = latest_rtt
+        if not self.has_sample:
+            self.min_rtt = latest_rtt
+            self.smoothed_rtt = latest_rtt
+            self.rttvar = latest_rtt / 2
+            self.has_sample = True
+            return
+
+        self.min_rtt = min(self.min_rtt, latest_rtt)
+        # le délai d'ACK annoncé ne doit jamais faire passer l'échantillon sous min_rtt
+        ack_delay = min(ack_delay, max_ack_delay)
+        adjusted_rtt = latest_rtt
+        if latest_rtt >= self.min_rtt + ack_delay:
+            adjusted_rtt = latest_rtt - ack_delay
+
+        self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.smoothed_rtt - adjusted_rtt)
+        self.smoothed_rtt = 0.875 * self.smoothed_rtt + 0.125 * adjusted_rtt
+
+
+class Rfc9002Recovery:
+
+    def __init__(self, max_ack_delay: float = 0.005, initial_rtt: float = 0.1):
+        self.rtt = RttEstimator(initial_rtt)
+        self.max_ack_delay = max_ack_delay
+
+        # frame_id -> (time_sent, tx_seq), dans l'ordre d'émission: une
+        # retransmission remet la frame en fin de dict
+        self.sent: Dict[int, Tuple[float, int]] = {}
+        # les frame_id sont réutilisés à la retransmission: les seuils se
+        # comptent en émissions (tx_seq), comme les numéros de paquets QUIC
+        self.tx_seq = 0
+        self.largest_acked_seq = -1
+
+        self.loss_time: Optional[float] = None
+        self.last_sent_time = 0.0
+        self.pto_count = 0
+
+    @property
+    def srtt(self) -> float:
+        return self.rtt.smoothed_rtt
+
+    def pto(self) -> float:
+        rtt = self.rtt
+        return rtt.smoothed_rtt + max(4 * rtt.rttvar, GRANULARITY) + self.max_ack_delay
+
+    def on_sent(self, frame_id: int, now: float):
+        self.sent.pop(frame_id, None)
+        self.sent[frame_id] = (now, self.tx_seq)
+        self.tx_seq += 1
+        self.last_sent_time = now
+
+    def forget(self, frame_id: int):
+        self.sent.pop(frame_id, None)
+
+    def on_ack(self, acked: List[int], rtt_sample: Optional[float], retransmitted: bool,
+               ack_delay: float, now: float) -> Tuple[List[int], Optional[float]]:
+        """Retourne (frames perdues, RTT retenu ou None)"""
+        if not acked:
+            return [], None
+
+        for frame_id in acked:
+            entry = self.sent.pop(frame_id, None)
+            if entry is not None and entry[1] > self.largest_acked_seq:
+                self.largest_acked_seq = entry[1]
+
+        # règle de Karn: une frame retransmise ne dit rien du RTT
+        accepted = None
+        if rtt_sample is not None and not retransmitted:
+            self.rtt.update(rtt_sample, ack_delay, self.max_ack_delay)
+            accepted = rtt_sample
+
+        self.pto_count = 0
+        return self.detect_lost(now), accepted
+
+    def detect_lost(self, now: float) -> List[int]:
+        rtt = self.rtt
+        loss_delay = max(TIME_THRESHOLD * max(rtt.latest_rtt, rtt.smoothed_rtt), GRANULARITY)
+        lost_send_time = now - loss_delay
+
+        lost = []
+        self.loss_time = None
+        # ordre d'émission: dès qu'une frame n'est pas perdue, les suivantes ne le sont pas non plus
+        for frame_id, (time_sent, seq) in self.sent.items():
+            if seq >= self.largest_acked_seq:
+                break
+            if time_sent <= lost_send_time or self.largest_acked_seq - seq >= PACKET_THRESHOLD:
+                lost.append(frame_id)
+            else:
+                self.loss_time = time_sent + loss_delay
+                break
+
+        for frame_id in lost:
+            del self.sent[frame_id]
+        return lost
+
+    def deadline(self) -> Optional[float]:
+        if self.loss_time is not None:
+            return self.loss_time
+        if not self.sent:
+            return None
+        return self.last_sent_time + self.pto() * (2 ** self.pto_count)
+
+    def on_timeout(self, now: float) -> List[int]:
+        """Pertes au seuil de temps, sinon PTO: on sonde la frame la plus récente"""
+        if self.loss_time is not None:
+            return self.detect_lost(now)
+        if not self.sent:
+            return []
+        self.pto_count += 1
+        newest = next(reversed(self.sent))
+        # la sonde sera réenregistrée par on_sent
+        del self.sent[newest]
+        return [newest]
+
+
+class LegacyRecovery:
+    """Logique d'origine: EWMA sur chaque ACK, y compris des frames retransmises"""
+
+    def __init__(self, max_ack_delay: float = 0.005, initial_rtt: float = 0.1):
+        self.srtt = initial_rtt
+        self.rto = 0.1
+        self.timers = DeadlineHeap()
+
+    def on_sent(self, frame_id: int, now: float):
+        self.timers.schedule(frame_id, now + self.rto)
+
+    def forget(self, frame_id: int):
+        self.timers.cancel(frame_id)
+
+    def on_ack(self, acked: List[int], rtt_sample: Optional[float], retransmitted: bool,
+               ack_delay: float, now: float) -> Tuple[List[int], Optional[float]]:
+        for frame_id in acked:
+            self.timers.cancel(frame_id)
+        if rtt_sample is None:
+            return [], None
+        self.srtt = 0.875 * self.srtt + 0.125 * rtt_sample
+        self.rto = max(0.05, min(1.0, self.srtt * 2))
+        return [], rtt_sample
+
+    def deadline(self) -> Optional[float]:
+        return self.timers.next_deadline()
+
+    def on_timeout(self, now: float) -> List[int]:
+        return self.timers.pop_expired(now)
+
+
+RECOVERY_MODES = {
+    'rfc9002': Rfc9002Recovery,
+    'legacy': LegacyRecovery,
+}
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Ordonnancement des datagrammes en attente d'envoi (client)
+
+Chaque entrée est un datagramme (frame_id, index, retransmission ?) avec
+l'échéance de sa frame (création + TTL de sa priorité). Même interface pour
+chaque stratégie, choisie par rQUICClient.scheduler:
+
+- fifo: ordre d'arrivée, la priorité ne compte pas (comportement historique)
+- edf:  une file par FramePriority, échéance la plus proche d'abord; un
+        crédit pondéré par classe (deficit round robin) empêche la famine
+        des classes basses quand les hautes saturent le lien
+"""
+
+import heapq
+import itertools
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+from rquic_wire import FramePriority
+
+Entry = Tuple[int, int, bool]
+
+
+class FifoScheduler:
+
+    def __init__(self):
+        self.queue = deque()
+
+    def __len__(self) -> int:
+        return len(self.queue)
+
+    def push(self, frame_id: int, index: int, priority: int, deadline: float,
+             retransmit: bool = False):
+        self.queue.append((frame_id, index, retransmit))
+
+    def peek(self) -> Optional[Entry]:
+        return self.queue[0] if self.queue else None
+
+    def pop(self, charge: bool = True) -> Entry:
+        return self.queue.popleft()
+
+
+class DeadlineScheduler:
+    """EDF entre les classes qui ont encore du crédit
+
+    Un datagramme envoyé coûte 1 crédit à sa classe. Quand aucune classe en
+    attente n'a de crédit, chacune reçoit weight * quantum: sur un tour, une
+    classe ne peut pas dépasser sa part, quelle que soit son échéance.
+    """
+
+    DEFAULT_WEIGHTS = {
+        FramePriority.CRITICAL: 8,
+        FramePriority.HIGH: 4,
+        FramePriority.MEDIUM: 2,
+        FramePriority.LOW: 1,
+    }
+
+    def __init__(self, weights: Optional[Dict[int, int]] = None, quantum: int = 4):
+        self.weights = dict(weights or self.DEFAULT_WEIGHTS)
+        self.quantum = quantum
+        self.queues = {priority: [] for priority in self.weights}
+        self.credit = {priority: 0 for priority in self.weights}
+        self.counter = itertools.count()
+        self.count = 0
+        self.selected: Optional[int] = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def push(self, frame_id: int, index: int, priority: int, deadline: float,
+             retransmit: bool = False):
+        queue = self.queues[priority]
+        # classe qui se réveille: elle n'a pas consommé sa part, pas d'attente d'un tour
+        if not queue and self.credit[priority] <= 0:
+            self.credit[priority] = self.weights[priority] * self.quantum
+        # à échéance égale, l'ordre d'arrivée: les fragments d'une frame restent dans l'ordre
+        heapq.heappush(queue,
+                       (deadline, next(self.counter), frame_id, index, retransmit))
+        self.count += 1
+        self.selected = None
+
+    def select(self) -> Optional[int]:
+        backlogged = [p for p, queue in self.queues.items() if queue]
+        if not backlogged:
+            return None
+        eligible = [p for p in backlogged if self.credit[p] > 0]
+        if not eligible:
+            for p in backlogged:
+                self.credit[p] += self.weights[p] * self.quantum
+            eligible = backlogged
+        return min(eligible, key=lambda p: self.queues[p][0][:2])
+
+    def peek(self) -> Optional[Entry]:
+        if self.selected is None:
+            self.selected = self.select()
+        if self.selected is None:
+            return None
+        _, _, frame_id, index, retransmit = self.queues[self.selected][0]
+        return frame_id, index, retransmit
+
+    def pop(self, charge: bool = True) -> Entry:
+        """Retire l'entrée de peek(); charge=False pour une entrée périmée jamais envoyée"""
+        if self.selected is None:
+            self.selected = self.select()
+        priority = self.selected
+        _, _, frame_id, index, retransmit = heapq.heappop(self.queues[priority])
+        self.count -= 1
+        if charge:
+            self.credit[priority] -= 1
+        self.selected = None
+        return frame_id, index, retransmit
+
+
+SCHEDULERS = {
+    'fifo': FifoScheduler,
+    'edf': DeadlineScheduler,
+}
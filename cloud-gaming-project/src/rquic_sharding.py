@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""Serveur rQUIC multi-processus: N workers sur le même port via SO_REUSEPORT
+
+Chaque worker est un rQUICServer complet avec ses propres sessions et son
+propre rQUICStats. Le noyau hash chaque flux (4-tuple) vers un worker, donc
+une session reste sur le même worker. Le parent agrège les stats des
+workers dans le format habituel de get_results.
+
+Les jetons de reprise sont communs: même secret, et nonces déjà utilisés
+dans un dict partagé (multiprocessing.Manager), sinon un HELLO 0-RTT rejoué
+vers un autre worker y serait accepté une seconde fois.
+"""
+
+import multiprocessing
+import queue as queue_module
+from collections import defaultdict
+from dataclasses import fields
+from typing import Dict, List
+
+from rquic_playout import PlayoutStats
+from rquic_protocol import rQUICServer, rQUICStats
+from rquic_stream import StreamReceiveStats
+
+# délai entre deux vérifications des workers pendant l'attente des rapports (s)
+REPORT_POLL_INTERVAL = 1.0
+
+
+def merge_fields(merged, stats, skip=(), keep_max=()):
+    """Ajoute les champs de stats dans merged: listes concaténées, compteurs sommés"""
+    for f in fields(merged):
+        if f.name in skip:
+            continue
+        value = getattr(stats, f.name)
+        if isinstance(value, list):
+            getattr(merged, f.name).extend(value)
+        elif f.name in keep_max:
+            setattr(merged, f.name, max(getattr(merged, f.name), value))
+        else:
+            setattr(merged, f.name, getattr(merged, f.name) + value)
+
+
+def merge_stats(stats_list: List[rQUICStats]) -> rQUICStats:
+    """Somme les compteurs, fusionne les listes et garde la fenêtre temporelle globale"""
+    merged = rQUICStats()
+    for stats in stats_list:
+        merge_fields(merged, stats, skip=('start_time', 'end_time'))
+
+    merged.frame_times.sort()
+    started = [s.start_time for s in stats_list if s.start_time]
+    merged.start_time = min(started) if started else 0
+    merged.end_time = max((s.end_time for s in stats_list), default=0)
+    return merged
+
+
+def merge_per_stream(per_worker: List[Dict], factory, keep_max=()) -> Dict:
+    """Fusionne les stats par flux des workers (un flux peut être servi par plusieurs)"""
+    merged = defaultdict(factory)
+    for streams in per_worker:
+        for stream_id, stats in streams.items():
+            merge_fields(merged[stream_id], stats, keep_max=keep_max)
+    for stats in merged.values():
+        if hasattr(stats, 'frame_times'):
+            stats.frame_times.sort()
+    return merged
+
+
+def _worker(index: int, host: str, port: int, duration: int, ack_frequency: int,
+            require_handshake: bool, token_secret: bytes, used_nonces, nonce_lock, queue):
+    # même secret partout: un jeton émis par un worker est valide sur les autres
+    server = rQUICServer(host, port, reuse_port=True, ack_frequency=ack_frequency,
+                         require_handshake=require_handshake, token_secret=token_secret)
+    server.tokens.share(used_nonces, nonce_lock)
+    server.start(duration)
+    sessions = server.closed_sessions + [s.summary() for s in server.sessions.values()]
+    # le parent n'a pas de socket: GRO, syscalls et stats par flux viennent d'ici
+    receive = {
+        'gro': server.receiver.enabled,
+        'recv_syscalls': server.receiver.recv_calls,
+        'streams': dict(server.streams),
+        'playout': dict(server.playout_stats),
+    }
+    queue.put((index, server.stats, sessions, receive))
+
+
+class rQUICShardedServer(rQUICServer):
+    """Parent: lance les workers puis expose leurs stats agrégées via get_results"""
+
+    def __init__(self, host: str = '0.0.0.0', port: int = 5000, workers: int = 2,
+                 ack_frequency: int = 2, require_handshake: bool = False):
+        super().__init__(host, port, ack_frequency=ack_frequency,
+                         require_handshake=require_handshake)
+        # le parent ne reçoit rien: seul les workers lient le port
+        self.sock.close()
+        self.workers = workers
+        self.worker_stats: List[rQUICStats] = []
+        self.worker_receive: List[dict] = []
+
+    def start(self, duration: int = 30):
+        ctx = multiprocessing.get_context('fork')
+        queue = ctx.Queue()
+        manager = ctx.Manager()
+        used_nonces = manager.dict()
+        nonce_lock = ctx.Lock()
+        processes = [ctx.Process(target=_worker, args=(i, self.host, self.port, duration,
+                                                              self.ack_frequency, self.require_handshake,
+                                                              self.tokens.secret, used_nonces, nonce_lock,
+                                                              queue))
+                     for i in range(self.workers)]
+
+        print(f"[rQUIC Server] {self.workers} workers SO_REUSEPORT sur {self.host}:{self.port}")
+        for p in processes:
+            p.start()
+
+        try:
+            reports = sorted(self.collect_reports(queue, processes))
+        finally:
+            for p in processes:
+                p.join()
+            manager.shutdown()
+
+        self.worker_stats = [stats for _, stats, _, _ in reports]
+        self.worker_receive = [receive for _, _, _, receive in reports]
+        self.closed_sessions = [s for _, _, sessions, _ in reports for s in sessions]
+        self.stats = merge_stats(self.worker_stats)
+        self.streams = merge_per_stream([r['streams'] for r in self.worker_receive],
+                                        StreamReceiveStats, keep_max=('highest_seq',))
+        self.playout_stats = merge_per_stream([r['playout'] for r in self.worker_receive],
+                                              PlayoutStats, keep_max=('target_delay',))
+
+        return self.get_results()
+
+    def collect_reports(self, queue, processes) -> list:
+        """Attend un rapport par worker; un worker mort sans rapport arrête tout"""
+        reports = []
+        while len(reports) < len(processes):
+            try:
+                reports.append(queue.get(timeout=REPORT_POLL_INTERVAL))
+                continue
+            except queue_module.Empty:
+                pass
+            reported = {report[0] for report in reports}
+            # sortie normale: le rapport est déjà dans la queue, on le lira au tour suivant
+            failed = [(i, p.exitcode) for i, p in enumerate(processes)
+                      if i not in reported and not p.is_alive() and p.exitcode != 0]
+            if not failed and all(not p.is_alive() for p in processes):
+                try:
+                    reports.append(queue.get(timeout=REPORT_POLL_INTERVAL))
+                    continue
+                except queue_module.Empty:
+                    failed = [(i, p.exitcode) for i, p in enumerate(processes) if i not in reported]
+            if failed:
+                for p in processes:
+                    if p.is_alive():
+                        p.terminate()
+                detail = ', '.join(f"worker {i} (code {code})" for i, code in failed)
+                print(f"[rQUIC Server] worker(s) terminé(s) sans rapport: {detail}")
+                raise RuntimeError(f"workers sans rapport: {detail}")
+        return reports
+
+    def get_results(self) -> dict:
+        results = super().get_results()
+        # le socket du parent est fermé: GRO et syscalls sont ceux des workers
+        results['gro'] = all(r['gro'] for r in self.worker_receive)
+        results['recv_syscalls'] = sum(r['recv_syscalls'] for r in self.worker_receive)
+        results['workers'] = self.workers
+        results['per_worker'] = [
+            {
+                'worker': i,
+                'frames_received': stats.frames_received,
+                'fragments_received': stats.fragments_received,
+                'recv_syscalls': self.worker_receive[i]['recv_syscalls'],
+                'cpu_time_sec': stats.cpu_time,
+            }
+            for i, stats in enumerate(self.worker_stats)
+        ]
+        return results
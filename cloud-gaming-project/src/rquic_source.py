@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""Sources de frames pour rQUICClient: taille et type de la frame suivante
+
+- SyntheticFrameSource: deux gaussiennes, 10% d'I-frames (comportement historique)
+- CsvTraceSource:       trace enregistrée, lignes "size,type" (type I/P/B)
+- BinaryTraceSource:    même trace au format compact, lue par mmap: aucun
+                        coût de chargement quelle que soit sa taille
+
+Format binaire (petit-boutiste): en-tête [magic 'RQTR'][version][count][max_size]
+puis count x [size u32][type u8].
+"""
+
+import csv
+import mmap
+import random
+import struct
+import sys
+from enum import IntEnum
+from typing import Iterable, List, Tuple
+
+
+class FrameType(IntEnum):
+    I = 0  # image de référence (keyframe)
+    P = 1
+    B = 2
+
+
+TRACE_MAGIC = b'RQTR'
+TRACE_VERSION = 1
+TRACE_HEADER = struct.Struct('<4sBII')
+TRACE_RECORD = struct.Struct('<IB')
+
+
+class FrameSource:
+    """Interface: (taille, FrameType) de la frame suivante"""
+
+    # plus grande frame que la source peut produire (dimensionne le pool de charge utile)
+    max_frame_size = 0
+
+    def next_frame(self) -> Tuple[int, FrameType]:
+        raise NotImplementedError
+
+    def request_keyframe(self):
+        """Référence perdue: la frame suivante devrait être une I-frame (trace: ignoré)"""
+
+
+class SyntheticFrameSource(FrameSource):
+
+    def __init__(self, avg_frame_size: int = 50000, max_frame_size: int = 60000,
+                 i_frame_probability: float = 0.1, seed=None):
+        self.avg_frame_size = avg_frame_size
+        self.max_frame_size = max_frame_size
+        self.i_frame_probability = i_frame_probability
+        # seed None: module random, comme avant (résultats non reproductibles)
+        self.random = random.Random(seed) if seed is not None else random
+        self.keyframe_requested = False
+
+    def request_keyframe(self):
+        self.keyframe_requested = True
+
+    def next_frame(self) -> Tuple[int, FrameType]:
+        is_i_frame = self.random.random() < self.i_frame_probability or self.keyframe_requested
+        self.keyframe_requested = False
+        if is_i_frame:
+            size = int(self.random.gauss(self.avg_frame_size * 2.5, self.avg_frame_size * 0.5))
+        else:
+            size = int(self.random.gauss(self.avg_frame_size * 0.7, self.avg_frame_size * 0.2))
+        frame_type = FrameType.I if is_i_frame else FrameType.P
+        return max(1000, min(size, self.max_frame_size)), frame_type
+
+
+def parse_frame_type(value: str) -> FrameType:
+    value = value.strip().upper()
+    if value.isdigit():
+        return FrameType(int(value))
+    return FrameType[value or 'P']
+
+
+class CsvTraceSource(FrameSource):
+    """Trace "size,type" chargée en mémoire; en-tête et colonnes en plus ignorés"""
+
+    def __init__(self, path: str):
+        self.frames: List[Tuple[int, FrameType]] = list(read_csv_trace(path))
+        if not self.frames:
+            raise ValueError(f"trace vide: {path}")
+        self.max_frame_size = max(size for size, _ in self.frames)
+        self.position = 0
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+    def next_frame(self) -> Tuple[int, FrameType]:
+        # fin de trace: on reboucle, la durée du test fixe le nombre de frames
+        if self.position == len(self.frames):
+            self.position = 0
+        frame = self.frames[self.position]
+        self.position += 1
+        return frame
+
+
+class BinaryTraceSource(FrameSource):
+    """Trace binaire projetée en mémoire: les pages sont lues à la demande"""
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.map) < TRACE_HEADER.size:
+            raise ValueError(f"trace tronquée: {path}")
+        magic, version, self.count, self.max_frame_size = TRACE_HEADER.unpack_from(self.map)
+        if magic != TRACE_MAGIC or version != TRACE_VERSION:
+            raise ValueError(f"pas une trace rQUIC v{TRACE_VERSION}: {path}")
+        if self.count == 0 or len(self.map) < TRACE_HEADER.size + self.count * TRACE_RECORD.size:
+            raise ValueError(f"trace vide ou tronquée: {path}")
+        self.position = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def next_frame(self) -> Tuple[int, FrameType]:
+        if self.position == self.count:
+            self.position = 0
+        size, frame_type = TRACE_RECORD.unpack_from(
+            self.map, TRACE_HEADER.size + self.position * TRACE_RECORD.size)
+        self.position += 1
+        return size, FrameType(frame_type)
+
+    def close(self):
+        self.map.close()
+
+
+def read_csv_trace(path: str) -> Iterable[Tuple[int, FrameType]]:
+    with open(path, newline='') as f:
+        for row in csv.reader(f):
+            if not row or not row[0].strip().isdigit():
+                continue
+            yield int(row[0]), parse_frame_type(row[1] if len(row) > 1 else 'P')
+
+
+def write_binary_trace(path: str, frames: Iterable[Tuple[int, int]]):
+    """Écrit une trace binaire (l'en-tête est complété une fois les frames comptées)"""
+    count = 0
+    max_size = 0
+    with open(path, 'wb') as f:
+        f.write(bytes(TRACE_HEADER.size))
+        for size, frame_type in frames:
+            f.write(TRACE_RECORD.pack(size, int(frame_type)))
+            count += 1
+            max_size = max(max_size, size)
+        f.seek(0)
+        f.write(TRACE_HEADER.pack(TRACE_MAGIC, TRACE_VERSION, count, max_size))
+
+
+def open_trace(path: str) -> FrameSource:
+    """Trace CSV ou binaire, reconnue au magic"""
+    with open(path, 'rb') as f:
+        magic = f.read(len(TRACE_MAGIC))
+    if magic == TRACE_MAGIC:
+        return BinaryTraceSource(path)
+    return CsvTraceSource(path)
+
+
+if __name__ == '__main__':
+    # conversion: python3 src/rquic_source.py trace.csv trace.rqtr
+    if len(sys.argv) != 3:
+        print(f"usage: {sys.argv[0]} trace.csv trace.rqtr")
+        sys.exit(1)
+    write_binary_trace(sys.argv[2], read_csv_trace(sys.argv[1]))
+    print(f"[rQUIC] Trace convertie: {sys.argv[2]}")
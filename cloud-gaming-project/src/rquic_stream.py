@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Flux (streams) multiplexés sur une seule connexion rQUIC
+
+Chaque fragment porte un stream ID et un numéro de séquence propre au flux.
+Le frame ID reste la numérotation de la connexion (ACK, pertes, congestion);
+le flux fixe la priorité et le TTL de ses frames et tient ses statistiques.
+Tous les flux partagent le socket, la boucle et l'ordonnanceur, qui arbitre
+entre eux par priorité et échéance.
+"""
+
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+# flux implicite: frames envoyées sans stream ID (priorité selon la taille)
+DEFAULT_STREAM_ID = 0
+MAX_STREAM_ID = 0xFFFF
+
+
+@dataclass
+class StreamStats:
+    frames_sent: int = 0
+    bytes_sent: int = 0
+    frames_acked: int = 0
+    retransmissions: int = 0
+    frames_dropped_ttl: int = 0
+    frames_dropped_predicted: int = 0
+    bytes_saved_predicted: int = 0
+    # dépendants d'une référence abandonnée: annulés, octets non envoyés
+    frames_cancelled_gop: int = 0
+    bytes_saved_gop: int = 0
+    # octets rQUIC réellement émis (en-têtes, retransmissions et parité compris)
+    wire_bytes: int = 0
+    datagrams_sent: int = 0
+    # ms entre la création de la frame et son ACK
+    delivery_latency_ms: list = field(default_factory=list)
+
+
+@dataclass
+class rQUICStream:
+    """Flux côté client: priorité et TTL None = déduits de la taille de la frame"""
+    stream_id: int
+    priority: Optional[int] = None
+    ttl: Optional[float] = None
+    name: str = ''
+    next_seq: int = 0
+    # dernière I/P-frame du flux: référence implicite des P/B suivantes
+    last_reference: Optional[int] = None
+    stats: StreamStats = field(default_factory=StreamStats)
+
+    def __post_init__(self):
+        if not 0 <= self.stream_id <= MAX_STREAM_ID:
+            raise ValueError(f"stream ID hors limites: {self.stream_id}")
+
+    def next_sequence(self) -> int:
+        seq = self.next_seq
+        self.next_seq = (seq + 1) & 0xFFFFFFFF
+        return seq
+
+    def summary(self) -> dict:
+        latency = sorted(self.stats.delivery_latency_ms)
+        return {
+            'stream_id': self.stream_id,
+            'name': self.name,
+            'priority': self.priority,
+            'ttl_ms': self.ttl * 1000 if self.ttl is not None else None,
+            'frames_sent': self.stats.frames_sent,
+            'bytes_sent': self.stats.bytes_sent,
+            'frames_acked': self.stats.frames_acked,
+            'retransmissions': self.stats.retransmissions,
+            'frames_dropped_ttl': self.stats.frames_dropped_ttl,
+            'frames_dropped_predicted': self.stats.frames_dropped_predicted,
+            'bytes_saved_predicted': self.stats.bytes_saved_predicted,
+            'frames_cancelled_gop': self.stats.frames_cancelled_gop,
+            'bytes_saved_gop': self.stats.bytes_saved_gop,
+            'wire_bytes': self.stats.wire_bytes,
+            'datagrams_sent': self.stats.datagrams_sent,
+            # octets sur le fil par octet utile (1.0 = aucun surcoût)
+            'wire_bytes_per_useful_byte': (self.stats.wire_bytes / self.stats.bytes_sent
+                                           if self.stats.bytes_sent else 0),
+            'delivery_rate': (self.stats.frames_acked / self.stats.frames_sent * 100
+                              if self.stats.frames_sent else 0),
+            'avg_latency_ms': sum(latency) / len(latency) if latency else 0,
+            'p99_latency_ms': latency[min(int(len(latency) * 0.99), len(latency) - 1)] if latency else 0,
+        }
+
+
+@dataclass
+class StreamReceiveStats:
+    """Flux côté serveur, toutes sessions confondues"""
+    frames_received: int = 0
+    bytes_received: int = 0
+    highest_seq: int = -1
+    # frame plus ancienne qu'une frame déjà livrée sur le même flux
+    out_of_order: int = 0
+    frame_times: List[float] = field(default_factory=list)
+
+    def on_frame(self, seq: int, size: int, now: float):
+        self.frames_received += 1
+        self.bytes_received += size
+        if seq < self.highest_seq:
+            self.out_of_order += 1
+        else:
+            self.highest_seq = seq
+        self.frame_times.append(now)
+
+    def summary(self) -> dict:
+        delays = [(b - a) * 1000 for a, b in zip(self.frame_times, self.frame_times[1:])]
+        jitter = 0
+        if len(delays) > 1:
+            jitter = sum(abs(b - a) for a, b in zip(delays, delays[1:])) / (len(delays) - 1)
+        return {
+            'frames_received': self.frames_received,
+            'bytes_received': self.bytes_received,
+            'out_of_order': self.out_of_order,
+            'avg_inter_frame_delay_ms': sum(delays) / len(delays) if delays else 0,
+            'jitter_ms': jitter,
+        }
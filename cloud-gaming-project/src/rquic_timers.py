@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Échéances RTO/TTL des frames en attente: tas min avec annulation paresseuse"""
+
+import heapq
+import itertools
+from typing import Dict, List, Optional, Tuple
+
+
+class DeadlineHeap:
+    """Une échéance par clé (frame_id)
+
+    schedule remplace l'échéance précédente, cancel est O(1): l'entrée reste
+    dans le tas mais n'est plus référencée et sera ignorée quand elle
+    remontera. Le tas est compacté quand les entrées mortes dominent.
+    """
+
+    def __init__(self):
+        self.heap: List[Tuple[float, int, int]] = []
+        self.live: Dict[int, int] = {}
+        self.counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self.live)
+
+    def __contains__(self, key: int) -> bool:
+        return key in self.live
+
+    def schedule(self, key: int, deadline: float):
+        seq = next(self.counter)
+        self.live[key] = seq
+        heapq.heappush(self.heap, (deadline, seq, key))
+        if len(self.heap) > 2 * len(self.live) + 64:
+            self.compact()
+
+    def cancel(self, key: int):
+        self.live.pop(key, None)
+
+    def compact(self):
+        self.heap = [entry for entry in self.heap if self.live.get(entry[2]) == entry[1]]
+        heapq.heapify(self.heap)
+
+    def next_deadline(self) -> Optional[float]:
+        heap = self.heap
+        while heap:
+            deadline, seq, key = heap[0]
+            if self.live.get(key) == seq:
+                return deadline
+            heapq.heappop(heap)
+        return None
+
+    def pop_expired(self, now: float) -> List[int]:
+        """Retire et retourne les clés dont l'échéance est passée; seules celles-ci sont visitées"""
+        heap = self.heap
+        expired = []
+        while heap and heap[0][0] <= now:
+            deadline, seq, key = heapq.heappop(heap)
+            if self.live.get(key) == seq:
+                del self.live[key]
+                expired.append(key)
+        return expired
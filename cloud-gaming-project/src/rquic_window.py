@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Suivi des frames reçues: fenêtre glissante de taille fixe en bitmap de mots 64 bits"""
+
+from array import array
+from typing import List
+
+WORD_MASK = 0xFFFFFFFFFFFFFFFF
+
+
+class ReceiveWindow:
+    """Bitmap circulaire ancré sur base, la plus petite frame pas encore reçue
+
+    Tout ce qui est sous base est reçu (ou abandonné quand une frame trop en
+    avance a forcé la fenêtre à glisser). Mémoire constante: size bits, quelle
+    que soit la durée de la session.
+    """
+
+    def __init__(self, size: int = 1024):
+        self.nwords = max(1, size // 64)
+        self.size = self.nwords * 64
+        self.words = array('Q', bytes(8 * self.nwords))
+        self.base = 0
+
+    @property
+    def limit(self) -> int:
+        """Première frame hors fenêtre"""
+        return (self.base & ~63) + self.size
+
+    def __contains__(self, frame_id: int) -> bool:
+        if frame_id < self.base:
+            return True
+        if frame_id >= self.limit:
+            return False
+        return (self.words[(frame_id >> 6) % self.nwords] >> (frame_id & 63)) & 1 == 1
+
+    def add(self, frame_id: int) -> bool:
+        """Marque la frame reçue; False si c'est un doublon"""
+        if frame_id < self.base:
+            return False
+        if frame_id >= self.limit:
+            self.slide_to(((frame_id >> 6) - self.nwords + 1) << 6)
+
+        index = (frame_id >> 6) % self.nwords
+        bit = 1 << (frame_id & 63)
+        if self.words[index] & bit:
+            return False
+        self.words[index] |= bit
+
+        if frame_id == self.base:
+            self.advance()
+        return True
+
+    def advance(self):
+        """Avance base au-delà des frames consécutives déjà reçues, mot par mot"""
+        while True:
+            index = (self.base >> 6) % self.nwords
+            offset = self.base & 63
+            word = self.words[index] >> offset
+            # nombre de 1 consécutifs à partir de base
+            ones = (~word & (word + 1)).bit_length() - 1
+            if offset + ones < 64:
+                self.base += ones
+                return
+            # mot entièrement reçu: libéré pour la suite de la fenêtre
+            self.words[index] = 0
+            self.base += 64 - offset
+
+    def slide_to(self, new_base: int):
+        """Glissement forcé: les frames manquantes sous new_base sont abandonnées"""
+        if new_base - self.base >= self.size + 64:
+            for index in range(self.nwords):
+                self.words[index] = 0
+            self.base = new_base
+        else:
+            while (self.base & ~63) + 64 <= new_base:
+                self.words[(self.base >> 6) % self.nwords] = 0
+                self.base = (self.base & ~63) + 64
+            self.base = max(self.base, new_base)
+        self.advance()
+
+    def missing(self, start: int, end: int) -> List[int]:
+        """Frames de [start, end) pas encore reçues, par ordre croissant"""
+        start = max(start, self.base)
+        end = min(end, self.limit)
+
+        result = []
+        frame_id = start
+        while frame_id < end:
+            word_start = frame_id & ~63
+            holes = ~self.words[(frame_id >> 6) % self.nwords] & WORD_MASK
+            holes &= WORD_MASK << (frame_id - word_start)
+            if end - word_start < 64:
+                holes &= (1 << (end - word_start)) - 1
+            while holes:
+                low = holes & -holes
+                result.append(word_start + low.bit_length() - 1)
+                holes ^= low
+            frame_id = word_start + 64
+        return result
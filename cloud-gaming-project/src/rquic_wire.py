@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Format des paquets rQUIC (types, en-têtes, priorités)"""
+
+import struct
+from enum import IntEnum
+
+
+PACKET_DATA = 0x01
+PACKET_ACK = 0x02
+PACKET_NACK = 0x03
+PACKET_FRAGMENT = 0x04
+PACKET_FRAGMENT_NACK = 0x05
+PACKET_ACK_RANGES = 0x06
+PACKET_NACK_BITMAP = 0x07
+PACKET_FEC = 0x08
+PACKET_HELLO = 0x09
+PACKET_HELLO_ACK = 0x0A
+PACKET_ACK_COMPACT = 0x0B
+PACKET_FRAGMENT_NACK_COMPACT = 0x0C
+# serveur -> client: référence jamais reçue, repartir d'une I-frame ([type][conn_id][frame_id])
+PACKET_KEYFRAME_REQUEST = 0x0D
+# client -> serveur: sonde PMTU bourrée de zéros jusqu'à probe_size; serveur -> client: reçue entière
+PACKET_PMTU_PROBE = 0x0E
+PACKET_PMTU_ACK = 0x0F
+# multipath: sonde de chemin renvoyée à l'adresse d'où elle vient (RTT et pertes par chemin)
+PACKET_PATH_PING = 0x10
+PACKET_PATH_PONG = 0x11
+# serveur -> client: fragments manquants d'une frame, un bit par fragment
+PACKET_FRAGMENT_NACK_BITMAP = 0x12
+# bit de poids fort: fragment à en-tête compact (rquic_compact), flags dans les autres bits
+PACKET_COMPACT = 0x80
+
+# version d'en-tête annoncée par le serveur dans le HELLO_ACK
+HEADER_VERSION_FIXED = 1
+HEADER_VERSION_COMPACT = 2
+
+
+class FramePriority(IntEnum):
+    CRITICAL = 0  # 500ms
+    HIGH = 1      # 100ms
+    MEDIUM = 2    # 50ms
+    LOW = 3       # 20ms
+
+
+# Format historique, sans connection ID (un seul client par serveur)
+# [type][frame_id][size][priority] - frame entière dans un seul datagramme
+DATA_HEADER = struct.Struct('!BIIB')
+# [type][frame_id]
+ACK_HEADER = struct.Struct('!BI')
+
+# Format multi-sessions: connection ID juste après le type
+# [type][conn_id][frame_id][size][priority][stream_id][stream_seq][frame_type][ref_delta]
+# [frag_index][frag_count]
+# frame_id numérote la connexion (ACK, pertes), stream_seq les frames du flux;
+# frame_type (I/P/B) et ref_delta (frame_id - référence, 0 = aucune) décrivent le GOP
+FRAGMENT_HEADER = struct.Struct('!BIIIBHIBHHH')
+# [type][conn_id] - début commun des paquets du serveur
+CONN_HEADER = struct.Struct('!BI')
+# [type][conn_id][frame_id] - ACK et NACK de frame, demande de keyframe
+CONN_ACK_HEADER = struct.Struct('!BII')
+# [type][conn_id][frame_id][frag_index]
+FRAGMENT_NACK_HEADER = struct.Struct('!BIIH')
+# ACK cumulatif: [type][conn_id][largest_acked][ack_delay_us][range_count] + range_count x [gap][length]
+ACK_RANGES_HEADER = struct.Struct('!BIIIB')
+ACK_RANGE = struct.Struct('!HH')
+# NACK groupé: [type][conn_id][base_frame_id][count] + bitmap (bit i = frame base+i manquante)
+NACK_BITMAP_HEADER = struct.Struct('!BIIH')
+# NACK groupé de fragments: [type][conn_id][frame_id][base_index][count] + bitmap
+FRAGMENT_NACK_BITMAP_HEADER = struct.Struct('!BIIHH')
+# parité FEC: [type][conn_id][frame_id][size][priority][stream_id][stream_seq][frame_type][ref_delta]
+#             [parity_index][frag_count][parity_count][scheme] + symbole
+FEC_HEADER = struct.Struct('!BIIIBHIBHHHHB')
+# poignée de main: [type][conn_id][token_len] + jeton, puis éventuellement un paquet collé (0-RTT)
+HELLO_HEADER = struct.Struct('!BIB')
+# [type][conn_id][status][token_len] + nouveau jeton de reprise + [header_version]
+# (octet absent chez les anciens serveurs: format fixe)
+HELLO_ACK_HEADER = struct.Struct('!BIBB')
+# sonde PMTU et son acquittement: [type][conn_id][probe_id][probe_size]
+PMTU_PROBE_HEADER = struct.Struct('!BIIH')
+# sonde de chemin et sa réponse: [type][conn_id][path_id][seq]
+PATH_PING_HEADER = struct.Struct('!BIBI')
+
+# Les paquets au format historique sont rattachés à cette connexion
+LEGACY_CONN_ID = 0
+
+# Taille max d'un datagramme rQUIC (en-tête inclus), sous le MTU Ethernet
+# (1500 - IP 20 - UDP 8) avec de la marge pour les tunnels/VPN
+DEFAULT_DATAGRAM_SIZE = 1400
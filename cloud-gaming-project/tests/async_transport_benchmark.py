@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+ASYNC TRANSPORT BENCHMARK - blocking vs asyncio rQUIC
+=====================================================
+Loopback comparison (no Mininet needed), servers in a separate process:
+
+blocking: rQUICServer + rQUICClient (ACKs polled between pacing sleeps)
+asyncio:  rQUICAsyncServer + rQUICAsyncClient (ACKs handled on arrival)
+sessions: N asyncio clients sharing a single event loop
+"""
+
+import sys
+import json
+import time
+import asyncio
+import multiprocessing
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from rquic_protocol import rQUICServer, rQUICClient
+from rquic_async import rQUICAsyncServer, rQUICAsyncClient
+
+BASE_PORT = 5700
+DURATION = 5
+SESSION_COUNTS = [1, 4, 8]
+
+
+def blocking_server(port):
+    rQUICServer("127.0.0.1", port).start(DURATION)
+
+
+def async_servers(ports):
+    async def main():
+        await asyncio.gather(*(rQUICAsyncServer("127.0.0.1", p).serve(DURATION) for p in ports))
+    asyncio.run(main())
+
+
+def run_blocking(port):
+    server = multiprocessing.Process(target=blocking_server, args=(port,), daemon=True)
+    server.start()
+    time.sleep(0.5)
+
+    results = rQUICClient("127.0.0.1", port).run(DURATION)
+    server.terminate()
+    server.join()
+    return results
+
+
+def run_async_sessions(num_sessions, base_port):
+    ports = [base_port + i for i in range(num_sessions)]
+    server = multiprocessing.Process(target=async_servers, args=(ports,), daemon=True)
+    server.start()
+    time.sleep(0.5)
+
+    async def clients():
+        return await asyncio.gather(*(rQUICAsyncClient("127.0.0.1", p).run(DURATION) for p in ports))
+
+    cpu_start = time.process_time()
+    results = asyncio.run(clients())
+    cpu = time.process_time() - cpu_start
+
+    server.terminate()
+    server.join()
+    return results, cpu
+
+
+def summarize(results):
+    return {
+        "frames_sent": sum(r["frames_sent"] for r in results),
+        "avg_rtt_ms": round(sum(r["avg_rtt_ms"] for r in results) / len(results), 3),
+        "delivery_rate": round(sum(r["delivery_rate"] for r in results) / len(results), 2),
+    }
+
+
+def main():
+    print("=" * 60)
+    print("ASYNC TRANSPORT BENCHMARK - blocking vs asyncio")
+    print("=" * 60)
+
+    all_results = {}
+
+    print("\n--- blocking (1 session) ---")
+    all_results["blocking"] = summarize([run_blocking(BASE_PORT)])
+
+    for n in SESSION_COUNTS:
+        print(f"\n--- asyncio ({n} session(s), 1 boucle) ---")
+        results, cpu = run_async_sessions(n, BASE_PORT + 100 * n)
+        summary = summarize(results)
+        summary["sessions"] = n
+        summary["client_cpu_percent"] = round(cpu / DURATION * 100, 1)
+        all_results[f"asyncio_{n}"] = summary
+
+    print("\n" + "=" * 60)
+    for name, r in all_results.items():
+        print(f"  {name:12s} frames={r['frames_sent']:6d}  RTT={r['avg_rtt_ms']:7.3f}ms  "
+              f"livraison={r['delivery_rate']:.1f}%")
+
+    with open("ASYNC_TRANSPORT_RESULTS.json", "w") as f:
+        json.dump(all_results, f, indent=2)
+
+    print("RESULTS SAVED: ASYNC_TRANSPORT_RESULTS.json")
+
+
+if __name__ == "__main__":
+    main()
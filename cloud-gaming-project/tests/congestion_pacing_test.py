@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+CONGESTION & PACING TEST - burst vs NewReno vs BBR-like (rQUIC)
+===============================================================
+Rate-limited bottleneck (TCLink bw + small queue), no random loss: every
+loss comes from the queue overflowing.
+
+none:    one burst per frame interval (previous behaviour)
+newreno: loss-based window + token-bucket pacer
+bbr:     bottleneck bandwidth x min RTT + token-bucket pacer
+
+Queueing delay = RTT - min RTT (average and p95).
+Loss = fragments retransmitted / fragments sent.
+"""
+
+import sys
+import json
+import time
+from pathlib import Path
+
+# Force matplotlib to use non-interactive backend
+import matplotlib
+matplotlib.use('Agg')
+
+from mininet.net import Mininet
+from mininet.node import OVSSwitch
+from mininet.link import TCLink
+from mininet.log import setLogLevel
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+SERVER_PORT = 5566
+DURATION = 10
+MODES = ["none", "newreno", "bbr"]
+
+# le flux vidéo moyen fait ~21 Mbit/s: au-dessus du goulot, puis juste au-dessus
+SCENARIOS = [
+    {"name": "20 Mbit/s", "bw": 20, "delay": 10, "queue": 50},
+    {"name": "30 Mbit/s", "bw": 30, "delay": 10, "queue": 50},
+]
+
+
+def create_network(bw_mbps, delay_ms, queue_packets):
+    """Create Mininet network with a bottleneck on h1's uplink"""
+    net = Mininet(switch=OVSSwitch, link=TCLink)
+    h1 = net.addHost('h1')
+    h2 = net.addHost('h2')
+    s1 = net.addSwitch('s1', failMode='standalone')
+    net.addLink(h1, s1, bw=bw_mbps, delay=f'{delay_ms}ms', max_queue_size=queue_packets)
+    net.addLink(h2, s1, delay=f'{delay_ms}ms')
+    net.start()
+    return net
+
+
+def run_pacing_test(net, mode):
+    h1, h2 = net.get('h1'), net.get('h2')
+
+    h2.cmd("rm -f /tmp/_pacing_server.json /tmp/_pacing_client.json")
+    h2.cmd(f"cd {PROJECT_DIR} && python3 src/rquic_protocol.py server --port {SERVER_PORT} "
+           f"--duration {DURATION} --output /tmp/_pacing_server.json > /dev/null 2>&1 &")
+    time.sleep(1)
+    h1.cmd(f"cd {PROJECT_DIR} && python3 src/rquic_protocol.py client --host {h2.IP()} "
+           f"--port {SERVER_PORT} --duration {DURATION} --cc {mode} "
+           f"--output /tmp/_pacing_client.json > /dev/null 2>&1")
+    time.sleep(DURATION // 2)
+    h2.cmd("pkill -f 'rquic_protocol.py server'")
+
+    try:
+        with open("/tmp/_pacing_client.json") as f:
+            client = json.load(f)
+        with open("/tmp/_pacing_server.json") as f:
+            server = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    fragments_sent = client["fragments_sent"] or 1
+    return {
+        "queueing_delay_ms": round(max(client["avg_rtt_ms"] - client["min_rtt_ms"], 0), 2),
+        "p95_queueing_delay_ms": round(max(client["p95_rtt_ms"] - client["min_rtt_ms"], 0), 2),
+        "min_rtt_ms": round(client["min_rtt_ms"], 2),
+        "loss_rate": round(client["fragment_retransmissions"] / fragments_sent * 100, 2),
+        "retransmissions": client["retransmissions"],
+        "delivery_rate": round(client["delivery_rate"], 2),
+        "frames_dropped_ttl": client["frames_dropped_ttl"],
+        "throughput_mbps": round(server["throughput_mbps"], 2),
+    }
+
+
+def main():
+    setLogLevel('warning')
+
+    print("=" * 60)
+    print("CONGESTION & PACING TEST - rQUIC on a rate-limited link")
+    print("=" * 60)
+
+    all_results = []
+
+    for scenario in SCENARIOS:
+        print(f"\n--- {scenario['name']} (delay={scenario['delay']}ms, "
+              f"queue={scenario['queue']} paquets) ---")
+        result = {"scenario": scenario["name"], "bw_mbps": scenario["bw"]}
+
+        for mode in MODES:
+            net = create_network(scenario["bw"], scenario["delay"], scenario["queue"])
+            stats = run_pacing_test(net, mode)
+            net.stop()
+
+            result[mode] = stats or {}
+            if stats:
+                print(f"  {mode:8s} file={stats['queueing_delay_ms']:6.1f}ms "
+                      f"(p95 {stats['p95_queueing_delay_ms']:6.1f}ms)  "
+                      f"perte={stats['loss_rate']:5.1f}%  "
+                      f"livraison={stats['delivery_rate']:.1f}%  "
+                      f"TTL={stats['frames_dropped_ttl']}")
+            else:
+                print(f"  {mode:8s} pas de résultats")
+            time.sleep(2)
+
+        all_results.append(result)
+
+    with open("CONGESTION_PACING_RESULTS.json", "w") as f:
+        json.dump(all_results, f, indent=2)
+
+    print("\n" + "=" * 60)
+    print("RESULTS SAVED: CONGESTION_PACING_RESULTS.json")
+    print("=" * 60)
+
+    generate_graph(all_results)
+
+
+def generate_graph(results):
+    import matplotlib.pyplot as plt
+    import numpy as np
+
+    plt.switch_backend('Agg')
+
+    scenarios = [r["scenario"] for r in results]
+    x = np.arange(len(scenarios))
+    width = 0.25
+    colors = {"none": '#e74c3c', "newreno": '#3498db', "bbr": '#2ecc71'}
+
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+
+    for i, mode in enumerate(MODES):
+        offset = (i - 1) * width
+        ax1.bar(x + offset, [r[mode].get("p95_queueing_delay_ms", 0) for r in results],
+                width, label=mode, color=colors[mode])
+        ax2.bar(x + offset, [r[mode].get("loss_rate", 0) for r in results],
+                width, label=mode, color=colors[mode])
+
+    ax1.set_ylabel('p95 queueing delay (ms)', fontsize=12)
+    ax1.set_title('Queueing delay (RTT - min RTT)', fontsize=14)
+    ax2.set_ylabel('Retransmitted fragments (%)', fontsize=12)
+    ax2.set_title('Loss at the bottleneck', fontsize=14)
+    for ax in (ax1, ax2):
+        ax.set_xticks(x)
+        ax.set_xticklabels(scenarios)
+        ax.legend()
+        ax.grid(axis='y', alpha=0.3)
+
+    plt.tight_layout()
+    plt.savefig('CONGESTION_PACING_RESULTS.png', dpi=150, bbox_inches='tight')
+    plt.close('all')
+
+    print("Graph saved: CONGESTION_PACING_RESULTS.png")
+
+
+if __name__ == "__main__":
+    main()
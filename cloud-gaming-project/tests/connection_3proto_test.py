@@ -3,6 +3,8 @@
 CONNECTION TIME TEST - TCP+TLS vs QUIC vs rQUIC
 ================================================
 Compares connection establishment time across protocols.
+rQUIC also reports first-frame latency (connect -> ACK of the first frame)
+for cold connections (HELLO, 1 RTT) versus 0-RTT resumption tokens.
 """
 
 import sys
@@ -14,6 +16,7 @@ import ssl
 import struct
 import asyncio
 import subprocess
+from pathlib import Path
 
 # Force matplotlib to use non-interactive backend
 import matplotlib
@@ -24,7 +27,9 @@ from mininet.node import OVSSwitch
 from mininet.link import TCLink
 from mininet.log import setLogLevel
 
+PROJECT_DIR = Path(__file__).resolve().parent.parent
 NUM_CONNECTIONS = 5
+RESUME_PORT = 5559
 
 # =============================================================================
 # TCP+TLS
@@ -245,6 +250,56 @@ for i in range(5):
 print("rQUIC Client done", flush=True)
 '''
 
+# =============================================================================
+# rQUIC first frame: cold handshake vs 0-RTT resumption (library client)
+# =============================================================================
+RQUIC_RESUME_CLIENT_CODE = '''
+import sys
+import json
+import time
+
+SERVER = sys.argv[1]
+sys.path.insert(0, sys.argv[2])
+from rquic_protocol import rQUICClient
+from rquic_handshake import TokenCache
+
+NUM_CONNECTIONS = 5
+FIRST_FRAME_SIZE = 20000
+
+# poignée de main + première frame: ms jusqu'à son ACK
+def first_frame(tokens):
+    client = rQUICClient(SERVER, 5559, tokens=tokens)
+    start = time.monotonic()
+    try:
+        client.connect(timeout=5)
+    except TimeoutError:
+        return None
+    client.send_frame(0, size=FIRST_FRAME_SIZE)
+    while 0 not in client.acked_frames and time.monotonic() - start < 5:
+        client.process_acks()
+        client.check_timeouts()
+        client.flush_send_queue(time.monotonic())
+    client.sock.close()
+    return (time.monotonic() - start) * 1000 if 0 in client.acked_frames else None
+
+results = {"cold": [], "resumed": []}
+for i in range(NUM_CONNECTIONS):
+    # nouveau joueur (cache vide), puis reconnexion avec le jeton reçu
+    tokens = TokenCache()
+    for mode in ("cold", "resumed"):
+        elapsed = first_frame(tokens)
+        if elapsed is not None:
+            results[mode].append(elapsed)
+            print(f"  Connection {i+1} {mode}: {elapsed:.2f}ms", flush=True)
+        time.sleep(0.5)
+
+for mode in ("cold", "resumed"):
+    times = results[mode]
+    results[mode + "_avg"] = sum(times) / len(times) if times else 0
+with open("_rquic_resume.json", "w") as f:
+    json.dump(results, f)
+'''
+
 
 def run_tcp_test(net):
     h1, h2 = net.get('h1'), net.get('h2')
@@ -297,6 +352,23 @@ def run_rquic_test(net):
         return None
 
 
+def run_rquic_resume_test(net):
+    h1, h2 = net.get('h1'), net.get('h2')
+    h1.cmd(f"cat > /tmp/rquic_resume_client.py << 'ENDSCRIPT'\n{RQUIC_RESUME_CLIENT_CODE}\nENDSCRIPT")
+    h1.cmd("rm -f _rquic_resume.json")
+    h2.cmd(f"cd {PROJECT_DIR} && python3 src/rquic_protocol.py server --port {RESUME_PORT} "
+           f"--duration 20 --require-handshake --output /tmp/_resume_server.json > /dev/null 2>&1 &")
+    time.sleep(2)
+    h1.cmd(f"python3 /tmp/rquic_resume_client.py {h2.IP()} {PROJECT_DIR / 'src'}")
+    h2.cmd("pkill -f 'rquic_protocol.py server'")
+    time.sleep(1)
+    try:
+        with open("_rquic_resume.json", "r") as f:
+            return json.load(f)
+    except:
+        return None
+
+
 def create_network(delay_ms):
     net = Mininet(switch=OVSSwitch, link=TCLink)
     h1 = net.addHost('h1')
@@ -354,6 +426,20 @@ def main():
             result["rquic"] = round(rquic["avg"], 2)
             result["rquic_ratio"] = round(rquic["avg"] / rtt, 2)
             print(f"    {result['rquic']}ms ({result['rquic_ratio']}x RTT)")
+        time.sleep(2)
+        
+        # rQUIC première frame: à froid vs reprise 0-RTT
+        print("  rQUIC first frame (cold vs 0-RTT)...")
+        net = create_network(delay)
+        resume = run_rquic_resume_test(net)
+        net.stop()
+        if resume:
+            result["rquic_cold_first_frame"] = round(resume["cold_avg"], 2)
+            result["rquic_resumed_first_frame"] = round(resume["resumed_avg"], 2)
+            print(f"    cold {result['rquic_cold_first_frame']}ms "
+                  f"({resume['cold_avg'] / rtt:.2f}x RTT), "
+                  f"0-RTT {result['rquic_resumed_first_frame']}ms "
+                  f"({resume['resumed_avg'] / rtt:.2f}x RTT)")
         
         all_results.append(result)
         time.sleep(2)
@@ -390,7 +476,7 @@ def generate_graph(results):
     quic_ratio = [r.get("quic_ratio", 0) for r in results]
     rquic_ratio = [r.get("rquic_ratio", 0) for r in results]
     
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+    fig, (ax1, ax2, ax3) = plt.subplots(1, 3, figsize=(20, 6))
     
     # Graph 1: Absolute times
     ax1.plot(rtts, tcp, 'o-', label='TCP+TLS', color='#e74c3c', linewidth=2, markersize=10)
@@ -427,6 +513,20 @@ def generate_graph(results):
     ax2.legend(fontsize=9, loc='upper right')
     ax2.grid(axis='y', alpha=0.3)
     
+    # Graph 3: rQUIC first-frame latency, cold vs resumed
+    cold = [r.get("rquic_cold_first_frame", 0) for r in results]
+    resumed = [r.get("rquic_resumed_first_frame", 0) for r in results]
+    width = 0.35
+    ax3.bar(x - width / 2, cold, width, label='rQUIC cold (HELLO)', color='#95a5a6', alpha=0.8)
+    ax3.bar(x + width / 2, resumed, width, label='rQUIC 0-RTT resumed', color='#2ecc71', alpha=0.8)
+    ax3.set_xlabel('Network RTT (ms)', fontsize=12)
+    ax3.set_ylabel('Connect -> first frame ACK (ms)', fontsize=12)
+    ax3.set_title('rQUIC First-Frame Latency\nCold vs Resumed', fontsize=14)
+    ax3.set_xticks(x)
+    ax3.set_xticklabels([f'{r}ms' for r in rtts])
+    ax3.legend(fontsize=9)
+    ax3.grid(axis='y', alpha=0.3)
+    
     plt.tight_layout()
     plt.savefig('CONNECTION_3PROTO_RESULTS.png', dpi=150, bbox_inches='tight')
     plt.close('all')
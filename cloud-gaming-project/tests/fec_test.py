@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+FEC TEST - NACK-only vs XOR parity vs Reed-Solomon (rQUIC)
+==========================================================
+100 ms RTT (25 ms per link, both ways) with random loss: a retransmission
+costs at least one RTT, already more than the MEDIUM (50 ms) and LOW
+(20 ms) TTLs.
+
+none: every loss recovered by NACK / retransmission (previous behaviour)
+xor:  one XOR parity per group of fragments
+rs:   Reed-Solomon parity, any parity_count losses per frame
+
+Recovery latency = time from the first loss seen by the server to the frame
+being rebuilt. Overhead = parity bytes / data bytes sent.
+"""
+
+import sys
+import json
+import time
+from pathlib import Path
+
+# Force matplotlib to use non-interactive backend
+import matplotlib
+matplotlib.use('Agg')
+
+from mininet.net import Mininet
+from mininet.node import OVSSwitch
+from mininet.link import TCLink
+from mininet.log import setLogLevel
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+SERVER_PORT = 5567
+DURATION = 10
+MODES = ["none", "xor", "rs"]
+
+SCENARIOS = [
+    {"name": "2% Loss", "loss": 2, "delay": 25},
+    {"name": "5% Loss", "loss": 5, "delay": 25},
+    {"name": "10% Loss", "loss": 10, "delay": 25},
+]
+
+
+def create_network(loss_percent, delay_ms):
+    """Create Mininet network"""
+    net = Mininet(switch=OVSSwitch, link=TCLink)
+    h1 = net.addHost('h1')
+    h2 = net.addHost('h2')
+    s1 = net.addSwitch('s1', failMode='standalone')
+    net.addLink(h1, s1, loss=loss_percent, delay=f'{delay_ms}ms')
+    net.addLink(h2, s1, loss=loss_percent, delay=f'{delay_ms}ms')
+    net.start()
+    return net
+
+
+def run_fec_test(net, mode):
+    h1, h2 = net.get('h1'), net.get('h2')
+
+    h2.cmd("rm -f /tmp/_fec_server.json /tmp/_fec_client.json")
+    h2.cmd(f"cd {PROJECT_DIR} && python3 src/rquic_protocol.py server --port {SERVER_PORT} "
+           f"--duration {DURATION} --output /tmp/_fec_server.json > /dev/null 2>&1 &")
+    time.sleep(1)
+    h1.cmd(f"cd {PROJECT_DIR} && python3 src/rquic_protocol.py client --host {h2.IP()} "
+           f"--port {SERVER_PORT} --duration {DURATION} --fec {mode} "
+           f"--output /tmp/_fec_client.json > /dev/null 2>&1")
+    time.sleep(DURATION // 2)
+    h2.cmd("pkill -f 'rquic_protocol.py server'")
+
+    try:
+        with open("/tmp/_fec_client.json") as f:
+            client = json.load(f)
+        with open("/tmp/_fec_server.json") as f:
+            server = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    return {
+        "delivery_rate": round(client["delivery_rate"], 2),
+        "frames_dropped_ttl": client["frames_dropped_ttl"],
+        "retransmissions": client["retransmissions"] + client["fragment_retransmissions"],
+        "fec_overhead_percent": round(client["fec_overhead_percent"], 2),
+        "fec_recovered_frames": server["fec_recovered_frames"],
+        "avg_fec_recovery_ms": round(server["avg_fec_recovery_ms"], 2),
+        "avg_retransmit_recovery_ms": round(server["avg_retransmit_recovery_ms"], 2),
+    }
+
+
+def main():
+    setLogLevel('warning')
+
+    print("=" * 60)
+    print("FEC TEST - NACK vs XOR vs Reed-Solomon (rQUIC, 100ms RTT)")
+    print("=" * 60)
+
+    all_results = []
+
+    for scenario in SCENARIOS:
+        print(f"\n--- {scenario['name']} (loss={scenario['loss']}%, delay={scenario['delay']}ms) ---")
+        result = {"scenario": scenario["name"], "loss": scenario["loss"]}
+
+        for mode in MODES:
+            net = create_network(scenario["loss"], scenario["delay"])
+            stats = run_fec_test(net, mode)
+            net.stop()
+
+            result[mode] = stats or {}
+            if stats:
+                print(f"  {mode:5s} livraison={stats['delivery_rate']:5.1f}%  "
+                      f"TTL={stats['frames_dropped_ttl']:4d}  "
+                      f"réparation FEC={stats['avg_fec_recovery_ms']:6.1f}ms  "
+                      f"retrans={stats['avg_retransmit_recovery_ms']:6.1f}ms  "
+                      f"surcoût={stats['fec_overhead_percent']:.1f}%")
+            else:
+                print(f"  {mode:5s} pas de résultats")
+            time.sleep(2)
+
+        all_results.append(result)
+
+    with open("FEC_RESULTS.json", "w") as f:
+        json.dump(all_results, f, indent=2)
+
+    print("\n" + "=" * 60)
+    print("RESULTS SAVED: FEC_RESULTS.json")
+    print("=" * 60)
+
+    generate_graph(all_results)
+
+
+def generate_graph(results):
+    import matplotlib.pyplot as plt
+    import numpy as np
+
+    plt.switch_backend('Agg')
+
+    scenarios = [r["scenario"] for r in results]
+    x = np.arange(len(scenarios))
+    width = 0.25
+    colors = {"none": '#e74c3c', "xor": '#3498db', "rs": '#2ecc71'}
+
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+
+    for i, mode in enumerate(MODES):
+        offset = (i - 1) * width
+        ax1.bar(x + offset, [r[mode].get("delivery_rate", 0) for r in results],
+                width, label=mode, color=colors[mode])
+        ax2.bar(x + offset, [r[mode].get("fec_overhead_percent", 0) for r in results],
+                width, label=mode, color=colors[mode])
+
+    ax1.set_ylabel('Frames delivered before TTL (%)', fontsize=12)
+    ax1.set_title('Delivery rate at 100ms RTT', fontsize=14)
+    ax2.set_ylabel('Parity bytes / data bytes (%)', fontsize=12)
+    ax2.set_title('FEC bandwidth overhead', fontsize=14)
+    for ax in (ax1, ax2):
+        ax.set_xticks(x)
+        ax.set_xticklabels(scenarios)
+        ax.legend()
+        ax.grid(axis='y', alpha=0.3)
+
+    plt.tight_layout()
+    plt.savefig('FEC_RESULTS.png', dpi=150, bbox_inches='tight')
+    plt.close('all')
+
+    print("Graph saved: FEC_RESULTS.png")
+
+
+if __name__ == "__main__":
+    main()
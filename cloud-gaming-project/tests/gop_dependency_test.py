@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+GOP DEPENDENCY TEST - cancelling the dependants of a lost reference frame
+=========================================================================
+60 fps rQUIC video (synthetic I/P GOP) at 60 ms RTT with random loss.
+Every fragment carries its frame type and the ID of its reference frame.
+
+off: a P-frame whose reference expired (TTL, too many retransmissions) is
+     still sent and retransmitted, the server cannot decode it
+gop: its dependants are cancelled at once, queued or in flight, and the
+     source restarts from an I-frame (keyframe request)
+
+Reported: bytes the client did not send, wire bytes, and frames the server
+received but could not decode (reference never received).
+"""
+
+import sys
+import json
+import time
+from pathlib import Path
+
+# Force matplotlib to use non-interactive backend
+import matplotlib
+matplotlib.use('Agg')
+
+from mininet.net import Mininet
+from mininet.node import OVSSwitch
+from mininet.link import TCLink
+from mininet.log import setLogLevel
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+SERVER_PORT = 5573
+DURATION = 10
+MODES = ["off", "gop"]
+
+SCENARIOS = [
+    {"name": "2% Loss", "loss": 2, "delay": 15},
+    {"name": "5% Loss", "loss": 5, "delay": 15},
+    {"name": "10% Loss", "loss": 10, "delay": 15},
+]
+
+
+def create_network(loss_percent, delay_ms):
+    """Create Mininet network"""
+    net = Mininet(switch=OVSSwitch, link=TCLink)
+    h1 = net.addHost('h1')
+    h2 = net.addHost('h2')
+    s1 = net.addSwitch('s1', failMode='standalone')
+    net.addLink(h1, s1, loss=loss_percent, delay=f'{delay_ms}ms')
+    net.addLink(h2, s1, loss=loss_percent, delay=f'{delay_ms}ms')
+    net.start()
+    return net
+
+
+def run_gop_test(net, mode):
+    h1, h2 = net.get('h1'), net.get('h2')
+
+    h2.cmd("rm -f /tmp/_gop_server.json /tmp/_gop_client.json")
+    h2.cmd(f"cd {PROJECT_DIR} && python3 src/rquic_protocol.py server --port {SERVER_PORT} "
+           f"--duration {DURATION} --output /tmp/_gop_server.json > /dev/null 2>&1 &")
+    time.sleep(1)
+    flag = "--no-gop" if mode == "off" else ""
+    h1.cmd(f"cd {PROJECT_DIR} && python3 src/rquic_protocol.py client --host {h2.IP()} "
+           f"--port {SERVER_PORT} --duration {DURATION} {flag} "
+           f"--output /tmp/_gop_client.json > /dev/null 2>&1")
+    time.sleep(DURATION // 2)
+    h2.cmd("pkill -f 'rquic_protocol.py server'")
+
+    try:
+        with open("/tmp/_gop_client.json") as f:
+            client = json.load(f)
+        with open("/tmp/_gop_server.json") as f:
+            server = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    received = server["frames_decodable"] + server["frames_undecodable"]
+    return {
+        "delivery_rate": round(client["delivery_rate"], 2),
+        "frames_dropped_ttl": client["frames_dropped_ttl"],
+        "frames_cancelled_gop": client["frames_cancelled_gop"],
+        "bytes_saved_gop": client["bytes_saved_gop"],
+        "keyframe_requests": client["keyframe_requests"],
+        "i_frames_sent": client["i_frames_sent"],
+        "wire_bytes": client["total_bytes"],
+        "frames_decodable": server["frames_decodable"],
+        "frames_undecodable": server["frames_undecodable"],
+        "bytes_undecodable": server["bytes_undecodable"],
+        "undecodable_percent": round(server["frames_undecodable"] / received * 100, 2) if received else 0,
+        "keyframe_requests_sent": server["keyframe_requests_sent"],
+    }
+
+
+def main():
+    setLogLevel('warning')
+
+    print("=" * 60)
+    print("GOP DEPENDENCY TEST - dependants of lost references (rQUIC)")
+    print("=" * 60)
+
+    all_results = []
+
+    for scenario in SCENARIOS:
+        print(f"\n--- {scenario['name']} (loss={scenario['loss']}%, delay={scenario['delay']}ms) ---")
+        result = {"scenario": scenario["name"], "loss": scenario["loss"]}
+
+        for mode in MODES:
+            net = create_network(scenario["loss"], scenario["delay"])
+            stats = run_gop_test(net, mode)
+            net.stop()
+
+            result[mode] = stats or {}
+            if stats:
+                print(f"  {mode:4s} livraison={stats['delivery_rate']:5.1f}%  "
+                      f"annulées={stats['frames_cancelled_gop']:4d}  "
+                      f"économisés={stats['bytes_saved_gop'] / 1e6:6.2f}Mo  "
+                      f"envoyés={stats['wire_bytes'] / 1e6:6.2f}Mo  "
+                      f"indécodables={stats['frames_undecodable']:4d} "
+                      f"({stats['bytes_undecodable'] / 1e6:.2f}Mo)")
+            else:
+                print(f"  {mode:4s} pas de résultats")
+            time.sleep(2)
+
+        all_results.append(result)
+
+    with open("GOP_DEPENDENCY_RESULTS.json", "w") as f:
+        json.dump(all_results, f, indent=2)
+
+    print("\n" + "=" * 60)
+    print("RESULTS SAVED: GOP_DEPENDENCY_RESULTS.json")
+    print("=" * 60)
+
+    generate_graph(all_results)
+
+
+def generate_graph(results):
+    import matplotlib.pyplot as plt
+    import numpy as np
+
+    plt.switch_backend('Agg')
+
+    scenarios = [r["scenario"] for r in results]
+    x = np.arange(len(scenarios))
+    width = 0.35
+    colors = {"off": '#e74c3c', "gop": '#2ecc71'}
+
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+
+    for i, mode in enumerate(MODES):
+        offset = (i - 0.5) * width
+        ax1.bar(x + offset, [r[mode].get("bytes_undecodable", 0) / 1e6 for r in results],
+                width, label=mode, color=colors[mode])
+        ax2.bar(x + offset, [r[mode].get("wire_bytes", 0) / 1e6 for r in results],
+                width, label=mode, color=colors[mode])
+    ax2.bar(x + width / 2, [r["gop"].get("bytes_saved_gop", 0) / 1e6 for r in results], width,
+            bottom=[r["gop"].get("wire_bytes", 0) / 1e6 for r in results],
+            label='saved (gop)', color='#2ecc71', alpha=0.35)
+
+    ax1.set_ylabel('Received but undecodable (MB)', fontsize=12)
+    ax1.set_title('Frames whose reference never arrived', fontsize=14)
+    ax2.set_ylabel('Client wire bytes (MB)', fontsize=12)
+    ax2.set_title('Bandwidth spent vs saved by cancellation', fontsize=14)
+    for ax in (ax1, ax2):
+        ax.set_xticks(x)
+        ax.set_xticklabels(scenarios)
+        ax.legend()
+        ax.grid(axis='y', alpha=0.3)
+
+    plt.tight_layout()
+    plt.savefig('GOP_DEPENDENCY_RESULTS.png', dpi=150, bbox_inches='tight')
+    plt.close('all')
+
+    print("Graph saved: GOP_DEPENDENCY_RESULTS.png")
+
+
+if __name__ == "__main__":
+    main()
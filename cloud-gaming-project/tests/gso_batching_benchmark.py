@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+GSO BATCHING BENCHMARK - syscalls per frame, legacy vs UDP GSO/GRO
+==================================================================
+60 KB frames (43 datagrams of 1400 B) from rQUICConnection to a server on
+loopback (bind/poll thread).
+
+legacy: one sendmsg per datagram, one recvfrom per datagram
+gso:    the datagrams of one flush_send_queue pass leave in one sendmsg
+        (UDP_SEGMENT), the server reads with UDP_GRO + recvmsg_into
+
+burst: no congestion control, up to WINDOW frames in flight, as fast as
+       the CPU allows -> max frames/sec
+paced: 60 fps with BBR pacing (default config) -> syscalls per frame in
+       normal use; each pacer wakeup releases one GSO batch, capped at
+       pacing_batch_time (4 ms) of pacing rate
+
+Reported: send/recv syscalls per frame, frames/sec, delivery.
+"""
+
+import sys
+import json
+import time
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from rquic_protocol import rQUICServer
+from rquic_connection import rQUICConnection
+from rquic_wire import FramePriority
+
+SERVER_PORT = 5578
+DURATION = 3
+FRAME_SIZE = 60000
+WINDOW = 4
+FPS = 60
+VIDEO_STREAM = 1
+MODES = ["legacy", "gso"]
+SCENARIOS = [
+    {"name": "burst", "congestion": "none"},
+    {"name": "paced", "congestion": "bbr"},
+]
+
+
+def serve(server):
+    while server.running:
+        server.poll(0.1)
+
+
+def run_mode(scenario, mode, port):
+    server = rQUICServer('127.0.0.1', port)
+    if mode == "legacy":
+        server.receiver.disable()
+    server.bind()
+    thread = threading.Thread(target=serve, args=(server,), daemon=True)
+    thread.start()
+
+    conn = rQUICConnection('127.0.0.1', port, congestion=scenario["congestion"])
+    if mode == "legacy":
+        conn.packetizer.gso = None
+    conn.connect()
+    conn.open_stream(VIDEO_STREAM, FramePriority.MEDIUM, name='VIDEO')
+    payload = memoryview(bytearray(FRAME_SIZE))
+    delivered = [0]
+    conn.on_delivered = lambda frame_id, stream_id, latency_ms: delivered.__setitem__(0, delivered[0] + 1)
+
+    frames = 0
+    start = time.monotonic()
+    end = start + DURATION
+    next_frame = start
+    while time.monotonic() < end:
+        if scenario["name"] == "burst":
+            if len(conn.pending_acks) < WINDOW:
+                conn.send(VIDEO_STREAM, payload)
+                frames += 1
+            conn.poll(0.001 if len(conn.pending_acks) >= WINDOW else 0.0)
+        else:
+            conn.send(VIDEO_STREAM, payload)
+            frames += 1
+            next_frame += 1.0 / FPS
+            now = time.monotonic()
+            while now < next_frame:
+                conn.poll(next_frame - now)
+                now = time.monotonic()
+    elapsed = time.monotonic() - start
+
+    results = conn.close(linger=0.5)
+    server.running = False
+    thread.join()
+    server_results = server.close()
+
+    return {
+        "mode": mode,
+        "gso": results["gso"],
+        "gro": server_results["gro"],
+        "frames_sent": frames,
+        "frames_delivered": delivered[0],
+        "frames_per_sec": round(delivered[0] / elapsed, 1),
+        "send_syscalls_per_frame": round(results["send_syscalls"] / frames, 2) if frames else 0,
+        "recv_syscalls_per_frame": (round(server_results["recv_syscalls"] / server_results["frames_received"], 2)
+                                    if server_results["frames_received"] else 0),
+        "server_cpu_percent": round(server_results["cpu_percent"], 1),
+        "delivery_rate": round(results["delivery_rate"], 2),
+    }
+
+
+def main():
+    print("=" * 60)
+    print("GSO BATCHING BENCHMARK - legacy vs UDP GSO/GRO on loopback")
+    print("=" * 60)
+
+    all_results = []
+    port = SERVER_PORT
+    for scenario in SCENARIOS:
+        print(f"\n--- {scenario['name']} (cc={scenario['congestion']}) ---")
+        result = {"scenario": scenario["name"]}
+        for mode in MODES:
+            stats = run_mode(scenario, mode, port)
+            port += 1
+            result[mode] = stats
+            print(f"  {mode:6s} gso={stats['gso']!s:5s} gro={stats['gro']!s:5s}  "
+                  f"sendmsg/frame={stats['send_syscalls_per_frame']:6.2f}  "
+                  f"recv/frame={stats['recv_syscalls_per_frame']:6.2f}  "
+                  f"frames/s={stats['frames_per_sec']:7.1f}  livraison={stats['delivery_rate']:.1f}%")
+        all_results.append(result)
+
+    with open("GSO_BATCHING_RESULTS.json", "w") as f:
+        json.dump(all_results, f, indent=2)
+
+    print("\n" + "=" * 60)
+    print("RESULTS SAVED: GSO_BATCHING_RESULTS.json")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ HOL BLOCKING TEST - Multi-Channel Version with rQUIC Priority System
 ====================================================================
 Tests with 4 priority channels: VIDEO, AUDIO, INPUT, CHAT
 Compares TCP, QUIC, and rQUIC with adaptive TTL per channel
+rQUIC carries the 4 channels as streams of a single connection (one socket)
 """
 
 import sys
@@ -13,6 +14,7 @@ import time
 import socket
 import asyncio
 import subprocess
+from pathlib import Path
 
 # Force matplotlib to use non-interactive backend
 import matplotlib
@@ -23,6 +25,7 @@ from mininet.node import OVSSwitch
 from mininet.link import TCLink
 from mininet.log import setLogLevel
 
+PROJECT_DIR = Path(__file__).resolve().parent.parent
 SERVER_PORT = 5560
 NUM_MESSAGES = 30  # Per channel
 CHANNELS = ["VIDEO", "AUDIO", "INPUT", "CHAT"]
@@ -246,83 +249,50 @@ asyncio.run(main())
 '''
 
 # =============================================================================
-# rQUIC SERVER - 4 channels with adaptive TTL priorities (SIMPLIFIÉ)
+# rQUIC SERVER - 4 streams over one connection, adaptive TTL priorities
 # =============================================================================
 RQUIC_SERVER_CODE = '''
-import socket
+import sys
 import json
 import time
-import struct
-import threading
 
-CHANNELS = ["VIDEO", "AUDIO", "INPUT", "CHAT"]
-NUM_PER_CHANNEL = 30
+sys.path.insert(0, sys.argv[1])
+from rquic_protocol import rQUICServer
 
-# Map channels to ports
-CHANNEL_PORTS = {"VIDEO": 5560, "AUDIO": 5561, "INPUT": 5562, "CHAT": 5563}
+CHANNELS = ["VIDEO", "AUDIO", "INPUT", "CHAT"]
+CHANNEL_STREAMS = {"VIDEO": 1, "AUDIO": 2, "INPUT": 3, "CHAT": 4}
+STREAM_CHANNELS = {stream: ch for ch, stream in CHANNEL_STREAMS.items()}
 
 results = {ch: {"received": [], "timestamps": [], "dropped_ttl": 0} for ch in CHANNELS}
 
-def run_channel_server(channel, port):
-    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-    sock.bind(("0.0.0.0", port))
-    sock.settimeout(1.0)
-    
-    received = set()
-    start = time.time()
-    no_data_count = 0
-    
-    print(f"[{channel}] Server ready on port {port}", flush=True)
-    
-    while (time.time() - start) < 30:
+
+class MultiChannelServer(rQUICServer):
+    """Un socket, une boucle: les canaux sont distingués par le stream ID"""
+
+    last_frame = 0.0
+
+    def on_frame_complete(self, session, frame_id, frame_data, stream_id=0, stream_seq=0):
+        super().on_frame_complete(session, frame_id, frame_data, stream_id, stream_seq)
+        self.last_frame = time.time()
+        channel = STREAM_CHANNELS.get(stream_id)
         try:
-            data, addr = sock.recvfrom(65535)
-            no_data_count = 0
-            
-            if len(data) < 10:
-                continue
-            
-            packet_type = data[0]
-            if packet_type == 0x01:  # DATA
-                frame_id, frame_size, priority = struct.unpack('!IIB', data[1:10])
-                
-                try:
-                    msg_data = data[10:10+frame_size].decode()
-                    parts = msg_data.split(":")
-                    if len(parts) >= 3:
-                        ch, seq, ts = parts[0], int(parts[1]), float(parts[2])
-                        if seq not in received:
-                            received.add(seq)
-                            results[channel]["received"].append(seq)
-                            results[channel]["timestamps"].append(time.time() - ts)
-                except:
-                    pass
-                
-                # Send ACK
-                ack = struct.pack('!BI', 0x02, frame_id)
-                sock.sendto(ack, addr)
-                
-        except socket.timeout:
-            no_data_count += 1
-            if no_data_count > 5:  # 5 secondes sans données
-                break
-            continue
-    
-    sock.close()
-    print(f"[{channel}] Done: received {len(received)}", flush=True)
+            ch, seq, ts = bytes(frame_data).decode().split(":")[:3]
+        except ValueError:
+            return
+        if channel is not None:
+            results[channel]["received"].append(int(seq))
+            results[channel]["timestamps"].append(time.time() - float(ts))
 
-threads = []
-for ch in CHANNELS:
-    t = threading.Thread(target=run_channel_server, args=(ch, CHANNEL_PORTS[ch]))
-    t.daemon = True
-    t.start()
-    threads.append(t)
+    def evict_idle_sessions(self, now):
+        super().evict_idle_sessions(now)
+        # 3 secondes sans données après le début: le client a fini
+        if self.last_frame and now - self.last_frame > 3:
+            self.running = False
 
-print("All servers started", flush=True)
 
-for t in threads:
-    t.join(timeout=35)
+server = MultiChannelServer("0.0.0.0", 5560)
+print("Server ready on port 5560 (1 socket, 4 streams)", flush=True)
+server.start(duration=30)
 
 # Calculate stats
 for ch in CHANNELS:
@@ -342,17 +312,20 @@ print(f"rQUIC: " + ", ".join([f"{ch}={results[ch]['count']}" for ch in CHANNELS]
 '''
 
 RQUIC_CLIENT_CODE = '''
-import time
-import struct
-import socket
 import sys
 import json
+import time
 
 SERVER_IP = sys.argv[1]
+sys.path.insert(0, sys.argv[2])
+from rquic_protocol import rQUICClient
+
 CHANNELS = ["VIDEO", "AUDIO", "INPUT", "CHAT"]
 NUM_MESSAGES = 30
 PADDING = "X" * 400
 
+CHANNEL_STREAMS = {"VIDEO": 1, "AUDIO": 2, "INPUT": 3, "CHAT": 4}
+
 # Map channels to priorities (numeric values) and their TTL
 # CRITICAL=0 (500ms), HIGH=1 (100ms), MEDIUM=2 (50ms), LOW=3 (20ms)
 CHANNEL_PRIORITIES = {
@@ -369,103 +342,49 @@ TTL_BY_PRIORITY = {
     3: 0.020   # LOW: 20ms
 }
 
-CHANNEL_PORTS = {"VIDEO": 5560, "AUDIO": 5561, "INPUT": 5562, "CHAT": 5563}
-
-# Track pending ACKs and drops per channel
-pending_acks = {ch: {} for ch in CHANNELS}
-dropped_by_ttl = {ch: 0 for ch in CHANNELS}
-
-# Create 4 sockets (one per channel)
-sockets = {}
+# Une seule connexion (un socket): un flux par canal, l'ordonnanceur arbitre entre eux
+client = rQUICClient(SERVER_IP, 5560)
 for ch in CHANNELS:
-    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-    sock.settimeout(0.001)
-    sockets[ch] = sock
+    priority = CHANNEL_PRIORITIES[ch]
+    client.open_stream(CHANNEL_STREAMS[ch], priority, TTL_BY_PRIORITY[priority], name=ch)
+
+def pump(until):
+    """ACK, retransmissions (abandon anticipé compris) et file d'envoi jusqu'à until"""
+    while time.monotonic() < until:
+        client.process_acks()
+        client.check_timeouts()
+        client.flush_send_queue(time.monotonic())
 
 print("rQUIC Client starting...", flush=True)
 time.sleep(2)
 
-# Send messages
-frame_id_by_ch = {ch: 0 for ch in CHANNELS}
-last_check_time = time.time()
-
+frame_id = 0
 for i in range(NUM_MESSAGES):
-    current_time = time.time()
-    
-    # Check TTL periodically (every 100ms) for frames awaiting retransmission
-    # Only drop frames that are BOTH old AND not ACKed (=lost frames)
-    if current_time - last_check_time > 0.1:  # Check every 100ms
-        for ch in CHANNELS:
-            priority = CHANNEL_PRIORITIES[ch]
-            ttl = TTL_BY_PRIORITY[priority]
-            
-            to_drop = []
-            for fid, send_time in pending_acks[ch].items():
-                frame_age = current_time - send_time
-                # Drop only if: frame is old (>TTL) AND waiting for retransmission (>50ms without ACK)
-                if frame_age > ttl and frame_age > 0.05:  # At least 50ms old = probably lost
-                    to_drop.append(fid)
-            
-            for fid in to_drop:
-                del pending_acks[ch][fid]
-                dropped_by_ttl[ch] += 1
-        
-        last_check_time = current_time
-    
-    # Send new messages
     for ch in CHANNELS:
         msg = f"{ch}:{i}:{time.time()}:{PADDING}"
-        data = msg.encode()
-        priority = CHANNEL_PRIORITIES[ch]
-        fid = frame_id_by_ch[ch]
-        
-        # Build rQUIC packet: [type][frame_id][size][priority][data]
-        packet = struct.pack('!BIIB', 0x01, fid, len(data), priority) + data
-        sockets[ch].sendto(packet, (SERVER_IP, CHANNEL_PORTS[ch]))
-        
-        pending_acks[ch][fid] = time.time()
-        frame_id_by_ch[ch] += 1
-    
-    # Try to receive ACKs
-    for ch in CHANNELS:
-        try:
-            data, addr = sockets[ch].recvfrom(1024)
-            if len(data) >= 5:
-                packet_type = data[0]
-                if packet_type == 0x02:  # ACK
-                    fid = struct.unpack('!I', data[1:5])[0]
-                    if fid in pending_acks[ch]:
-                        del pending_acks[ch][fid]
-        except:
-            pass
-    
-    time.sleep(0.02)
-
-time.sleep(2)
+        client.send_frame(frame_id, stream_id=CHANNEL_STREAMS[ch], data=msg.encode())
+        frame_id += 1
+    pump(time.monotonic() + 0.02)
 
-# Final ACK collection
-for _ in range(10):
-    for ch in CHANNELS:
-        try:
-            data, addr = sockets[ch].recvfrom(1024)
-            if len(data) >= 5:
-                packet_type = data[0]
-                if packet_type == 0x02:  # ACK
-                    fid = struct.unpack('!I', data[1:5])[0]
-                    if fid in pending_acks[ch]:
-                        del pending_acks[ch][fid]
-        except:
-            pass
-    time.sleep(0.1)
+pump(time.monotonic() + 2)
+client.sock.close()
 
-for sock in sockets.values():
-    sock.close()
+streams = client.get_results()["streams"]
+drops = {}
+for ch in CHANNELS:
+    stream = streams[CHANNEL_STREAMS[ch]]
+    drops[ch] = {"dropped_ttl": stream["frames_dropped_ttl"],
+                 "retransmissions": stream["retransmissions"],
+                 "dropped_predicted": stream["frames_dropped_predicted"],
+                 "bytes_saved": stream["bytes_saved_predicted"],
+                 "delivery_latency_ms": stream["avg_latency_ms"]}
 
 # Save drops to file
 with open("_rquic_client_drops.json", "w") as f:
-    json.dump(dropped_by_ttl, f)
+    json.dump(drops, f)
 
-print(f"rQUIC Client done - Dropped: {dropped_by_ttl}", flush=True)
+print(f"rQUIC Client done - Dropped: " + ", ".join(
+    f"{ch}={drops[ch]['dropped_ttl']}+{drops[ch]['dropped_predicted']}" for ch in CHANNELS), flush=True)
 '''
 
 
@@ -507,9 +426,9 @@ def run_rquic_test(net):
     h1, h2 = net.get('h1'), net.get('h2')
     h2.cmd(f"cat > /tmp/rquic_server.py << 'ENDSCRIPT'\n{RQUIC_SERVER_CODE}\nENDSCRIPT")
     h1.cmd(f"cat > /tmp/rquic_client.py << 'ENDSCRIPT'\n{RQUIC_CLIENT_CODE}\nENDSCRIPT")
-    h2.cmd("cd /home/fret/Bureau/exchange-NCKU/Network-project/cloud-gaming-project && python3 /tmp/rquic_server.py &")
+    h2.cmd(f"python3 /tmp/rquic_server.py {PROJECT_DIR / 'src'} &")
     time.sleep(2)
-    h1.cmd(f"cd /home/fret/Bureau/exchange-NCKU/Network-project/cloud-gaming-project && python3 /tmp/rquic_client.py {h2.IP()}")
+    h1.cmd(f"python3 /tmp/rquic_client.py {h2.IP()} {PROJECT_DIR / 'src'}")
     time.sleep(3)
     h2.cmd("pkill -f rquic_server.py")
     time.sleep(1)
@@ -521,7 +440,7 @@ def run_rquic_test(net):
             with open("_rquic_client_drops.json", "r") as f:
                 drops = json.load(f)
                 for ch in CHANNELS:
-                    results[ch]["dropped_ttl"] = drops.get(ch, 0)
+                    results[ch].update(drops.get(ch, {}))
         except:
             pass
         return results
@@ -592,9 +511,14 @@ def main():
         net.stop()
         
         if rquic:
-            result["rquic"] = {ch: {"jitter": round(rquic[ch]["jitter"], 2), "count": rquic[ch]["count"], "dropped": rquic[ch].get("dropped_ttl", 0)} for ch in CHANNELS}
+            result["rquic"] = {ch: {"jitter": round(rquic[ch]["jitter"], 2), "count": rquic[ch]["count"], "dropped": rquic[ch].get("dropped_ttl", 0),
+                                    "retransmissions": rquic[ch].get("retransmissions", 0),
+                                    "dropped_predicted": rquic[ch].get("dropped_predicted", 0),
+                                    "bytes_saved": rquic[ch].get("bytes_saved", 0)} for ch in CHANNELS}
             print(f"    Jitter: " + ", ".join([f"{ch}={rquic[ch]['jitter']:.2f}ms" for ch in CHANNELS]))
             print(f"    Dropped (TTL): " + ", ".join([f"{ch}={rquic[ch].get('dropped_ttl', 0)}" for ch in CHANNELS]))
+            print(f"    Predicted drops: " + ", ".join([f"{ch}={rquic[ch].get('dropped_predicted', 0)}" for ch in CHANNELS]))
+            print(f"    Bandwidth saved: " + ", ".join([f"{ch}={rquic[ch].get('bytes_saved', 0)}B" for ch in CHANNELS]))
         
         all_results.append(result)
         time.sleep(2)
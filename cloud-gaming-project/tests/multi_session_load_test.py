@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+MULTI-SESSION LOAD TEST - rQUIC server with connection IDs
+==========================================================
+One rQUICServer process on a single UDP port, 1 to 500 concurrent client
+sessions demultiplexed by connection ID (loopback, no Mininet needed).
+
+Reports per-session throughput and server CPU for each session count.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import contextlib
+import multiprocessing
+from pathlib import Path
+
+# Force matplotlib to use non-interactive backend
+import matplotlib
+matplotlib.use('Agg')
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from rquic_protocol import rQUICServer
+from rquic_async import rQUICAsyncClient
+from rquic_payload import RandomPayloadPool
+
+SERVER_PORT = 5600
+DURATION = 5
+SESSION_COUNTS = [1, 10, 50, 100, 250, 500]
+CLIENT_PROCESSES = 4
+
+# Sessions légères (type INPUT/AUDIO) pour rester sous la limite CPU des clients
+SESSION_FPS = 30
+SESSION_FRAME_SIZE = 1000
+
+
+def server_process(queue):
+    server = rQUICServer("127.0.0.1", SERVER_PORT)
+    server.idle_timeout = DURATION * 2
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        queue.put(server.start(DURATION))
+
+
+def client_process(num_sessions, queue):
+    payloads = RandomPayloadPool(SESSION_FRAME_SIZE * 64)
+
+    async def main():
+        clients = []
+        for _ in range(num_sessions):
+            client = rQUICAsyncClient("127.0.0.1", SERVER_PORT, payloads=payloads)
+            client.fps = SESSION_FPS
+            client.avg_frame_size = SESSION_FRAME_SIZE
+            client.max_frame_size = SESSION_FRAME_SIZE
+            clients.append(client)
+        return await asyncio.gather(*(run_staggered(c) for c in clients))
+
+    async def run_staggered(client):
+        # phases aléatoires: les sessions ne partent pas toutes sur le même tick
+        await asyncio.sleep(random.random() / SESSION_FPS)
+        return await client.run(DURATION)
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        results = asyncio.run(main())
+    queue.put([r["delivery_rate"] for r in results])
+
+
+def run_step(num_sessions):
+    server_queue = multiprocessing.Queue()
+    client_queue = multiprocessing.Queue()
+
+    server = multiprocessing.Process(target=server_process, args=(server_queue,))
+    server.start()
+    time.sleep(0.5)
+
+    workers = min(CLIENT_PROCESSES, num_sessions)
+    shares = [num_sessions // workers + (1 if i < num_sessions % workers else 0) for i in range(workers)]
+    clients = [multiprocessing.Process(target=client_process, args=(n, client_queue)) for n in shares]
+    for p in clients:
+        p.start()
+
+    delivery = []
+    for _ in clients:
+        delivery.extend(client_queue.get())
+    for p in clients:
+        p.join()
+
+    results = server_queue.get()
+    server.join()
+
+    throughputs = [s["throughput_mbps"] for s in results["sessions"]]
+    return {
+        "sessions": num_sessions,
+        "sessions_seen": len(results["sessions"]),
+        "server_cpu_percent": round(results["cpu_time_sec"] / DURATION * 100, 1),
+        "server_throughput_mbps": round(results["throughput_mbps"], 2),
+        "avg_session_throughput_mbps": round(sum(throughputs) / len(throughputs), 3) if throughputs else 0,
+        "min_session_throughput_mbps": round(min(throughputs), 3) if throughputs else 0,
+        "avg_delivery_rate": round(sum(delivery) / len(delivery), 1) if delivery else 0,
+    }
+
+
+def main():
+    print("=" * 60)
+    print("MULTI-SESSION LOAD TEST - rQUIC (connection IDs)")
+    print(f"{SESSION_FPS} fps x {SESSION_FRAME_SIZE} octets par session")
+    print("=" * 60)
+
+    all_results = []
+    for n in SESSION_COUNTS:
+        print(f"\n--- {n} session(s) ---")
+        result = run_step(n)
+        all_results.append(result)
+        print(f"    CPU serveur: {result['server_cpu_percent']:.1f}%, "
+              f"débit/session: {result['avg_session_throughput_mbps']:.3f} Mbps "
+              f"(min {result['min_session_throughput_mbps']:.3f}), "
+              f"livraison: {result['avg_delivery_rate']:.1f}%")
+
+    with open("MULTI_SESSION_RESULTS.json", "w") as f:
+        json.dump(all_results, f, indent=2)
+
+    print("\n" + "=" * 60)
+    print("RESULTS SAVED: MULTI_SESSION_RESULTS.json")
+    print("=" * 60)
+
+    generate_graph(all_results)
+
+
+def generate_graph(results):
+    import matplotlib.pyplot as plt
+
+    plt.switch_backend('Agg')
+
+    sessions = [r["sessions"] for r in results]
+
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+
+    ax1.plot(sessions, [r["avg_session_throughput_mbps"] for r in results], 'o-', color='#2ecc71', label='avg')
+    ax1.plot(sessions, [r["min_session_throughput_mbps"] for r in results], 's--', color='#e74c3c', label='min')
+    ax1.set_xlabel('Concurrent sessions', fontsize=12)
+    ax1.set_ylabel('Per-session throughput (Mbps)', fontsize=12)
+    ax1.set_title('rQUIC per-session throughput', fontsize=14)
+    ax1.set_xscale('log')
+    ax1.legend()
+    ax1.grid(alpha=0.3)
+
+    ax2.plot(sessions, [r["server_cpu_percent"] for r in results], 'o-', color='#3498db')
+    ax2.set_xlabel('Concurrent sessions', fontsize=12)
+    ax2.set_ylabel('Server CPU (%)', fontsize=12)
+    ax2.set_title('rQUIC server CPU (1 process)', fontsize=14)
+    ax2.set_xscale('log')
+    ax2.grid(alpha=0.3)
+
+    plt.tight_layout()
+    plt.savefig('MULTI_SESSION_RESULTS.png', dpi=150, bbox_inches='tight')
+    plt.close('all')
+
+    print("Graph saved: MULTI_SESSION_RESULTS.png")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+MULTIPATH TEST - one rQUIC session over Wi-Fi + cellular (dual-homed h1)
+========================================================================
+h1 has two interfaces: h1-eth0 -> s1 (Wi-Fi: short delay, lossy) and
+h1-eth1 -> s2 (cellular: longer delay, clean, lower bandwidth), both
+switches joining s3 where the server h2 sits. Source-address policy
+routing sends each client socket out of its own interface.
+
+The client sends 60 fps video plus 200-byte CRITICAL input events at 125 Hz.
+
+single:    rQUICClient over Wi-Fi only (previous behaviour)
+minrtt:    whole frames on the path of lowest expected delay
+redundant: minrtt, CRITICAL frames duplicated on the cellular path
+           while Wi-Fi is losing packets
+
+Scenarios: lossy Wi-Fi, and a 2 s Wi-Fi outage in the middle of the run.
+Latency = frame creation -> ACK, p99 per priority.
+"""
+
+import sys
+import json
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+SERVER_PORT = 5580
+DURATION = 10
+MODES = ["single", "minrtt", "redundant"]
+INPUT_INTERVAL = 0.008
+INPUT_SIZE = 200
+
+WIFI_ADDR = "10.0.0.1"
+CELL_ADDR = "10.0.0.3"
+WIFI = {"bw": 50, "delay": "5ms"}
+CELL = {"bw": 20, "delay": "30ms"}
+SCENARIOS = [
+    {"name": "Lossy Wi-Fi", "wifi_loss": 3, "outage": None},
+    {"name": "Wi-Fi outage", "wifi_loss": 1, "outage": (4, 2)},
+]
+
+
+def create_network(wifi_loss):
+    """h1 double attachement: Wi-Fi (s1) et cellulaire (s2), réunis par s3 côté serveur"""
+    from mininet.net import Mininet
+    from mininet.node import OVSSwitch
+    from mininet.link import TCLink
+
+    net = Mininet(switch=OVSSwitch, link=TCLink)
+    h1 = net.addHost('h1', ip=f'{WIFI_ADDR}/8')
+    h2 = net.addHost('h2', ip='10.0.0.2/8')
+    s1 = net.addSwitch('s1', failMode='standalone')
+    s2 = net.addSwitch('s2', failMode='standalone')
+    s3 = net.addSwitch('s3', failMode='standalone')
+    net.addLink(h1, s1, loss=wifi_loss, max_queue_size=100, **WIFI)
+    net.addLink(h1, s2, max_queue_size=100, **CELL)
+    net.addLink(s1, s3)
+    net.addLink(s2, s3)
+    net.addLink(h2, s3, delay='2ms')
+    net.start()
+
+    # seconde adresse en /32 (pas de route concurrente dans la table principale),
+    # et une table de routage par adresse source
+    h1.cmd(f"ip addr add {CELL_ADDR}/32 dev h1-eth1")
+    h1.cmd(f"ip route add 10.0.0.0/8 dev h1-eth1 src {CELL_ADDR} table 2")
+    h1.cmd(f"ip rule add from {CELL_ADDR} table 2")
+    # chaque interface ne répond à l'ARP que pour sa propre adresse
+    for option, value in (("arp_ignore", 1), ("arp_announce", 2), ("rp_filter", 0)):
+        h1.cmd(f"sysctl -qw net.ipv4.conf.all.{option}={value}")
+        for intf in ("h1-eth0", "h1-eth1"):
+            h1.cmd(f"sysctl -qw net.ipv4.conf.{intf}.{option}={value}")
+    return net
+
+
+def run_client(host, mode, output):
+    """Côté h1: vidéo + événements CRITICAL, sur un ou deux chemins"""
+    sys.path.insert(0, str(PROJECT_DIR / 'src'))
+    from rquic_protocol import rQUICClient
+    from rquic_multipath import rQUICMultipathClient
+    from rquic_wire import FramePriority
+
+    if mode == "single":
+        client = rQUICClient(host, SERVER_PORT)
+    else:
+        client = rQUICMultipathClient(host, SERVER_PORT, [WIFI_ADDR, CELL_ADDR], mode)
+    client.stats.start_time = time.time()
+    frame_id = 0
+    start = time.monotonic()
+    next_video = next_input = start
+
+    while time.monotonic() - start < DURATION:
+        now = time.monotonic()
+        if now >= next_video:
+            client.send_frame(frame_id)
+            frame_id += 1
+            next_video += 1.0 / client.fps
+        if now >= next_input:
+            client.send_frame(frame_id, FramePriority.CRITICAL, size=INPUT_SIZE)
+            frame_id += 1
+            next_input += INPUT_INTERVAL
+        client.process_acks()
+        client.check_timeouts()
+        client.flush_send_queue(time.monotonic())
+
+    time.sleep(0.5)
+    client.process_acks()
+    client.stats.end_time = time.time()
+
+    with open(output, "w") as f:
+        json.dump(client.get_results(), f, indent=2)
+
+
+def run_multipath_test(net, mode, outage):
+    h1, h2, s1 = net.get('h1'), net.get('h2'), net.get('s1')
+
+    h2.cmd("rm -f /tmp/_mp_server.json /tmp/_mp_client.json")
+    h2.cmd(f"cd {PROJECT_DIR} && python3 src/rquic_protocol.py server --port {SERVER_PORT} "
+           f"--duration {DURATION + 2} --output /tmp/_mp_server.json > /dev/null 2>&1 &")
+    time.sleep(1)
+    if outage:
+        at, length = outage
+        # côté switch: h1-eth0 perd sa porteuse comme un Wi-Fi qui décroche
+        s1.cmd(f"(sleep {at}; ip link set s1-eth1 down; sleep {length}; "
+               f"ip link set s1-eth1 up) > /dev/null 2>&1 &")
+    h1.cmd(f"cd {PROJECT_DIR} && python3 tests/multipath_test.py client {h2.IP()} {mode} "
+           f"/tmp/_mp_client.json > /dev/null 2>&1")
+    h2.cmd("pkill -f 'rquic_protocol.py server'")
+
+    try:
+        with open("/tmp/_mp_client.json") as f:
+            client = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    p99 = client["p99_latency_ms"]
+    return {
+        "critical_p99_ms": round(p99.get("CRITICAL", 0), 2),
+        "medium_p99_ms": round(p99.get("MEDIUM", 0), 2),
+        "delivery_rate": round(client["delivery_rate"], 2),
+        "frames_dropped_ttl": client["frames_dropped_ttl"],
+        "frames_duplicated": client.get("frames_duplicated", 0),
+        "nacks_reordered": client.get("nacks_reordered", 0),
+        "paths": client.get("paths", []),
+    }
+
+
+def main():
+    import matplotlib
+    matplotlib.use('Agg')
+    from mininet.log import setLogLevel
+    setLogLevel('warning')
+
+    print("=" * 60)
+    print("MULTIPATH TEST - Wi-Fi + cellular, single vs minrtt vs redundant")
+    print(f"Wi-Fi {WIFI['bw']} Mbit/s {WIFI['delay']}, cellular {CELL['bw']} Mbit/s {CELL['delay']}")
+    print("=" * 60)
+
+    all_results = []
+    for scenario in SCENARIOS:
+        print(f"\n--- {scenario['name']} (pertes Wi-Fi {scenario['wifi_loss']}%) ---")
+        result = {"scenario": scenario["name"], "wifi_loss": scenario["wifi_loss"],
+                  "outage": scenario["outage"]}
+
+        for mode in MODES:
+            net = create_network(scenario["wifi_loss"])
+            stats = run_multipath_test(net, mode, scenario["outage"])
+            net.stop()
+
+            result[mode] = stats or {}
+            if stats:
+                placed = "/".join(str(path["frames_placed"]) for path in stats["paths"]) or "-"
+                print(f"  {mode:9s} CRITICAL p99={stats['critical_p99_ms']:7.1f}ms  "
+                      f"livraison={stats['delivery_rate']:5.1f}%  "
+                      f"dupliquées={stats['frames_duplicated']:4d}  frames par chemin={placed}")
+            else:
+                print(f"  {mode:9s} pas de résultats")
+            time.sleep(2)
+
+        all_results.append(result)
+
+    with open("MULTIPATH_RESULTS.json", "w") as f:
+        json.dump(all_results, f, indent=2)
+
+    print("\n" + "=" * 60)
+    print("RESULTS SAVED: MULTIPATH_RESULTS.json")
+    print("=" * 60)
+
+    generate_graph(all_results)
+
+
+def generate_graph(results):
+    import matplotlib.pyplot as plt
+    import numpy as np
+
+    plt.switch_backend('Agg')
+
+    scenarios = [r["scenario"] for r in results]
+    x = np.arange(len(scenarios))
+    width = 0.25
+    colors = {"single": '#e74c3c', "minrtt": '#3498db', "redundant": '#2ecc71'}
+
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+
+    for i, mode in enumerate(MODES):
+        offset = (i - 1) * width
+        ax1.bar(x + offset, [r[mode].get("critical_p99_ms", 0) for r in results],
+                width, label=mode, color=colors[mode])
+        ax2.bar(x + offset, [r[mode].get("delivery_rate", 0) for r in results],
+                width, label=mode, color=colors[mode])
+
+    ax1.set_ylabel('CRITICAL p99 latency, creation -> ACK (ms)', fontsize=12)
+    ax1.set_title('Input events', fontsize=14)
+    ax2.set_ylabel('Delivery rate (%)', fontsize=12)
+    ax2.set_title('Frames delivered', fontsize=14)
+    for ax in (ax1, ax2):
+        ax.set_xticks(x)
+        ax.set_xticklabels(scenarios)
+        ax.legend()
+        ax.grid(axis='y', alpha=0.3)
+
+    plt.tight_layout()
+    plt.savefig('MULTIPATH_RESULTS.png', dpi=150, bbox_inches='tight')
+    plt.close('all')
+
+    print("Graph saved: MULTIPATH_RESULTS.png")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 5 and sys.argv[1] == "client":
+        run_client(sys.argv[2], sys.argv[3], sys.argv[4])
+    else:
+        main()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+PATH MTU TEST - DPLPMTUD probing (RFC 8899) on links of different MTUs
+======================================================================
+60 fps rQUIC video, client datagrams start at 1400 bytes. The MTU of each
+interface is set in create_network; the switch forwards frames without
+sending ICMP "too big", so an oversized datagram is silently dropped
+(black hole) exactly like a misconfigured tunnel.
+
+fixed: --no-pmtud, 1400-byte datagrams for the whole session
+pmtud: padded PMTU_PROBE datagrams acknowledged by the server; the data
+       datagram size follows the largest acknowledged probe, and falls
+       back to 1200 bytes when the current size stops getting through
+
+Reported: final datagram size, probes sent, black holes detected,
+delivery rate and fragments sent (fewer, larger datagrams = less header
+and per-packet overhead).
+"""
+
+import sys
+import json
+import time
+from pathlib import Path
+
+# Force matplotlib to use non-interactive backend
+import matplotlib
+matplotlib.use('Agg')
+
+from mininet.net import Mininet
+from mininet.node import OVSSwitch
+from mininet.link import TCLink
+from mininet.log import setLogLevel
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+SERVER_PORT = 5579
+DURATION = 10
+MODES = ["fixed", "pmtud"]
+
+# sender: MTU côté client (h1, s1-eth1); path: MTU côté serveur (s1-eth2, h2)
+SCENARIOS = [
+    {"name": "Ethernet 1500", "sender": 1500, "path": 1500},
+    {"name": "Jumbo 9000", "sender": 9000, "path": 9000},
+    {"name": "VPN 1420", "sender": 1500, "path": 1420},
+    {"name": "Tunnel 1280", "sender": 1500, "path": 1280},
+]
+DELAY_MS = 10
+
+
+def create_network(sender_mtu, path_mtu):
+    """Create Mininet network, MTUs set on both ends of each link"""
+    net = Mininet(switch=OVSSwitch, link=TCLink)
+    h1 = net.addHost('h1')
+    h2 = net.addHost('h2')
+    s1 = net.addSwitch('s1', failMode='standalone')
+    net.addLink(h1, s1, delay=f'{DELAY_MS}ms')
+    net.addLink(h2, s1, delay=f'{DELAY_MS}ms')
+    net.start()
+    h1.cmd(f"ip link set h1-eth0 mtu {sender_mtu}")
+    s1.cmd(f"ip link set s1-eth1 mtu {sender_mtu}")
+    s1.cmd(f"ip link set s1-eth2 mtu {path_mtu}")
+    h2.cmd(f"ip link set h2-eth0 mtu {path_mtu}")
+    return net
+
+
+def run_pmtu_test(net, mode, sender_mtu):
+    h1, h2 = net.get('h1'), net.get('h2')
+
+    h2.cmd("rm -f /tmp/_pmtu_server.json /tmp/_pmtu_client.json")
+    h2.cmd(f"cd {PROJECT_DIR} && python3 src/rquic_protocol.py server --port {SERVER_PORT} "
+           f"--duration {DURATION} --output /tmp/_pmtu_server.json > /dev/null 2>&1 &")
+    time.sleep(1)
+    # plafond des sondes: MTU de l'interface de sortie - IP 20 - UDP 8
+    flag = "--no-pmtud" if mode == "fixed" else f"--pmtu-max {sender_mtu - 28}"
+    h1.cmd(f"cd {PROJECT_DIR} && python3 src/rquic_protocol.py client --host {h2.IP()} "
+           f"--port {SERVER_PORT} --duration {DURATION} {flag} "
+           f"--output /tmp/_pmtu_client.json > /dev/null 2>&1")
+    time.sleep(DURATION // 2)
+    h2.cmd("pkill -f 'rquic_protocol.py server'")
+
+    try:
+        with open("/tmp/_pmtu_client.json") as f:
+            client = json.load(f)
+        with open("/tmp/_pmtu_server.json") as f:
+            server = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    return {
+        "delivery_rate": round(client["delivery_rate"], 2),
+        "datagram_size": client["datagram_size"],
+        "pmtu_state": client["pmtu_state"],
+        "pmtu_probes_sent": client["pmtu_probes_sent"],
+        "pmtu_probes_acked": client["pmtu_probes_acked"],
+        "pmtu_black_holes": client["pmtu_black_holes"],
+        "pmtu_changes": client["pmtu_changes"],
+        "fragments_sent": client["fragments_sent"],
+        "fragment_retransmissions": client["fragment_retransmissions"],
+        "wire_bytes": client["total_bytes"],
+        "frames_received": server["frames_received"],
+        "p99_latency_ms": client["p99_latency_ms"],
+    }
+
+
+def main():
+    setLogLevel('warning')
+
+    print("=" * 60)
+    print("PATH MTU TEST - fixed 1400-byte datagrams vs DPLPMTUD (rQUIC)")
+    print("=" * 60)
+
+    all_results = []
+
+    for scenario in SCENARIOS:
+        print(f"\n--- {scenario['name']} (client={scenario['sender']}, serveur={scenario['path']}) ---")
+        result = {"scenario": scenario["name"], "sender_mtu": scenario["sender"],
+                  "path_mtu": scenario["path"]}
+
+        for mode in MODES:
+            net = create_network(scenario["sender"], scenario["path"])
+            stats = run_pmtu_test(net, mode, scenario["sender"])
+            net.stop()
+
+            result[mode] = stats or {}
+            if stats:
+                print(f"  {mode:5s} datagrammes={stats['datagram_size']:5d}o  "
+                      f"sondes={stats['pmtu_probes_sent']:3d}  "
+                      f"trous noirs={stats['pmtu_black_holes']}  "
+                      f"livraison={stats['delivery_rate']:5.1f}%  "
+                      f"fragments={stats['fragments_sent']:6d}")
+            else:
+                print(f"  {mode:5s} pas de résultats")
+            time.sleep(2)
+
+        all_results.append(result)
+
+    with open("PATH_MTU_RESULTS.json", "w") as f:
+        json.dump(all_results, f, indent=2)
+
+    print("\n" + "=" * 60)
+    print("RESULTS SAVED: PATH_MTU_RESULTS.json")
+    print("=" * 60)
+
+    generate_graph(all_results)
+
+
+def generate_graph(results):
+    import matplotlib.pyplot as plt
+    import numpy as np
+
+    plt.switch_backend('Agg')
+
+    scenarios = [r["scenario"] for r in results]
+    x = np.arange(len(scenarios))
+    width = 0.35
+    colors = {"fixed": '#e74c3c', "pmtud": '#2ecc71'}
+
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+
+    for i, mode in enumerate(MODES):
+        offset = (i - 0.5) * width
+        ax1.bar(x + offset, [r[mode].get("delivery_rate", 0) for r in results],
+                width, label=mode, color=colors[mode])
+        ax2.bar(x + offset, [r[mode].get("fragments_sent", 0) for r in results],
+                width, label=mode, color=colors[mode])
+    for xi, r in zip(x, results):
+        if r["pmtud"]:
+            ax2.annotate(f"{r['pmtud']['datagram_size']}o", (xi + width / 2, r["pmtud"]["fragments_sent"]),
+                         ha='center', va='bottom', fontsize=9)
+
+    ax1.set_ylabel('Delivery rate (%)', fontsize=12)
+    ax1.set_title('Frames delivered', fontsize=14)
+    ax2.set_ylabel('Datagrams sent', fontsize=12)
+    ax2.set_title('Datagrams sent (final PMTUD size on top)', fontsize=14)
+    for ax in (ax1, ax2):
+        ax.set_xticks(x)
+        ax.set_xticklabels(scenarios)
+        ax.legend()
+        ax.grid(axis='y', alpha=0.3)
+
+    plt.tight_layout()
+    plt.savefig('PATH_MTU_RESULTS.png', dpi=150, bbox_inches='tight')
+    plt.close('all')
+
+    print("Graph saved: PATH_MTU_RESULTS.png")
+
+
+if __name__ == "__main__":
+    main()
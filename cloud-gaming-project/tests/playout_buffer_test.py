@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+PLAYOUT BUFFER TEST - latency vs smoothness of the receiver jitter buffer
+=========================================================================
+60 fps rQUIC video over a jittery link (netem delay + jitter + loss).
+The server feeds every reassembled frame to several PlayoutBuffers that
+differ only by the delay quantile their target tracks, so all of them
+see exactly the same arrivals.
+
+Low quantile:  short buffering, more frames late (stutter) or skipped
+High quantile: smooth playout, paid in added latency
+"""
+
+import sys
+import json
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+SERVER_PORT = 5572
+DURATION = 10
+FPS = 60
+QUANTILES = [0.5, 0.8, 0.9, 0.95, 0.99]
+DELAY_MS = 20
+JITTER_MS = 8
+LOSS_PERCENT = 1
+
+
+def create_network():
+    """h1 -- s1 -- h2, gigue et pertes sur le lien de h1"""
+    from mininet.net import Mininet
+    from mininet.node import OVSSwitch
+    from mininet.link import TCLink
+
+    net = Mininet(switch=OVSSwitch, link=TCLink)
+    h1 = net.addHost('h1')
+    h2 = net.addHost('h2')
+    s1 = net.addSwitch('s1', failMode='standalone')
+    net.addLink(h1, s1, delay=f'{DELAY_MS}ms', jitter=f'{JITTER_MS}ms', loss=LOSS_PERCENT)
+    net.addLink(h2, s1)
+    net.start()
+    return net
+
+
+def run_server(output):
+    """Côté h2: un tampon de lecture par quantile, mêmes arrivées pour tous"""
+    sys.path.insert(0, str(PROJECT_DIR / 'src'))
+    from rquic_protocol import rQUICServer
+    from rquic_playout import PlayoutBuffer
+
+    class QuantileSweepServer(rQUICServer):
+
+        def __init__(self):
+            super().__init__('0.0.0.0', SERVER_PORT)
+            self.buffers = {q: PlayoutBuffer(1.0 / FPS, quantile=q) for q in QUANTILES}
+
+        def on_frame_complete(self, session, frame_id, frame_data, stream_id=0, stream_seq=0):
+            super().on_frame_complete(session, frame_id, frame_data, stream_id, stream_seq)
+            for buffer in self.buffers.values():
+                buffer.push(stream_seq, frame_data, self.stats.frame_times[-1])
+            self.playout_sessions.add(session.conn_id)
+
+        def flush_playout(self, now):
+            for buffer in self.buffers.values():
+                buffer.poll(now)
+
+        def next_playout_deadline(self):
+            deadlines = [b.next_deadline() for b in self.buffers.values() if b]
+            return min(deadlines) if deadlines else None
+
+    server = QuantileSweepServer()
+    server.start(DURATION + 2)
+    with open(output, "w") as f:
+        json.dump({str(q): b.stats.summary() for q, b in server.buffers.items()}, f, indent=2)
+
+
+def run_playout_test(net):
+    h1, h2 = net.get('h1'), net.get('h2')
+
+    h2.cmd("rm -f /tmp/_playout_server.json")
+    h2.cmd(f"cd {PROJECT_DIR} && python3 tests/playout_buffer_test.py server "
+           f"/tmp/_playout_server.json > /dev/null 2>&1 &")
+    time.sleep(1)
+    h1.cmd(f"cd {PROJECT_DIR} && python3 src/rquic_protocol.py client --host {h2.IP()} "
+           f"--port {SERVER_PORT} --duration {DURATION} --output /tmp/_playout_client.json "
+           f"> /dev/null 2>&1")
+    # le serveur s'arrête seul après DURATION + 2 (+5) s et écrit ses résultats
+    for _ in range(20):
+        time.sleep(1)
+        try:
+            with open("/tmp/_playout_server.json") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            continue
+    h2.cmd("pkill -f 'playout_buffer_test.py server'")
+    return None
+
+
+def main():
+    import matplotlib
+    matplotlib.use('Agg')
+    from mininet.log import setLogLevel
+    setLogLevel('warning')
+
+    print("=" * 60)
+    print("PLAYOUT BUFFER TEST - adaptive target delay, quantile sweep")
+    print(f"delay {DELAY_MS}ms, jitter {JITTER_MS}ms, loss {LOSS_PERCENT}%")
+    print("=" * 60)
+
+    net = create_network()
+    stats = run_playout_test(net)
+    net.stop()
+
+    if not stats:
+        print("  pas de résultats")
+        return
+
+    results = []
+    for q in QUANTILES:
+        s = stats[str(q)]
+        results.append({"quantile": q, **s})
+        print(f"  q={q:4.2f}  à l'heure {s['on_time_rate']:5.1f}%  "
+              f"retard={s['frames_late']:4d}  sautées={s['frames_skipped']:4d}  "
+              f"tampon moyen={s['avg_buffer_ms']:5.1f}ms  cible={s['target_delay_ms']:5.1f}ms")
+
+    with open("PLAYOUT_BUFFER_RESULTS.json", "w") as f:
+        json.dump(results, f, indent=2)
+
+    print("\n" + "=" * 60)
+    print("RESULTS SAVED: PLAYOUT_BUFFER_RESULTS.json")
+    print("=" * 60)
+
+    generate_graph(results)
+
+
+def generate_graph(results):
+    import matplotlib.pyplot as plt
+
+    plt.switch_backend('Agg')
+
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+
+    buffer_ms = [r["avg_buffer_ms"] for r in results]
+    ax1.plot(buffer_ms, [r["on_time_rate"] for r in results], 'o-', color='#2ecc71', linewidth=2)
+    for r in results:
+        ax1.annotate(f"q={r['quantile']}", (r["avg_buffer_ms"], r["on_time_rate"]),
+                     textcoords='offset points', xytext=(5, -12))
+    ax1.set_xlabel('Average buffering delay (ms)', fontsize=12)
+    ax1.set_ylabel('Frames played on time (%)', fontsize=12)
+    ax1.set_title('Latency vs smoothness', fontsize=14)
+    ax1.grid(alpha=0.3)
+
+    labels = [str(r["quantile"]) for r in results]
+    ax2.bar(labels, [r["frames_on_time"] for r in results], label='on time', color='#2ecc71')
+    ax2.bar(labels, [r["frames_late"] for r in results], bottom=[r["frames_on_time"] for r in results],
+            label='late', color='#f39c12')
+    ax2.bar(labels, [r["frames_skipped"] for r in results],
+            bottom=[r["frames_on_time"] + r["frames_late"] for r in results],
+            label='skipped', color='#e74c3c')
+    ax2.set_xlabel('Target delay quantile', fontsize=12)
+    ax2.set_ylabel('Frames', fontsize=12)
+    ax2.set_title(f'Playout outcome, jitter {JITTER_MS}ms, loss {LOSS_PERCENT}%', fontsize=14)
+    ax2.legend()
+    ax2.grid(axis='y', alpha=0.3)
+
+    plt.tight_layout()
+    plt.savefig('PLAYOUT_BUFFER_RESULTS.png', dpi=150, bbox_inches='tight')
+    plt.close('all')
+
+    print("Graph saved: PLAYOUT_BUFFER_RESULTS.png")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "server":
+        run_server(sys.argv[2])
+    else:
+        main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+PRIORITY SCHEDULER TEST - CRITICAL latency under a saturated VIDEO channel
+==========================================================================
+One rQUIC connection carries 60 fps video (MEDIUM/LOW frames, ~21 Mbit/s)
+and small CRITICAL input events (125 Hz) over a 15 Mbit/s bottleneck: the
+video alone saturates the link and the send queue builds up on the client.
+
+fifo: datagrams leave in arrival order (previous behaviour)
+edf:  per-priority queues, earliest deadline first + weighted fairness
+
+Latency = frame creation -> ACK, p99 per priority.
+"""
+
+import sys
+import json
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+SERVER_PORT = 5568
+DURATION = 10
+MODES = ["fifo", "edf"]
+BOTTLENECK_MBPS = 15
+DELAY_MS = 10
+INPUT_INTERVAL = 0.008
+INPUT_SIZE = 200
+
+
+def create_network():
+    """Create Mininet network with a bottleneck on h1's uplink"""
+    from mininet.net import Mininet
+    from mininet.node import OVSSwitch
+    from mininet.link import TCLink
+
+    net = Mininet(switch=OVSSwitch, link=TCLink)
+    h1 = net.addHost('h1')
+    h2 = net.addHost('h2')
+    s1 = net.addSwitch('s1', failMode='standalone')
+    net.addLink(h1, s1, bw=BOTTLENECK_MBPS, delay=f'{DELAY_MS}ms', max_queue_size=100)
+    net.addLink(h2, s1, delay=f'{DELAY_MS}ms')
+    net.start()
+    return net
+
+
+def run_client(host, scheduler, output):
+    """Côté h1: vidéo + événements CRITICAL sur la même connexion"""
+    sys.path.insert(0, str(PROJECT_DIR / 'src'))
+    from rquic_protocol import rQUICClient
+    from rquic_wire import FramePriority
+
+    client = rQUICClient(host, SERVER_PORT, scheduler=scheduler)
+    client.stats.start_time = time.time()
+    frame_id = 0
+    start = time.monotonic()
+    next_video = next_input = start
+
+    while time.monotonic() - start < DURATION:
+        now = time.monotonic()
+        if now >= next_video:
+            client.send_frame(frame_id)
+            frame_id += 1
+            next_video += 1.0 / client.fps
+        if now >= next_input:
+            client.send_frame(frame_id, FramePriority.CRITICAL, size=INPUT_SIZE)
+            frame_id += 1
+            next_input += INPUT_INTERVAL
+        client.process_acks()
+        client.check_timeouts()
+        client.flush_send_queue(time.monotonic())
+
+    time.sleep(0.5)
+    client.process_acks()
+    client.stats.end_time = time.time()
+
+    with open(output, "w") as f:
+        json.dump(client.get_results(), f, indent=2)
+
+
+def run_scheduler_test(net, mode):
+    h1, h2 = net.get('h1'), net.get('h2')
+
+    h2.cmd("rm -f /tmp/_sched_server.json /tmp/_sched_client.json")
+    h2.cmd(f"cd {PROJECT_DIR} && python3 src/rquic_protocol.py server --port {SERVER_PORT} "
+           f"--duration {DURATION + 2} --output /tmp/_sched_server.json > /dev/null 2>&1 &")
+    time.sleep(1)
+    h1.cmd(f"cd {PROJECT_DIR} && python3 tests/priority_scheduler_test.py client {h2.IP()} {mode} "
+           f"/tmp/_sched_client.json > /dev/null 2>&1")
+    h2.cmd("pkill -f 'rquic_protocol.py server'")
+
+    try:
+        with open("/tmp/_sched_client.json") as f:
+            client = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    p99 = client["p99_latency_ms"]
+    return {
+        "critical_p99_ms": round(p99.get("CRITICAL", 0), 2),
+        "medium_p99_ms": round(p99.get("MEDIUM", 0), 2),
+        "low_p99_ms": round(p99.get("LOW", 0), 2),
+        "delivery_rate": round(client["delivery_rate"], 2),
+        "frames_dropped_ttl": client["frames_dropped_ttl"],
+    }
+
+
+def main():
+    import matplotlib
+    matplotlib.use('Agg')
+    from mininet.log import setLogLevel
+    setLogLevel('warning')
+
+    print("=" * 60)
+    print("PRIORITY SCHEDULER TEST - CRITICAL p99 with saturated VIDEO")
+    print(f"Bottleneck {BOTTLENECK_MBPS} Mbit/s, delay {DELAY_MS}ms")
+    print("=" * 60)
+
+    results = []
+    for mode in MODES:
+        net = create_network()
+        stats = run_scheduler_test(net, mode)
+        net.stop()
+
+        results.append({"scheduler": mode, **(stats or {})})
+        if stats:
+            print(f"  {mode:5s} CRITICAL p99={stats['critical_p99_ms']:7.1f}ms  "
+                  f"MEDIUM p99={stats['medium_p99_ms']:7.1f}ms  "
+                  f"LOW p99={stats['low_p99_ms']:7.1f}ms  "
+                  f"TTL={stats['frames_dropped_ttl']}")
+        else:
+            print(f"  {mode:5s} pas de résultats")
+        time.sleep(2)
+
+    with open("PRIORITY_SCHEDULER_RESULTS.json", "w") as f:
+        json.dump(results, f, indent=2)
+
+    print("\n" + "=" * 60)
+    print("RESULTS SAVED: PRIORITY_SCHEDULER_RESULTS.json")
+    print("=" * 60)
+
+    generate_graph(results)
+
+
+def generate_graph(results):
+    import matplotlib.pyplot as plt
+    import numpy as np
+
+    plt.switch_backend('Agg')
+
+    classes = ["critical_p99_ms", "medium_p99_ms", "low_p99_ms"]
+    x = np.arange(len(classes))
+    width = 0.35
+    colors = {"fifo": '#e74c3c', "edf": '#2ecc71'}
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    for i, r in enumerate(results):
+        ax.bar(x + (i - 0.5) * width, [r.get(c, 0) for c in classes], width,
+               label=r["scheduler"], color=colors[r["scheduler"]])
+
+    ax.set_ylabel('p99 latency, creation -> ACK (ms)', fontsize=12)
+    ax.set_title(f'Send scheduler, {BOTTLENECK_MBPS} Mbit/s bottleneck', fontsize=14)
+    ax.set_xticks(x)
+    ax.set_xticklabels(['CRITICAL (input)', 'MEDIUM (video)', 'LOW (video)'])
+    ax.legend()
+    ax.grid(axis='y', alpha=0.3)
+
+    plt.tight_layout()
+    plt.savefig('PRIORITY_SCHEDULER_RESULTS.png', dpi=150, bbox_inches='tight')
+    plt.close('all')
+
+    print("Graph saved: PRIORITY_SCHEDULER_RESULTS.png")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 5 and sys.argv[1] == "client":
+        run_client(sys.argv[2], sys.argv[3], sys.argv[4])
+    else:
+        main()
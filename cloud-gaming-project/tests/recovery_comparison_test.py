@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+RECOVERY COMPARISON TEST - legacy RTO vs RFC 9002-style loss detection
+======================================================================
+Same loss scenarios as hol_blocking_test_with_rquic.py, rQUIC client run
+twice per scenario:
+
+legacy:  srtt EWMA, rto = 2*srtt, one RTO timer per frame
+rfc9002: srtt/rttvar/min_rtt, packet + time threshold, PTO, Karn's rule
+
+Spurious retransmissions = fragments the server receives for frames it had
+already reconstructed.
+"""
+
+import sys
+import json
+import time
+from pathlib import Path
+
+# Force matplotlib to use non-interactive backend
+import matplotlib
+matplotlib.use('Agg')
+
+from mininet.net import Mininet
+from mininet.node import OVSSwitch
+from mininet.link import TCLink
+from mininet.log import setLogLevel
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+SERVER_PORT = 5565
+DURATION = 10
+MODES = ["legacy", "rfc9002"]
+
+# mêmes scénarios que hol_blocking_test_with_rquic.py
+SCENARIOS = [
+    {"name": "Ideal", "loss": 0, "delay": 5},
+    {"name": "5% Loss", "loss": 5, "delay": 10},
+    {"name": "10% Loss", "loss": 10, "delay": 10},
+]
+
+
+def create_network(loss_percent, delay_ms):
+    """Create Mininet network"""
+    net = Mininet(switch=OVSSwitch, link=TCLink)
+    h1 = net.addHost('h1')
+    h2 = net.addHost('h2')
+    s1 = net.addSwitch('s1', failMode='standalone')
+    net.addLink(h1, s1, loss=loss_percent, delay=f'{delay_ms}ms')
+    net.addLink(h2, s1, loss=loss_percent, delay=f'{delay_ms}ms')
+    net.start()
+    return net
+
+
+def run_recovery_test(net, mode):
+    h1, h2 = net.get('h1'), net.get('h2')
+
+    h2.cmd("rm -f /tmp/_recovery_server.json /tmp/_recovery_client.json")
+    h2.cmd(f"cd {PROJECT_DIR} && python3 src/rquic_protocol.py server --port {SERVER_PORT} "
+           f"--duration {DURATION} --output /tmp/_recovery_server.json > /dev/null 2>&1 &")
+    time.sleep(1)
+    h1.cmd(f"cd {PROJECT_DIR} && python3 src/rquic_protocol.py client --host {h2.IP()} "
+           f"--port {SERVER_PORT} --duration {DURATION} --recovery {mode} "
+           f"--output /tmp/_recovery_client.json > /dev/null 2>&1")
+    time.sleep(DURATION // 2)
+    h2.cmd("pkill -f 'rquic_protocol.py server'")
+
+    try:
+        with open("/tmp/_recovery_client.json") as f:
+            client = json.load(f)
+        with open("/tmp/_recovery_server.json") as f:
+            server = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    return {
+        "retransmissions": client["retransmissions"],
+        "spurious_fragments": server["duplicate_fragments"],
+        "avg_loss_detection_ms": round(client["avg_loss_detection_ms"], 2),
+        "delivery_rate": round(client["delivery_rate"], 2),
+        "frames_dropped_ttl": client["frames_dropped_ttl"],
+        "srtt_ms": round(client["srtt_ms"], 2),
+    }
+
+
+def main():
+    setLogLevel('warning')
+
+    print("=" * 60)
+    print("RECOVERY COMPARISON TEST - legacy vs RFC 9002 (rQUIC)")
+    print("=" * 60)
+
+    all_results = []
+
+    for scenario in SCENARIOS:
+        print(f"\n--- {scenario['name']} (loss={scenario['loss']}%, delay={scenario['delay']}ms) ---")
+        result = {"scenario": scenario["name"], "loss": scenario["loss"]}
+
+        for mode in MODES:
+            net = create_network(scenario["loss"], scenario["delay"])
+            stats = run_recovery_test(net, mode)
+            net.stop()
+
+            result[mode] = stats or {}
+            if stats:
+                print(f"  {mode:8s} retrans={stats['retransmissions']:4d}  "
+                      f"spurious={stats['spurious_fragments']:4d}  "
+                      f"détection={stats['avg_loss_detection_ms']:6.1f}ms  "
+                      f"livraison={stats['delivery_rate']:.1f}%")
+            else:
+                print(f"  {mode:8s} pas de résultats")
+            time.sleep(2)
+
+        all_results.append(result)
+
+    with open("RECOVERY_COMPARISON_RESULTS.json", "w") as f:
+        json.dump(all_results, f, indent=2)
+
+    print("\n" + "=" * 60)
+    print("RESULTS SAVED: RECOVERY_COMPARISON_RESULTS.json")
+    print("=" * 60)
+
+    generate_graph(all_results)
+
+
+def generate_graph(results):
+    import matplotlib.pyplot as plt
+    import numpy as np
+
+    plt.switch_backend('Agg')
+
+    scenarios = [r["scenario"] for r in results]
+    x = np.arange(len(scenarios))
+    width = 0.35
+    colors = {"legacy": '#e74c3c', "rfc9002": '#2ecc71'}
+
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+
+    for i, mode in enumerate(MODES):
+        offset = (i - 0.5) * width
+        ax1.bar(x + offset, [r[mode].get("spurious_fragments", 0) for r in results],
+                width, label=mode, color=colors[mode])
+        ax2.bar(x + offset, [r[mode].get("avg_loss_detection_ms", 0) for r in results],
+                width, label=mode, color=colors[mode])
+
+    ax1.set_ylabel('Spurious retransmitted fragments', fontsize=12)
+    ax1.set_title('Spurious retransmissions', fontsize=14)
+    ax2.set_ylabel('Avg time to loss detection (ms)', fontsize=12)
+    ax2.set_title('Loss detection delay', fontsize=14)
+    for ax in (ax1, ax2):
+        ax.set_xticks(x)
+        ax.set_xticklabels(scenarios)
+        ax.legend()
+        ax.grid(axis='y', alpha=0.3)
+
+    plt.tight_layout()
+    plt.savefig('RECOVERY_COMPARISON_RESULTS.png', dpi=150, bbox_inches='tight')
+    plt.close('all')
+
+    print("Graph saved: RECOVERY_COMPARISON_RESULTS.png")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+RETRANSMIT POOL BENCHMARK - memory under an ACK blackout
+========================================================
+60 fps video (40 KB, MEDIUM, 2 s TTL as for a replay recording) plus
+125 Hz input events (64 B, CRITICAL) through rQUICConnection on loopback.
+Halfway through, the server stops reading for BLACKOUT s: nothing is
+acknowledged and every frame stays pending until its TTL.
+
+none: no pool, each pending frame keeps its own fresh bytes object
+pool: pending frames are copied into the preallocated retransmission pool,
+      the least important ones are evicted when it is full
+
+Each mode runs in its own process so that resident memory and allocation
+rate are not shared. Reported: peak pending bytes, resident memory,
+allocation rate, frames evicted or refused by the pool, input delivery.
+"""
+
+import sys
+import json
+import subprocess
+import time
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from rquic_protocol import rQUICServer
+from rquic_connection import rQUICConnection
+from rquic_wire import FramePriority
+
+SERVER_PORT = 5576
+DURATION = 4
+BLACKOUT = 1.0
+VIDEO_TTL = 2.0
+FPS = 60
+INPUT_HZ = 125
+VIDEO_SIZE = 40000
+INPUT_SIZE = 64
+VIDEO_STREAM, INPUT_STREAM = 1, 2
+MODES = ["none", "pool"]
+
+
+def serve(server, paused):
+    while server.running:
+        if paused.is_set():
+            time.sleep(0.01)
+            continue
+        server.poll(0.05)
+
+
+def run_mode(mode, port):
+    server = rQUICServer('127.0.0.1', port)
+    server.bind()
+    paused = threading.Event()
+    thread = threading.Thread(target=serve, args=(server, paused), daemon=True)
+    thread.start()
+
+    outcome = {"delivered": {}, "dropped": {}}
+    names = {VIDEO_STREAM: "VIDEO", INPUT_STREAM: "INPUT"}
+
+    def delivered(frame_id, stream_id, latency_ms):
+        name = names[stream_id]
+        outcome["delivered"][name] = outcome["delivered"].get(name, 0) + 1
+
+    def dropped(frame_id, stream_id, reason):
+        key = f"{names[stream_id]}:{reason}"
+        outcome["dropped"][key] = outcome["dropped"].get(key, 0) + 1
+
+    conn = rQUICConnection('127.0.0.1', port, on_delivered=delivered, on_dropped=dropped)
+    if mode == "none":
+        conn.pool = None
+    conn.connect()
+    conn.open_stream(VIDEO_STREAM, FramePriority.MEDIUM, ttl=VIDEO_TTL, name='VIDEO')
+    conn.open_stream(INPUT_STREAM, FramePriority.CRITICAL, name='INPUT')
+
+    peak_pending = 0
+    sent = {"VIDEO": 0, "INPUT": 0}
+    start = time.monotonic()
+    next_video = next_input = start
+    end = start + DURATION
+    while True:
+        now = time.monotonic()
+        if now >= end:
+            break
+        if start + DURATION / 2 <= now < start + DURATION / 2 + BLACKOUT:
+            paused.set()
+        else:
+            paused.clear()
+        if now >= next_video:
+            conn.send(VIDEO_STREAM, bytes(VIDEO_SIZE))
+            sent["VIDEO"] += 1
+            next_video += 1.0 / FPS
+        if now >= next_input:
+            conn.send(INPUT_STREAM, bytes(INPUT_SIZE))
+            sent["INPUT"] += 1
+            next_input += 1.0 / INPUT_HZ
+        peak_pending = max(peak_pending, sum(len(p[0]) for p in conn.pending_acks.values()))
+        conn.poll(max(min(next_video, next_input) - time.monotonic(), 0.0))
+
+    paused.clear()
+    results = conn.close(linger=0.5)
+    server.running = False
+    thread.join()
+    server.close()
+
+    return {
+        "mode": mode,
+        "frames_sent": sent,
+        "frames_delivered": outcome["delivered"],
+        "frames_dropped": outcome["dropped"],
+        "peak_pending_bytes": peak_pending,
+        "retransmit_pool_bytes": results["retransmit_pool_bytes"],
+        "retransmit_pool_peak_bytes": results["retransmit_pool_peak_bytes"],
+        "frames_evicted_pool": results["frames_evicted_pool"],
+        "frames_rejected_pool": results["frames_rejected_pool"],
+        "rss_mb": results["rss_mb"],
+        "peak_rss_mb": results["peak_rss_mb"],
+        "allocations_per_sec": results["allocations_per_sec"],
+        "input_delivery_rate": round(outcome["delivered"].get("INPUT", 0) / sent["INPUT"] * 100, 2),
+    }
+
+
+def main():
+    print("=" * 60)
+    print("RETRANSMIT POOL BENCHMARK - ACK blackout on loopback")
+    print("=" * 60)
+
+    results = []
+    for i, mode in enumerate(MODES):
+        run = subprocess.run([sys.executable, __file__, mode, str(SERVER_PORT + i)],
+                             capture_output=True, text=True)
+        stats = json.loads(run.stdout.splitlines()[-1])
+        results.append(stats)
+        print(f"  {mode:4s} en attente max={stats['peak_pending_bytes'] / 1e6:5.2f}Mo  "
+              f"RSS={stats['rss_mb']:.1f}Mo (max {stats['peak_rss_mb']:.1f})  "
+              f"alloc/s={stats['allocations_per_sec']:8.0f}  "
+              f"évincées={stats['frames_evicted_pool']}  refusées={stats['frames_rejected_pool']}  "
+              f"INPUT livrés={stats['input_delivery_rate']:.1f}%")
+        print(f"       abandons: {stats['frames_dropped']}")
+
+    with open("RETRANSMIT_POOL_RESULTS.json", "w") as f:
+        json.dump(results, f, indent=2)
+
+    print("\n" + "=" * 60)
+    print("RESULTS SAVED: RETRANSMIT_POOL_RESULTS.json")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3:
+        # un mode, dans son propre processus
+        sys.stdout = sys.stderr
+        stats = run_mode(sys.argv[1], int(sys.argv[2]))
+        sys.stdout = sys.__stdout__
+        print(json.dumps(stats))
+    else:
+        main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+SO_REUSEPORT SCALING BENCHMARK - sharded rQUIC server
+=====================================================
+Packets/sec handled by rQUICShardedServer with 1, 2, 4 workers bound to
+the same port (loopback, no Mininet needed).
+
+Load: blaster processes replaying prebuilt fragments from many sessions
+(distinct source ports + connection IDs) as fast as possible.
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import contextlib
+import multiprocessing
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from rquic_fragment import Packetizer
+from rquic_sharding import rQUICShardedServer
+
+SERVER_PORT = 5650
+DURATION = 5
+WORKER_COUNTS = [1, 2, 4]
+BLASTERS = 2
+SESSIONS_PER_BLASTER = 16
+FRAME_SIZE = 10000
+
+
+def server_process(workers, queue):
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        queue.put(rQUICShardedServer("127.0.0.1", SERVER_PORT, workers).start(DURATION))
+
+
+def blaster(index, queue):
+    payload = os.urandom(FRAME_SIZE)
+    sessions = []
+    for s in range(SESSIONS_PER_BLASTER):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sessions.append((sock, Packetizer(conn_id=index * 1000 + s + 1)))
+
+    sent = 0
+    frame_id = 0
+    end = time.time() + DURATION
+    while time.time() < end:
+        for sock, packetizer in sessions:
+            for packet in packetizer.packetize(frame_id, payload, 2):
+                sock.sendto(packet, ("127.0.0.1", SERVER_PORT))
+                sent += 1
+        frame_id += 1
+
+    for sock, _ in sessions:
+        sock.close()
+    queue.put(sent)
+
+
+def run_step(workers):
+    server_queue = multiprocessing.Queue()
+    sent_queue = multiprocessing.Queue()
+
+    server = multiprocessing.Process(target=server_process, args=(workers, server_queue))
+    server.start()
+    time.sleep(1)
+
+    blasters = [multiprocessing.Process(target=blaster, args=(i, sent_queue)) for i in range(BLASTERS)]
+    for p in blasters:
+        p.start()
+    sent = sum(sent_queue.get() for _ in blasters)
+    for p in blasters:
+        p.join()
+
+    results = server_queue.get()
+    server.join()
+
+    return {
+        "workers": workers,
+        "packets_sent": sent,
+        "packets_received": results["fragments_received"],
+        "packets_per_sec": round(results["fragments_received"] / DURATION),
+        "server_cpu_sec": round(results["cpu_time_sec"], 2),
+        "per_worker_packets": [w["fragments_received"] for w in results["per_worker"]],
+    }
+
+
+def main():
+    print("=" * 60)
+    print("SO_REUSEPORT SCALING BENCHMARK - rQUIC")
+    print(f"CPUs: {os.cpu_count()}, sessions: {BLASTERS * SESSIONS_PER_BLASTER}")
+    print("=" * 60)
+
+    all_results = []
+    for workers in WORKER_COUNTS:
+        result = run_step(workers)
+        all_results.append(result)
+        print(f"  {workers} worker(s): {result['packets_per_sec']:8d} pkt/s "
+              f"(reçus {result['packets_received']}/{result['packets_sent']}, "
+              f"répartition {result['per_worker_packets']})")
+
+    with open("REUSEPORT_SCALING_RESULTS.json", "w") as f:
+        json.dump(all_results, f, indent=2)
+
+    print("RESULTS SAVED: REUSEPORT_SCALING_RESULTS.json")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+SEND PATH MICROBENCHMARK - rQUIC send_frame
+===========================================
+Frames/sec of the client send path on loopback (no Mininet needed).
+
+legacy: payload built byte by byte with random.getrandbits + header concat
+pool:   pre-randomized RandomPayloadPool + pack_into in reusable buffers
+"""
+
+import sys
+import json
+import time
+import random
+import socket
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from rquic_protocol import rQUICClient
+
+NUM_FRAMES = 300
+ROUNDS = 3
+
+
+def legacy_send_frame(client, frame_id):
+    """send_frame d'origine: génération octet par octet et concaténation"""
+    size = client.generate_frame_size()
+    data = bytes(random.getrandbits(8) for _ in range(size))
+    priority = client.detect_frame_priority(size)
+    packets = client.packetizer.packetize(frame_id, data, priority)
+    for packet in packets:
+        client.sock.sendto(packet, client.server_addr)
+    client.pending_acks[frame_id] = (packets, time.time(), 0, priority)
+    return size
+
+
+def measure(send, client):
+    best = 0
+    for _ in range(ROUNDS):
+        client.pending_acks.clear()
+        random.seed(0)
+        start = time.perf_counter()
+        for frame_id in range(NUM_FRAMES):
+            send(frame_id)
+        elapsed = time.perf_counter() - start
+        best = max(best, NUM_FRAMES / elapsed)
+    return best
+
+
+def main():
+    # puits UDP jamais lu: le noyau jette ce qui déborde, sendto reste non bloquant
+    sink = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sink.bind(("127.0.0.1", 0))
+    host, port = sink.getsockname()
+
+    client = rQUICClient(host, port)
+
+    print("=" * 60)
+    print("SEND PATH MICROBENCHMARK - rQUIC")
+    print("=" * 60)
+
+    legacy_fps = measure(lambda fid: legacy_send_frame(client, fid), client)
+    print(f"  legacy (getrandbits + concat): {legacy_fps:10.1f} frames/s")
+
+    pool_fps = measure(client.send_frame, client)
+    print(f"  pool (memoryview + pack_into): {pool_fps:10.1f} frames/s")
+
+    print(f"  Speedup: x{pool_fps / legacy_fps:.1f} "
+          f"(budget 60 fps = {60 / legacy_fps * 100:.1f}% -> {60 / pool_fps * 100:.2f}% d'un coeur)")
+
+    client.sock.close()
+    sink.close()
+
+    results = {
+        "num_frames": NUM_FRAMES,
+        "legacy_frames_per_sec": round(legacy_fps, 1),
+        "pool_frames_per_sec": round(pool_fps, 1),
+        "speedup": round(pool_fps / legacy_fps, 2),
+    }
+    with open("SEND_PATH_RESULTS.json", "w") as f:
+        json.dump(results, f, indent=2)
+
+    print("RESULTS SAVED: SEND_PATH_RESULTS.json")
+
+
+if __name__ == "__main__":
+    main()
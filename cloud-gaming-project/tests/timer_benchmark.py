@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+TIMER BENCHMARK - rQUIC retransmission/TTL timers
+=================================================
+Cost of the client timer path with 10 000 outstanding frames (loopback,
+no Mininet needed).
+
+scan: check_timeouts/next_deadline d'origine, parcours de tout pending_acks
+heap: DeadlineHeap, seules les échéances passées sont visitées
+"""
+
+import sys
+import json
+import time
+import socket
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from rquic_protocol import rQUICClient
+from rquic_wire import PACKET_ACK, CONN_ACK_HEADER
+
+OUTSTANDING = 10000
+CALLS = 200
+# échéances lointaines: rien n'expire pendant la mesure, seul le coût du parcours compte
+RTO = 30.0
+TTL = 60.0
+
+
+def scan_check_timeouts(client):
+    """check_timeouts d'origine: copie de pending_acks et test RTO/TTL de chaque frame"""
+    current_time = time.monotonic()
+    frames_to_drop = []
+    frames_to_retransmit = []
+    for frame_id, (payload, send_time, retries, priority) in list(client.pending_acks.items()):
+        frame_age = current_time - send_time
+        if frame_age > client.frame_ttl_by_priority[priority]:
+            frames_to_drop.append(frame_id)
+        elif frame_age > RTO and retries < client.max_retries:
+            frames_to_retransmit.append(frame_id)
+    return frames_to_drop, frames_to_retransmit
+
+
+def scan_next_deadline(client):
+    deadline = None
+    for payload, send_time, retries, priority in client.pending_acks.values():
+        expiry = send_time + client.frame_ttl_by_priority[priority]
+        if retries < client.max_retries:
+            expiry = min(expiry, send_time + RTO)
+        if deadline is None or expiry < deadline:
+            deadline = expiry
+    return deadline
+
+
+def per_call_us(fn, calls=CALLS):
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls * 1_000_000
+
+
+def main():
+    # puits UDP jamais lu: le noyau jette ce qui déborde, sendto reste non bloquant
+    sink = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sink.bind(("127.0.0.1", 0))
+    host, port = sink.getsockname()
+
+    client = rQUICClient(host, port)
+    client.avg_frame_size = client.max_frame_size = 1000
+    client.frame_ttl_by_priority = {p: TTL for p in client.frame_ttl_by_priority}
+
+    print("=" * 60)
+    print(f"TIMER BENCHMARK - rQUIC ({OUTSTANDING} frames en attente)")
+    print("=" * 60)
+
+    for frame_id in range(OUTSTANDING):
+        client.send_frame(frame_id)
+
+    results = {
+        "outstanding_frames": OUTSTANDING,
+        "scan_check_timeouts_us": per_call_us(lambda: scan_check_timeouts(client)),
+        "heap_check_timeouts_us": per_call_us(client.check_timeouts),
+        "scan_next_deadline_us": per_call_us(lambda: scan_next_deadline(client)),
+        "heap_next_deadline_us": per_call_us(client.next_deadline),
+    }
+
+    # annulation: un ACK par frame, chaque ACK retire son timer en O(1)
+    acks = [CONN_ACK_HEADER.pack(PACKET_ACK, client.conn_id, frame_id) for frame_id in range(OUTSTANDING)]
+    start = time.perf_counter()
+    for ack in acks:
+        client.handle_packet(ack)
+    results["heap_cancel_on_ack_us"] = (time.perf_counter() - start) / OUTSTANDING * 1_000_000
+    results["pending_after_acks"] = len(client.pending_acks)
+
+    client.sock.close()
+    sink.close()
+
+    for name, value in results.items():
+        print(f"  {name:24s} {value:12.2f}" if isinstance(value, float) else f"  {name:24s} {value:12d}")
+    print(f"  Speedup check_timeouts: x{results['scan_check_timeouts_us'] / results['heap_check_timeouts_us']:.0f}")
+
+    with open("TIMER_RESULTS.json", "w") as f:
+        json.dump({k: round(v, 3) if isinstance(v, float) else v for k, v in results.items()}, f, indent=2)
+
+    print("RESULTS SAVED: TIMER_RESULTS.json")
+
+
+if __name__ == "__main__":
+    main()